@@ -9,11 +9,23 @@ __version__ = "0.1.0"
 __author__ = "LibertyQuinzel"
 __email__ = "your-email@example.com"
 
-# Import main classes (will be available once implemented)
-try:
-    from .core import LessonGenerator
-    from .cli import main
-    __all__ = ["LessonGenerator", "main"]
-except ImportError:
-    # During development, some modules may not be complete
-    __all__ = []
\ No newline at end of file
+__all__ = ["LessonGenerator", "main"]
+
+# Heavy submodules (openai, jinja2, ...) are imported on first attribute
+# access so that `lesson-generator --help` and `version` start quickly
+_LAZY_ATTRIBUTES = {
+    "LessonGenerator": ".core",
+    "main": ".cli",
+}
+
+
+def __getattr__(name):
+    """Lazily import public attributes (PEP 562)."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
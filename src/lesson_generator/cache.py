@@ -0,0 +1,311 @@
+"""
+Cache module.
+
+This module provides caches that can survive process restarts: generated
+content responses (so paid-for OpenAI answers are reused) and whole lesson
+generation results (so re-running the CLI with identical settings can skip
+lessons that were already generated). Both are only written to disk when a
+cache directory is configured.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from . import __version__
+from .models import ContentGenerationResponse, GenerationConfig, TopicConfig, LessonGenerationResult
+
+
+def _tree_fingerprint(root: Optional[Path]) -> str:
+    """Summarize the names, sizes and modification times of every file below ``root``."""
+    if root is None:
+        return ""
+    digest = hashlib.blake2b(str(Path(root).resolve()).encode('utf-8'), digest_size=16)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{os.path.relpath(path, root)}|{stat.st_size}|{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class LessonCache:
+    """
+    On-disk LRU cache of successful lesson generation results.
+
+    Each entry is a JSON-serialized ``LessonGenerationResult`` stored as
+    ``<cache_dir>/<key>.json``. File modification times track recency: hits
+    touch their entry and writes evict the least recently used entries once
+    ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = 500):
+        """
+        Initialize the lesson cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_entries: Maximum number of entries kept on disk
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+
+    @staticmethod
+    def make_key(topic: TopicConfig, config: GenerationConfig) -> str:
+        """
+        Create the cache key for a topic and the settings that shape its content.
+
+        Covers the generator version, the output directory, the AI settings
+        and the contents of the custom template and reference lesson
+        directories, so changing any of them regenerates the lesson.
+
+        Args:
+            topic: Topic configuration (all fields feed into the prompts)
+            config: Generation configuration of the run
+
+        Returns:
+            Short hexadecimal key
+        """
+        key_source = "|".join((
+            __version__,
+            str(config.output_dir),
+            config.openai_model,
+            str(config.use_ai),
+            str(config.strict_ai),
+            str(config.bundle_module_requests),
+            _tree_fingerprint(config.custom_templates_dir),
+            _tree_fingerprint(config.reference_lesson_dir),
+            topic.model_dump_json(),
+        ))
+        return hashlib.blake2b(key_source.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[LessonGenerationResult]:
+        """
+        Look up a cached result whose lesson directory still exists.
+
+        Args:
+            key: Key from ``make_key``
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        entry_path = self._entry_path(key)
+        try:
+            result = LessonGenerationResult.model_validate_json(entry_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+        if not result.success or not Path(result.output_path).is_dir():
+            return None
+
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: LessonGenerationResult) -> None:
+        """
+        Store a successful result and evict old entries beyond ``max_entries``.
+
+        Args:
+            key: Key from ``make_key``
+            result: Result of a successful generation
+        """
+        if not result.success:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_dir / f".{key}.{os.getpid()}.tmp"
+            tmp_path.write_text(result.model_dump_json(), encoding='utf-8')
+            os.replace(tmp_path, self._entry_path(key))
+            self._evict()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries beyond ``max_entries``."""
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")]
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+class ResponseCache:
+    """
+    SQLite-backed store of generated content responses with LRU eviction.
+
+    Responses are stored as JSON and keyed by short hexadecimal digests. The
+    database lives in a user-chosen cache directory that other processes can
+    write to, so rows are treated as untrusted input: they are validated when
+    read back, and anything that does not validate counts as a miss. Each
+    lookup records a hit count and last-used time; once more than
+    ``max_entries`` rows are stored the least recently used ones are deleted,
+    using an index on the last-used time. A bounded in-memory LRU of decoded responses sits in front of the
+    database so hot entries skip SQLite and validation. A single connection is
+    shared between threads and serialized with a lock.
+    """
+
+    MISS = object()
+
+    def __init__(self, db_path: Optional[Path] = None, max_entries: int = 10000, memory_entries: int = 2048):
+        """
+        Open (or create) the cache database.
+
+        Uses an in-memory database when no file is given, or if the file
+        cannot be opened, e.g. in a read-only directory.
+
+        Args:
+            db_path: SQLite database file, or None to cache for this process only
+            max_entries: Maximum number of rows kept
+            memory_entries: Maximum number of values kept in memory (0 disables)
+        """
+        self.db_path = Path(db_path) if db_path is not None else None
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._conn = None
+        if self.db_path is not None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = self._connect(str(self.db_path))
+            except (OSError, sqlite3.Error):
+                pass
+        if self._conn is None:
+            self._conn = self._connect(":memory:")
+        # Rows written by this connection are counted as they are inserted;
+        # other processes sharing the file only make eviction approximate
+        self._rows = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def _connect(database: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(database, timeout=30, check_same_thread=False, isolation_level=None)
+        # WAL lets readers in other processes proceed during writes; NORMAL sync
+        # is durable enough for a cache and avoids an fsync per insert
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "hits INTEGER NOT NULL DEFAULT 0, last_used REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        return conn
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached response, or ``default``
+        """
+        with self._lock:
+            value = self._memory.get(key, self.MISS)
+            if value is not self.MISS:
+                self._memory.move_to_end(key)
+                return value
+
+            try:
+                row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return default
+                self._conn.execute(
+                    "UPDATE responses SET hits = hits + 1, last_used = ? WHERE key = ?",
+                    (time.time(), key)
+                )
+            except sqlite3.Error:
+                return default
+
+        try:
+            value = ContentGenerationResponse.model_validate_json(row[0])
+        except ValueError:
+            return default
+
+        with self._lock:
+            self._remember(key, value)
+        return value
+
+    def set(self, key: str, value: ContentGenerationResponse) -> None:
+        """
+        Store a response, evicting least recently used rows beyond ``max_entries``.
+
+        Args:
+            key: Cache key
+            value: Response to store
+        """
+        blob = value.model_dump_json()
+        with self._lock:
+            self._remember(key, value)
+            try:
+                now = time.time()
+                inserted = self._conn.execute(
+                    "INSERT OR IGNORE INTO responses (key, value, hits, last_used) VALUES (?, ?, 0, ?)",
+                    (key, blob, now)
+                ).rowcount
+                if not inserted:
+                    self._conn.execute(
+                        "UPDATE responses SET value = ?, hits = 0, last_used = ? WHERE key = ?",
+                        (blob, now, key)
+                    )
+                    return
+
+                self._rows += 1
+                excess = self._rows - self.max_entries
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM responses WHERE key IN ("
+                        "SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                        (excess,)
+                    )
+                    self._rows = self.max_entries
+            except sqlite3.Error:
+                pass
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Put a value in the in-memory tier, evicting the least recently used. Caller holds the lock."""
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key in self._memory:
+                return True
+            try:
+                return self._conn.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone() is not None
+            except sqlite3.Error:
+                return False
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._memory.clear()
+            self._conn.close()
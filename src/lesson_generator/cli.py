@@ -5,343 +5,266 @@ This module provides the main CLI entry point using Click framework.
 It handles command parsing, validation, and orchestrates the lesson generation process.
 """
 
+import functools
+import importlib
+import json
+import logging
 import os
-import sys
+import stat
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import click
-from dotenv import load_dotenv
 
-from .models import TopicConfig, GenerationConfig
-from .core import LessonGenerator
-from .utils.validation import validate_topic, validate_output_path
+from .models import (
+    TopicConfig,
+    ModuleConfig,
+    DifficultyLevel,
+    ModuleType,
+    CodeComplexity
+)
+from .utils.validation import validate_topic_name, create_slug_from_name
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-# Load environment variables from .env file
-load_dotenv()
+logger = logging.getLogger(__name__)
 
+# Defaults for topics created from a bare name ({0} is the lowercased name)
+_CONCEPT_TEMPLATES = (
+    "{0} fundamentals",
+    "practical applications",
+    "best practices",
+    "real-world examples"
+)
+_OBJECTIVE_TEMPLATES = (
+    "Understand core concepts of {0}",
+    "Apply {0} techniques effectively",
+    "Implement {0} solutions to real problems",
+    "Follow best practices in {0}"
+)
+_HOURS_BY_DIFFICULTY = {
+    "beginner": 4.0,
+    "intermediate": 6.0,
+    "advanced": 8.0
+}
+_COMPLEXITY_BY_DIFFICULTY = {
+    "beginner": CodeComplexity.SIMPLE,
+    "intermediate": CodeComplexity.MODERATE,
+    "advanced": CodeComplexity.COMPLEX
+}
 
-@click.group()
-@click.version_option(version="0.1.0", prog_name="lesson-generator")
-def cli():
+
+class LazyGroup(click.Group):
     """
-    AI-powered lesson generator for programming courses.
+    Click group that loads subcommands on demand.
     
-    Generate comprehensive programming lessons from topic descriptions using
-    OpenAI's API and customizable templates.
+    Commands live in ``lesson_generator.commands.<module>`` and are only
+    imported when looked up, so running one command does not pay for
+    building the others (notably ``create``'s long option chain).
     """
-    pass
+    
+    def __init__(self, *args, lazy_commands: Optional[Dict[str, str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+    
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+    
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        module_name = self.lazy_commands.get(cmd_name)
+        if module_name is None:
+            return super().get_command(ctx, cmd_name)
+        
+        module = importlib.import_module(f".commands.{module_name}", package=__package__)
+        return module.cmd
 
 
-@cli.command()
-@click.argument('topics', nargs=-1, required=True)
-@click.option(
-    '--output', '-o',
-    type=click.Path(exists=False, file_okay=False, dir_okay=True, path_type=Path),
-    default=Path('./generated_lessons'),
-    help='Output directory for generated lessons'
-)
-@click.option(
-    '--modules', '-m',
-    type=click.IntRange(1, 10),
-    default=None,
-    help='Number of modules per lesson (1-10). If omitted, must be provided via --config file.'
-)
-@click.option(
-    '--difficulty', '-d',
-    type=click.Choice(['beginner', 'intermediate', 'advanced'], case_sensitive=False),
-    default='intermediate',
-    help='Target difficulty level'
-)
-@click.option(
-    '--beginner', '-b',
-    'difficulty_shortcut',
-    flag_value='beginner',
-    help='Shortcut for --difficulty beginner'
-)
-@click.option(
-    '--intermediate', '-i',
-    'difficulty_shortcut', 
-    flag_value='intermediate',
-    help='Shortcut for --difficulty intermediate'
-)
-@click.option(
-    '--advanced', '-a',
-    'difficulty_shortcut',
-    flag_value='advanced', 
-    help='Shortcut for --difficulty advanced'
-)
-@click.option(
-    '--config',
-    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
-    help='Path to topic configuration JSON file'
-)
-@click.option(
-    '--openai-api-key',
-    envvar='OPENAI_API_KEY',
-    help='OpenAI API key (or set OPENAI_API_KEY env var)'
-)
-@click.option(
-    '--no-ai',
-    is_flag=True,
-    default=False,
-    help='Use deterministic content generation without AI'
-)
-@click.option(
-    '--strict-ai/--no-strict-ai',
-    default=True,
-    help='Require AI for all content (default: strict)'
-)
-@click.option(
-    '--cost-efficient',
-    is_flag=True,
-    default=False,
-    help='Use cost-optimized AI settings (GPT-3.5-turbo, reduced tokens)'
-)
-@click.option(
-    '--workers',
-    type=click.IntRange(1, 8),
-    default=1,
-    help='Number of parallel workers for processing'
-)
-@click.option(
-    '--templates',
-    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
-    help='Custom templates directory to override defaults'
-)
-@click.option(
-    '--reference',
-    type=click.Path(exists=True, file_okay=False, dir_okay=True, path_type=Path),
-    help='Reference lesson directory to extract templates from'
-)
-@click.option(
-    '--cache/--no-cache',
-    default=True,
-    help='Enable/disable generation cache (default: enabled)'
-)
-@click.option(
-    '--verbose', '-v',
-    is_flag=True,
-    default=False,
-    help='Enable verbose output'
-)
-def create(
-    topics: tuple,
-    output: Path,
-    modules: Optional[int],
-    difficulty: str,
-    difficulty_shortcut: Optional[str],
-    config: Optional[Path],
-    openai_api_key: Optional[str],
-    no_ai: bool,
-    strict_ai: bool,
-    cost_efficient: bool,
-    workers: int,
-    templates: Optional[Path],
-    reference: Optional[Path],
-    cache: bool,
-    verbose: bool
-) -> None:
+class ClickHandler(logging.Handler):
     """
-    Create lessons from topic names or configuration file.
+    Logging handler that writes records through ``click.echo``.
     
-    TOPICS: Space-separated list of topic names (e.g., async_programming design_patterns)
+    Styling happens only for records that are actually emitted. Records may
+    carry an ``fg`` attribute (via ``extra``) to override the level colour.
+    """
     
-    Examples:
+    LEVEL_COLORS = {
+        logging.WARNING: 'yellow',
+        logging.ERROR: 'red',
+        logging.CRITICAL: 'red',
+    }
     
-        # Generate single lesson
-        lesson-generator create async_programming --output ./lessons
-        
-        # Generate multiple lessons with custom difficulty
-        lesson-generator create async_programming design_patterns --difficulty advanced
-        
-        # Use configuration file
-        lesson-generator create --config topics.json
-        
-        # Generate without AI (deterministic content)
-        lesson-generator create async_programming --no-ai
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = self.format(record)
+            fg = getattr(record, 'fg', None) or self.LEVEL_COLORS.get(record.levelno)
+            click.echo(click.style(message, fg=fg) if fg else message)
+        except Exception:
+            self.handleError(record)
+
+
+def configure_logging(verbose: bool) -> None:
     """
+    Route package log records to the terminal when verbose, otherwise drop them.
     
-    # Resolve difficulty (shortcuts override main option)
-    final_difficulty = difficulty_shortcut or difficulty
+    Args:
+        verbose: Whether to show DEBUG and INFO output
+    """
+    package_logger = logging.getLogger(__package__)
+    for handler in list(package_logger.handlers):
+        if isinstance(handler, (ClickHandler, logging.NullHandler)):
+            package_logger.removeHandler(handler)
     
-    # Validate AI configuration
-    if not no_ai and strict_ai and not openai_api_key:
-        click.echo(click.style(
-            "Error: OpenAI API key required for AI-powered generation. "
-            "Set OPENAI_API_KEY environment variable or use --openai-api-key option. "
-            "Alternatively, use --no-ai for deterministic generation.",
-            fg='red'
-        ), err=True)
-        sys.exit(1)
+    package_logger.addHandler(ClickHandler() if verbose else logging.NullHandler())
+    package_logger.setLevel(logging.DEBUG if verbose else logging.WARNING)
+    package_logger.propagate = False
+
+
+def _path_is_plain(path: str) -> bool:
+    """Check that ``path`` is a non-empty string ``os.stat`` can take."""
+    return bool(path) and '\x00' not in path
+
+
+def _path_is_acceptable(path: str, exists: bool, file_okay: bool, dir_okay: bool, readable: bool) -> bool:
+    """Check ``click.Path`` constraints for ``path`` with a single ``stat``."""
+    if not _path_is_plain(path):
+        return False
     
-    # Validate output path
+    # Never memoized: the path may be created, removed or replaced between calls
     try:
-        validate_output_path(output)
-    except ValueError as e:
-        click.echo(click.style(f"Error: {e}", fg='red'), err=True)
-        sys.exit(1)
+        mode = os.stat(path).st_mode
+    except OSError:
+        return not exists
     
-    # Apply cost-efficient settings if requested
-    if cost_efficient and not no_ai:
-        # Force GPT-3.5-turbo for cost efficiency
-        openai_model = "gpt-3.5-turbo"
-        rate_limit_delay = 0.5  # Shorter delay for faster processing
-        if verbose:
-            click.echo("💰 Cost-efficient mode enabled: Using GPT-3.5-turbo with reduced token limits")
-    else:
-        openai_model = "gpt-4"
-        rate_limit_delay = 1.0
+    if not file_okay and stat.S_ISREG(mode):
+        return False
+    if not dir_okay and stat.S_ISDIR(mode):
+        return False
+    return not readable or os.access(path, os.R_OK)
+
+
+class CachedPath(click.Path):
+    """
+    ``click.Path`` with a single-``stat`` fast path.
     
-    # Set up generation configuration
-    generation_config = GenerationConfig(
-        output_dir=output,
-        modules_count=modules,
-        difficulty=final_difficulty,
-        use_ai=not no_ai,
-        strict_ai=strict_ai,
-        workers=workers,
-        custom_templates_dir=templates,
-        reference_lesson_dir=reference,
-        enable_cache=cache,
-        verbose=verbose,
-        openai_api_key=openai_api_key,
-        openai_model=openai_model,
-        rate_limit_delay=rate_limit_delay
-    )
+    The filesystem is checked on every call. Anything that fails (or uses
+    options the fast path does not model) goes through ``click.Path`` so
+    users still get Click's error messages.
+    """
     
-    # Determine topics to process
-    topics_to_process = []
+    def convert(self, value, param, ctx):
+        if (isinstance(value, (str, os.PathLike))
+                and not (self.resolve_path or self.writable or self.executable)
+                and not (self.allow_dash and value == '-')
+                and _path_is_acceptable(os.fspath(value), self.exists, self.file_okay, self.dir_okay, self.readable)):
+            return self.coerce_path_result(value)
+        return super().convert(value, param, ctx)
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_commands={
+        'create': 'create',
+        'init-env': 'init_env',
+        'validate': 'validate',
+        'version': 'version',
+    }
+)
+@click.version_option(version="0.1.0", prog_name="lesson-generator")
+def cli():
+    """
+    AI-powered lesson generator for programming courses.
     
-    if config:
-        # Load topics from configuration file
-        try:
-            topics_to_process = load_topics_from_config(config)
-        except Exception as e:
-            click.echo(click.style(f"Error loading config file: {e}", fg='red'), err=True)
-            sys.exit(1)
-    else:
-        # Create topics from command line arguments
-        # If CLI topics are provided, require explicit modules count (no default)
-        if modules is None:
-            click.echo(click.style(
-                "Error: --modules is required when creating topics on the command line without --config.\n"
-                "Provide --modules N (1-10) or use --config to load topic definitions.",
-                fg='red'
-            ), err=True)
-            sys.exit(1)
-        for topic_name in topics:
-            try:
-                topic_config = create_topic_from_name(topic_name, final_difficulty, modules)
-                validate_topic(topic_config)
-                topics_to_process.append(topic_config)
-            except ValueError as e:
-                click.echo(click.style(f"Error with topic '{topic_name}': {e}", fg='red'), err=True)
-                sys.exit(1)
+    Generate comprehensive programming lessons from topic descriptions using
+    OpenAI's API and customizable templates.
+    """
+    pass
+
+
+
+def load_topics_from_config(config_path: Path) -> List[TopicConfig]:
+    """
+    Load and validate topics from configuration file.
     
-    if not topics_to_process:
-        click.echo(click.style("Error: No valid topics to process", fg='red'), err=True)
-        sys.exit(1)
+    The file may contain a single ``{"topic": {...}}`` object, a list of them
+    (as in ``config/default_topics.json``) or ``{"topics": [...]}``. Parsed
+    topics are cached per path and modification time.
     
-    # Initialize lesson generator
+    Raises:
+        ValueError: If the file cannot be read or a topic is invalid
+    """
     try:
-        generator = LessonGenerator(generation_config)
-    except Exception as e:
-        click.echo(click.style(f"Error initializing generator: {e}", fg='red'), err=True)
-        sys.exit(1)
+        resolved_path = Path(config_path).resolve()
+        mtime = resolved_path.stat().st_mtime_ns
+    except OSError as e:
+        raise ValueError(f"Cannot read configuration file: {e}")
     
-    # Progress reporting
-    if verbose:
-        click.echo(f"Generating {len(topics_to_process)} lesson(s):")
-        for topic in topics_to_process:
-            click.echo(f"  - {topic.name} ({topic.difficulty})")
-        click.echo(f"Output directory: {output}")
-        click.echo(f"AI enabled: {not no_ai}")
-        click.echo()
+    # Hand out private copies so callers cannot mutate the cached topics
+    return [topic.model_copy(deep=True) for topic in _load_topics_cached(resolved_path, mtime)]
+
+
+@functools.lru_cache(maxsize=32)
+def _load_topics_cached(config_path: Path, mtime: int) -> tuple:
+    """Parse and validate a topic configuration file (memoized on path and mtime)."""
+    try:
+        data = _json_loads(config_path.read_bytes())
+    except OSError as e:
+        raise ValueError(f"Cannot read configuration file: {e}")
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON in configuration file: {e}")
     
-    # Generate lessons
-    total_lessons = len(topics_to_process)
-    success_count = 0
+    if isinstance(data, dict):
+        entries = data.get("topics", [data])
+    else:
+        entries = data
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("Configuration file must contain at least one topic")
     
-    with click.progressbar(topics_to_process, label='Generating lessons') as topics_progress:
-        for topic in topics_progress:
-            try:
-                if verbose:
-                    click.echo(f"\nProcessing: {topic.name}")
-                
-                result = generator.generate_lesson(topic)
-                
-                if result.success:
-                    success_count += 1
-                    if verbose:
-                        click.echo(click.style(f"✓ Generated: {topic.name}", fg='green'))
-                else:
-                    if verbose:
-                        click.echo(click.style(f"✗ Failed: {topic.name} - {result.error}", fg='red'))
-                    
-            except Exception as e:
-                if verbose:
-                    click.echo(click.style(f"✗ Error processing {topic.name}: {e}", fg='red'))
+    topics = []
+    for index, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Topic {index} must be a JSON object")
+        try:
+            topics.append(TopicConfig(**entry.get("topic", entry)))
+        except ValueError as e:
+            raise ValueError(f"Invalid topic {index} in configuration file: {e}")
     
-    # Final summary
-    click.echo()
-    if success_count == total_lessons:
-        click.echo(click.style(
-            f"✓ Successfully generated all {total_lessons} lesson(s) in {output}",
-            fg='green'
-        ))
-    else:
-        failed_count = total_lessons - success_count
-        click.echo(click.style(
-            f"Generated {success_count}/{total_lessons} lessons. {failed_count} failed.",
-            fg='yellow' if success_count > 0 else 'red'
-        ))
-        click.echo(f"Check individual error logs in the output directory for details.")
-
-
-def load_topics_from_config(config_path: Path) -> List[TopicConfig]:
-    """Load and validate topics from configuration file."""
-    # Implementation will be added in next iteration
-    raise NotImplementedError("Configuration file loading not yet implemented")
+    return tuple(topics)
 
 
 def create_topic_from_name(topic_name: str, difficulty: str, modules_count: int) -> TopicConfig:
     """Create a topic configuration from a simple topic name."""
-    print(f"🔧 DEBUG CLI: create_topic_from_name called with topic='{topic_name}', difficulty='{difficulty}', modules_count={modules_count}")
-    from .utils.validation import validate_topic_name, create_slug_from_name
-    from .models import TopicConfig, ModuleConfig, DifficultyLevel, ModuleType, CodeComplexity
-    
+    logger.debug(
+        "create_topic_from_name called with topic=%r, difficulty=%r, modules_count=%d",
+        topic_name, difficulty, modules_count
+    )
+    # Hand out a private copy so callers cannot mutate the cached instance
+    topic_config = _build_topic_from_name(topic_name, difficulty, modules_count).model_copy(deep=True)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Created %d modules: %s", len(topic_config.modules), [m.name for m in topic_config.modules])
+    return topic_config
+
+
+@functools.lru_cache(maxsize=256)
+def _build_topic_from_name(topic_name: str, difficulty: str, modules_count: int) -> TopicConfig:
+    """Build the topic configuration for ``create_topic_from_name`` (memoized, side-effect free)."""
     # Validate and normalize topic name
     normalized_name = validate_topic_name(topic_name)
     slug = create_slug_from_name(normalized_name)
+    lname = normalized_name.lower()
     
     # Create basic topic description
-    description = f"A comprehensive lesson on {normalized_name.lower()} concepts and practical applications."
+    description = f"A comprehensive lesson on {lname} concepts and practical applications."
     
-    # Generate basic concepts based on topic name
-    concepts = [
-        f"{normalized_name.lower()} fundamentals",
-        "practical applications",
-        "best practices",
-        "real-world examples"
-    ]
-    
-    # Create learning objectives
-    learning_objectives = [
-        f"Understand core concepts of {normalized_name.lower()}",
-        f"Apply {normalized_name.lower()} techniques effectively",
-        f"Implement {normalized_name.lower()} solutions to real problems",
-        f"Follow best practices in {normalized_name.lower()}"
-    ]
+    # Generate basic concepts and learning objectives based on topic name
+    concepts = [template.format(lname) for template in _CONCEPT_TEMPLATES]
+    learning_objectives = [template.format(lname) for template in _OBJECTIVE_TEMPLATES]
     
     # Determine estimated hours based on difficulty
-    hours_map = {
-        "beginner": 4.0,
-        "intermediate": 6.0,
-        "advanced": 8.0
-    }
-    estimated_hours = hours_map.get(difficulty, 6.0)
+    estimated_hours = _HOURS_BY_DIFFICULTY.get(difficulty, 6.0)
     
     # Create modules based on requested count
     modules = []
@@ -352,16 +275,13 @@ def create_topic_from_name(topic_name: str, difficulty: str, modules_count: int)
     
     # For single module, create just one starter module
     if modules_count == 1:
-        print(f"🔧 DEBUG CLI: Creating single module for {normalized_name}")
         modules.append(ModuleConfig(
             name=f"{normalized_name} Overview",
             type=ModuleType.STARTER,
             focus_areas=["core concepts", "overview", "practical examples"],
             code_complexity=CodeComplexity.SIMPLE
         ))
-        print(f"🔧 DEBUG CLI: Single module created: {modules[0].name}")
     else:
-        print(f"🔧 DEBUG CLI: Creating {modules_count} modules for {normalized_name}")
         # Always start with a starter module for multi-module lessons
         modules.append(ModuleConfig(
             name=f"{normalized_name} Fundamentals",
@@ -371,12 +291,7 @@ def create_topic_from_name(topic_name: str, difficulty: str, modules_count: int)
         ))
         
         # Add assignment modules and project module to reach requested count
-        complexity_map = {
-            "beginner": CodeComplexity.SIMPLE,
-            "intermediate": CodeComplexity.MODERATE,
-            "advanced": CodeComplexity.COMPLEX
-        }
-        default_complexity = complexity_map.get(difficulty, CodeComplexity.MODERATE)
+        default_complexity = _COMPLEXITY_BY_DIFFICULTY.get(difficulty, CodeComplexity.MODERATE)
         
         # Add assignment modules (leave room for project module if needed)
         assignment_count = modules_count - 1  # Subtract starter module
@@ -401,8 +316,7 @@ def create_topic_from_name(topic_name: str, difficulty: str, modules_count: int)
             ))
     
     # Create and return topic configuration
-    print(f"🔧 DEBUG CLI: Final modules list has {len(modules)} modules: {[m.name for m in modules]}")
-    topic_config = TopicConfig(
+    return TopicConfig(
         name=normalized_name,
         slug=slug,
         description=description,
@@ -413,93 +327,6 @@ def create_topic_from_name(topic_name: str, difficulty: str, modules_count: int)
         prerequisites=[],  # Empty for generated topics
         modules=modules
     )
-    print(f"🔧 DEBUG CLI: Returning topic config with {len(topic_config.modules)} modules")
-    return topic_config
-
-
-@cli.command()
-def version():
-    """Show version information."""
-    click.echo("lesson-generator version 0.1.0")
-
-
-@cli.command()
-@click.argument('lesson_path', type=click.Path(exists=True, path_type=Path))
-@click.option('-v', '--verbose', is_flag=True, help='Enable verbose output')
-def validate(lesson_path: Path, verbose: bool):
-    """
-    Validate the quality of a generated lesson.
-    
-    LESSON_PATH: Path to the lesson directory to validate
-    
-    Examples:
-        lesson-generator validate ./generated_lessons/python_fundamentals
-        lesson-generator validate ./my_lesson --verbose
-    """
-    from .quality import QualityAssurance
-    from .models import GenerationConfig
-    
-    try:
-        # Create minimal config for quality assurance
-        config = GenerationConfig(
-            output_dir=lesson_path.parent,
-            verbose=verbose
-        )
-        
-        qa = QualityAssurance(config)
-        report = qa.validate_lesson(lesson_path)
-        
-        # Print results
-        if report.quality_score >= 0.8:
-            click.echo(click.style(f"✓ Excellent quality: {report.quality_score:.2f}/1.0", fg='green'))
-        elif report.quality_score >= 0.6:
-            click.echo(click.style(f"⚠ Good quality: {report.quality_score:.2f}/1.0", fg='yellow'))
-        else:
-            click.echo(click.style(f"✗ Poor quality: {report.quality_score:.2f}/1.0", fg='red'))
-        
-        if report.issues:
-            click.echo("\nIssues found:")
-            for issue in report.issues:
-                click.echo(f"  - {issue}")
-        
-        # Exit with appropriate code
-        sys.exit(0 if report.quality_score >= 0.6 else 1)
-        
-    except Exception as e:
-        click.echo(click.style(f"Validation failed: {e}", fg='red'), err=True)
-        sys.exit(1)
-
-
-@cli.command()
-@click.option(
-    '--output', '-o',
-    type=click.Path(exists=False, file_okay=True, dir_okay=False, path_type=Path),
-    default=Path('.env'),
-    help='Output file for environment template'
-)
-def init_env(output: Path):
-    """Initialize environment file with template."""
-    template = '''# Lesson Generator Environment Configuration
-
-# OpenAI API Configuration
-OPENAI_API_KEY=your_openai_api_key_here
-OPENAI_MODEL=gpt-4
-
-# Development Settings  
-DEBUG=False
-LOG_LEVEL=INFO
-
-# Default Settings
-# DEFAULT_OUTPUT_DIR=./generated_lessons
-'''
-    
-    if output.exists():
-        if not click.confirm(f"File {output} exists. Overwrite?"):
-            return
-    
-    output.write_text(template)
-    click.echo(f"Environment template written to {output}")
-    click.echo("Please edit the file and add your OpenAI API key.")
 
 
 def main():
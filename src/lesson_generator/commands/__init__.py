@@ -0,0 +1,6 @@
+"""
+CLI subcommands.
+
+Each module defines one Click command as ``cmd``; ``cli.LazyGroup`` imports a
+module only when its command is looked up.
+"""
@@ -0,0 +1,496 @@
+"""
+The ``create`` command.
+
+Generates lessons from topic names or a configuration file, dispatching
+lessons concurrently and optionally prefetching AI content in batches.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Iterator, List, Optional
+
+import click
+
+from ..cache import LessonCache
+from ..cli import CachedPath, configure_logging, create_topic_from_name, load_topics_from_config
+from ..models import TopicConfig, GenerationConfig, ModuleType
+from ..utils.validation import validate_topics, validate_output_path
+
+logger = logging.getLogger(__name__)
+
+# Seconds between Batch API status checks
+BATCH_POLL_SECONDS = 30
+
+# (openai_model, rate_limit_delay) keyed by whether cost-efficient AI is on:
+# GPT-3.5-turbo with a shorter delay, or GPT-4
+MODEL_PRESET = {
+    True: ("gpt-3.5-turbo", 0.5),
+    False: ("gpt-4", 1.0),
+}
+
+
+@click.command(name='create')
+@click.argument('topics', nargs=-1, required=True)
+@click.option(
+    '--output', '-o',
+    type=CachedPath(exists=False, file_okay=False, dir_okay=True, path_type=Path),
+    default=Path('./generated_lessons'),
+    help='Output directory for generated lessons'
+)
+@click.option(
+    '--modules', '-m',
+    type=click.IntRange(1, 10),
+    default=None,
+    help='Number of modules per lesson (1-10). If omitted, must be provided via --config file.'
+)
+@click.option(
+    '--difficulty', '-d',
+    type=click.Choice(['beginner', 'intermediate', 'advanced'], case_sensitive=False),
+    default='intermediate',
+    help='Target difficulty level'
+)
+@click.option(
+    '--beginner', '-b',
+    'difficulty_shortcut',
+    flag_value='beginner',
+    help='Shortcut for --difficulty beginner'
+)
+@click.option(
+    '--intermediate', '-i',
+    'difficulty_shortcut', 
+    flag_value='intermediate',
+    help='Shortcut for --difficulty intermediate'
+)
+@click.option(
+    '--advanced', '-a',
+    'difficulty_shortcut',
+    flag_value='advanced', 
+    help='Shortcut for --difficulty advanced'
+)
+@click.option(
+    '--config',
+    type=CachedPath(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    help='Path to topic configuration JSON file'
+)
+@click.option(
+    '--openai-api-key',
+    envvar='OPENAI_API_KEY',
+    help='OpenAI API key (or set OPENAI_API_KEY env var)'
+)
+@click.option(
+    '--no-ai',
+    is_flag=True,
+    default=False,
+    help='Use deterministic content generation without AI'
+)
+@click.option(
+    '--strict-ai/--no-strict-ai',
+    default=True,
+    help='Require AI for all content (default: strict)'
+)
+@click.option(
+    '--cost-efficient',
+    is_flag=True,
+    default=False,
+    help='Use cost-optimized AI settings (GPT-3.5-turbo, reduced tokens)'
+)
+@click.option(
+    '--workers',
+    type=click.IntRange(1, 8),
+    default=1,
+    help='Number of parallel workers for processing'
+)
+@click.option(
+    '--rpm',
+    type=click.IntRange(min=1),
+    default=None,
+    help='Maximum OpenAI requests per minute (default: no proactive limit)'
+)
+@click.option(
+    '--tpm',
+    type=click.IntRange(min=1),
+    default=None,
+    help='Maximum OpenAI tokens per minute (default: no proactive limit)'
+)
+@click.option(
+    '--batch-size',
+    type=click.IntRange(1, 20),
+    default=1,
+    help='Pack up to N same-type AI requests from different modules into one call (default: 1, no packing)'
+)
+@click.option(
+    '--batch-api',
+    is_flag=True,
+    default=False,
+    help='Submit AI requests through the OpenAI Batch API (half price, may take hours)'
+)
+@click.option(
+    '--templates',
+    type=CachedPath(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    help='Custom templates directory to override defaults'
+)
+@click.option(
+    '--reference',
+    type=CachedPath(exists=True, file_okay=False, dir_okay=True, path_type=Path),
+    help='Reference lesson directory to extract templates from'
+)
+@click.option(
+    '--cache/--no-cache',
+    default=True,
+    help='Enable/disable generation cache (default: enabled)'
+)
+@click.option(
+    '--cache-dir',
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    help='Keep AI responses and finished lessons in this directory across runs '
+         '(default: cache in memory for the current run only)'
+)
+@click.option(
+    '--verbose', '-v',
+    is_flag=True,
+    default=False,
+    help='Enable verbose output'
+)
+def create(
+    topics: tuple,
+    output: Path,
+    modules: Optional[int],
+    difficulty: str,
+    difficulty_shortcut: Optional[str],
+    config: Optional[Path],
+    openai_api_key: Optional[str],
+    no_ai: bool,
+    strict_ai: bool,
+    cost_efficient: bool,
+    workers: int,
+    rpm: Optional[int],
+    tpm: Optional[int],
+    batch_size: int,
+    batch_api: bool,
+    templates: Optional[Path],
+    reference: Optional[Path],
+    cache: bool,
+    cache_dir: Optional[Path],
+    verbose: bool
+) -> None:
+    """
+    Create lessons from topic names or configuration file.
+    
+    TOPICS: Space-separated list of topic names (e.g., async_programming design_patterns)
+    
+    Examples:
+    
+        # Generate single lesson
+        lesson-generator create async_programming --output ./lessons
+        
+        # Generate multiple lessons with custom difficulty
+        lesson-generator create async_programming design_patterns --difficulty advanced
+        
+        # Use configuration file
+        lesson-generator create --config topics.json
+        
+        # Generate without AI (deterministic content)
+        lesson-generator create async_programming --no-ai
+        
+        # Reuse AI responses and finished lessons across runs
+        lesson-generator create async_programming --cache-dir ./.lesson-cache
+    """
+    
+    # Load environment variables from .env file. Click has already resolved
+    # --openai-api-key from the process environment, so re-check it afterwards.
+    from dotenv import load_dotenv
+    load_dotenv()
+    openai_api_key = openai_api_key or os.environ.get('OPENAI_API_KEY')
+    
+    configure_logging(verbose)
+    
+    # Prefetched content is only kept in the response cache
+    if batch_size > 1 and not cache:
+        raise click.UsageError("--batch-size requires the response cache; drop --no-cache")
+    if batch_api and not cache:
+        raise click.UsageError("--batch-api requires the response cache; drop --no-cache")
+    
+    # Resolve difficulty (shortcuts override main option)
+    final_difficulty = difficulty_shortcut or difficulty
+    use_ai = not no_ai
+    
+    # Validate AI configuration
+    if use_ai and strict_ai and not openai_api_key:
+        click.echo(click.style(
+            "Error: OpenAI API key required for AI-powered generation. "
+            "Set OPENAI_API_KEY environment variable or use --openai-api-key option. "
+            "Alternatively, use --no-ai for deterministic generation.",
+            fg='red'
+        ), err=True)
+        sys.exit(1)
+    
+    # Validate output path
+    try:
+        validate_output_path(output)
+    except ValueError as e:
+        click.echo(click.style(f"Error: {e}", fg='red'), err=True)
+        sys.exit(1)
+    
+    # Apply cost-efficient settings if requested
+    cost_efficient_ai = cost_efficient and use_ai
+    openai_model, rate_limit_delay = MODEL_PRESET[cost_efficient_ai]
+    if cost_efficient_ai and verbose:
+        click.echo("💰 Cost-efficient mode enabled: Using GPT-3.5-turbo with reduced token limits")
+    
+    # Set up generation configuration
+    generation_config = GenerationConfig(
+        output_dir=output,
+        modules_count=modules,
+        difficulty=final_difficulty,
+        use_ai=use_ai,
+        strict_ai=strict_ai,
+        workers=workers,
+        custom_templates_dir=templates,
+        reference_lesson_dir=reference,
+        enable_cache=cache,
+        cache_dir=cache_dir,
+        verbose=verbose,
+        openai_api_key=openai_api_key,
+        openai_model=openai_model,
+        rate_limit_delay=rate_limit_delay,
+        requests_per_minute=rpm,
+        tokens_per_minute=tpm
+    )
+    
+    # Determine topics to process
+    topics_to_process = []
+    
+    if config:
+        # Load topics from configuration file
+        try:
+            topics_to_process = load_topics_from_config(config)
+        except Exception as e:
+            click.echo(click.style(f"Error loading config file: {e}", fg='red'), err=True)
+            sys.exit(1)
+    else:
+        # Create topics from command line arguments
+        # If CLI topics are provided, require explicit modules count (no default)
+        if modules is None:
+            click.echo(click.style(
+                "Error: --modules is required when creating topics on the command line without --config.\n"
+                "Provide --modules N (1-10) or use --config to load topic definitions.",
+                fg='red'
+            ), err=True)
+            sys.exit(1)
+        for topic_name in topics:
+            try:
+                topics_to_process.append(create_topic_from_name(topic_name, final_difficulty, modules))
+            except ValueError as e:
+                click.echo(click.style(f"Error with topic '{topic_name}': {e}", fg='red'), err=True)
+                sys.exit(1)
+        
+        # Validate all topics in one pass
+        try:
+            validate_topics(topics_to_process)
+        except ValueError as e:
+            click.echo(click.style(f"Error: {e}", fg='red'), err=True)
+            sys.exit(1)
+    
+    if not topics_to_process:
+        click.echo(click.style("Error: No valid topics to process", fg='red'), err=True)
+        sys.exit(1)
+    
+    total_lessons = len(topics_to_process)
+    success_count = 0
+    
+    # Reuse lessons generated by an earlier run with identical settings
+    lesson_cache = LessonCache(cache_dir / "lessons") if cache and cache_dir else None
+    if lesson_cache:
+        pending_topics = []
+        for topic in topics_to_process:
+            if lesson_cache.get(lesson_cache.make_key(topic, generation_config)):
+                success_count += 1
+                if verbose:
+                    click.echo(f"↺ Reusing cached lesson: {topic.name}")
+            else:
+                pending_topics.append(topic)
+        topics_to_process = pending_topics
+        
+        if not topics_to_process:
+            _echo_summary(success_count, total_lessons, output)
+            return
+    
+    # Initialize lesson generator (imported here to keep CLI startup fast)
+    from ..core import LessonGenerator
+    
+    try:
+        generator = LessonGenerator(generation_config)
+    except Exception as e:
+        click.echo(click.style(f"Error initializing generator: {e}", fg='red'), err=True)
+        sys.exit(1)
+    
+    try:
+        # Pre-generate topic-independent content through the Batch API or packed requests
+        prefetch_items = [
+            (topic, module_config)
+            for topic in topics_to_process
+            for module_config in topic.modules
+            if module_config.type != ModuleType.EXTRA
+        ]
+        if batch_api:
+            batch_id = generator.content_generator.submit_batch(prefetch_items)
+            if batch_id:
+                click.echo(f"Waiting for OpenAI batch {batch_id} (checking every {BATCH_POLL_SECONDS}s)...")
+                batch_count = asyncio.run(_wait_for_batch(generator.content_generator, batch_id))
+                if verbose:
+                    click.echo(f"Batch API returned {batch_count} content item(s)")
+        if batch_size > 1:
+            packed_count = generator.content_generator.prefetch_packed(prefetch_items, batch_size)
+            if verbose:
+                click.echo(f"Prefetched {packed_count} content item(s) with batch size {batch_size}")
+        
+        # Progress reporting
+        if verbose:
+            click.echo(f"Generating {len(topics_to_process)} lesson(s):")
+            for topic in topics_to_process:
+                click.echo(f"  - {topic.name} ({topic.difficulty})")
+            click.echo(f"Output directory: {output}")
+            click.echo(f"AI enabled: {use_ai}")
+            click.echo()
+        
+        # Generate lessons
+        with _progress_reporter(len(topics_to_process), 'Generating lessons') as advance:
+            def on_done(topic: TopicConfig, outcome: Any) -> None:
+                nonlocal success_count
+                advance(f"Done {topic.name}")
+                
+                if isinstance(outcome, Exception):
+                    logger.error("✗ Error processing %s: %s", topic.name, outcome)
+                elif outcome.success:
+                    success_count += 1
+                    if lesson_cache:
+                        lesson_cache.put(lesson_cache.make_key(topic, generation_config), outcome)
+                    logger.info("✓ Generated: %s", topic.name, extra={'fg': 'green'})
+                else:
+                    logger.error("✗ Failed: %s - %s", topic.name, outcome.error)
+            
+            # Overlap the network-bound generations on a pool of --workers threads
+            asyncio.run(_generate_concurrently(generator, topics_to_process, workers, on_done))
+    finally:
+        # Release the pooled HTTP connections and the response cache
+        generator.content_generator.close()
+    
+    _echo_summary(success_count, total_lessons, output)
+
+
+cmd = create
+
+
+def _echo_summary(success_count: int, total_lessons: int, output: Path) -> None:
+    """Print the final generation summary."""
+    click.echo()
+    if success_count == total_lessons:
+        click.echo(click.style(
+            f"✓ Successfully generated all {total_lessons} lesson(s) in {output}",
+            fg='green'
+        ))
+    else:
+        failed_count = total_lessons - success_count
+        click.echo(click.style(
+            f"Generated {success_count}/{total_lessons} lessons. {failed_count} failed.",
+            fg='yellow' if success_count > 0 else 'red'
+        ))
+        click.echo(f"Check individual error logs in the output directory for details.")
+
+
+@contextlib.contextmanager
+def _progress_reporter(total: int, label: str) -> Iterator[Callable[[Optional[str]], None]]:
+    """
+    Report progress of ``total`` out-of-order completions.
+    
+    Yields an ``advance(description)`` callable. Uses a transient
+    ``rich.progress`` bar when rich is installed, otherwise ``click.progressbar``.
+    """
+    try:
+        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
+    except ImportError:
+        Progress = None
+    
+    if Progress is None:
+        with click.progressbar(length=total, label=label) as bar:
+            yield lambda description=None: bar.update(1)
+        return
+    
+    columns = (SpinnerColumn(), TextColumn("{task.description}"), BarColumn(), TimeRemainingColumn())
+    with Progress(*columns, transient=True) as progress:
+        task = progress.add_task(label, total=total)
+        yield lambda description=None: progress.update(task, advance=1, description=description or label)
+
+
+async def _wait_for_batch(content_generator, batch_id: str, poll_interval: float = None) -> int:
+    """Poll a submitted Batch API job until its results have been collected."""
+    poll_interval = BATCH_POLL_SECONDS if poll_interval is None else poll_interval
+    while True:
+        filled = content_generator.collect_batch(batch_id)
+        if filled is not None:
+            return filled
+        await asyncio.sleep(poll_interval)
+
+
+async def _generate_concurrently(
+    generator,
+    topics: List[TopicConfig],
+    workers: int,
+    on_done: Optional[Callable[[Any, Any], None]] = None
+) -> List[Any]:
+    """
+    Generate lessons concurrently on a dedicated pool of ``workers`` threads.
+    
+    ``generate_lesson_async`` runs the blocking generator in the loop's default
+    executor, so that executor is sized to ``--workers`` instead of Python's
+    CPU-based default. Without AI a lesson is pure CPU work (template rendering
+    and syntax checks) that threads would serialize on the GIL, so several
+    such lessons run on a process pool instead. Completion callbacks run on the
+    event loop thread, so the caller's counters need no locking.
+    """
+    loop = asyncio.get_running_loop()
+    process_pool = None
+    if not generator.config.use_ai and workers > 1 and len(topics) > 1:
+        process_pool = ProcessPoolExecutor(max_workers=min(workers, len(topics), os.cpu_count() or 1))
+    else:
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lesson-worker"))
+    
+    try:
+        jobs = [(topic, generator.generate_lesson_async(topic, process_pool)) for topic in topics]
+        return await _gather_with_semaphore(jobs, workers, on_done)
+    finally:
+        if process_pool is not None:
+            process_pool.shutdown()
+
+
+async def _gather_with_semaphore(
+    jobs: Iterable[tuple],
+    limit: int,
+    on_done: Optional[Callable[[Any, Any], None]] = None
+) -> List[Any]:
+    """
+    Await ``(key, coroutine)`` jobs concurrently with at most ``limit`` in flight.
+    
+    Exceptions are returned in place of results rather than raised, so one
+    failing lesson does not cancel the others. ``on_done(key, outcome)`` is
+    invoked as each job finishes.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+    
+    async def run(key: Any, coro: Awaitable[Any]) -> Any:
+        async with semaphore:
+            try:
+                outcome = await coro
+            except Exception as e:
+                outcome = e
+        if on_done:
+            on_done(key, outcome)
+        return outcome
+    
+    return await asyncio.gather(*(run(key, coro) for key, coro in jobs))
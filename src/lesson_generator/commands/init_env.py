@@ -0,0 +1,43 @@
+"""The ``init-env`` command."""
+
+from pathlib import Path
+
+import click
+
+
+@click.command(name='init-env')
+@click.option(
+    '--output', '-o',
+    type=click.Path(exists=False, file_okay=True, dir_okay=False, path_type=Path),
+    default=Path('.env'),
+    help='Output file for environment template'
+)
+def init_env(output: Path):
+    """Initialize environment file with template."""
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    template = '''# Lesson Generator Environment Configuration
+
+# OpenAI API Configuration
+OPENAI_API_KEY=your_openai_api_key_here
+OPENAI_MODEL=gpt-4
+
+# Development Settings  
+DEBUG=False
+LOG_LEVEL=INFO
+
+# Default Settings
+# DEFAULT_OUTPUT_DIR=./generated_lessons
+'''
+    
+    if output.exists():
+        if not click.confirm(f"File {output} exists. Overwrite?"):
+            return
+    
+    output.write_text(template)
+    click.echo(f"Environment template written to {output}")
+    click.echo("Please edit the file and add your OpenAI API key.")
+
+
+cmd = init_env
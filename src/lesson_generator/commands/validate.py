@@ -0,0 +1,56 @@
+"""The ``validate`` command."""
+
+import sys
+from pathlib import Path
+
+import click
+
+
+@click.command(name='validate')
+@click.argument('lesson_path', type=click.Path(exists=True, path_type=Path))
+@click.option('-v', '--verbose', is_flag=True, help='Enable verbose output')
+def validate(lesson_path: Path, verbose: bool):
+    """
+    Validate the quality of a generated lesson.
+    
+    LESSON_PATH: Path to the lesson directory to validate
+    
+    Examples:
+        lesson-generator validate ./generated_lessons/python_fundamentals
+        lesson-generator validate ./my_lesson --verbose
+    """
+    from ..quality import QualityAssurance
+    from ..models import GenerationConfig
+    
+    try:
+        # Create minimal config for quality assurance
+        config = GenerationConfig(
+            output_dir=lesson_path.parent,
+            verbose=verbose
+        )
+        
+        qa = QualityAssurance(config)
+        report = qa.validate_lesson(lesson_path)
+        
+        # Print results
+        if report.quality_score >= 0.8:
+            click.echo(click.style(f"✓ Excellent quality: {report.quality_score:.2f}/1.0", fg='green'))
+        elif report.quality_score >= 0.6:
+            click.echo(click.style(f"⚠ Good quality: {report.quality_score:.2f}/1.0", fg='yellow'))
+        else:
+            click.echo(click.style(f"✗ Poor quality: {report.quality_score:.2f}/1.0", fg='red'))
+        
+        if report.issues:
+            click.echo("\nIssues found:")
+            for issue in report.issues:
+                click.echo(f"  - {issue}")
+        
+        # Exit with appropriate code
+        sys.exit(0 if report.quality_score >= 0.6 else 1)
+        
+    except Exception as e:
+        click.echo(click.style(f"Validation failed: {e}", fg='red'), err=True)
+        sys.exit(1)
+
+
+cmd = validate
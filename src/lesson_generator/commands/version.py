@@ -0,0 +1,12 @@
+"""The ``version`` command."""
+
+import click
+
+
+@click.command(name='version')
+def version():
+    """Show version information."""
+    click.echo("lesson-generator version 0.1.0")
+
+
+cmd = version
@@ -6,36 +6,338 @@ It integrates with OpenAI's API to generate educational content and provides
 fallback mechanisms when AI is not available.
 """
 
-import asyncio
+import hashlib
+import re
+import threading
 import time
-from typing import Dict, Any, Optional
+from concurrent.futures import Future
+from functools import lru_cache
+from string import Template
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple
 import json
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from .models import (
     GenerationConfig, 
     TopicConfig, 
     ModuleConfig,
+    ModuleType,
+    CodeComplexity,
     ContentGenerationRequest,
     ContentGenerationResponse
 )
+from .cache import ResponseCache
+from .prompts import (
+    BASE_CONTEXT_TEMPLATE,
+    PROMPT_TEMPLATES,
+    DEFAULT_PROMPT_TEMPLATE,
+    ESTIMATED_MINUTES,
+    LEARNING_PATH_FALLBACK_TEMPLATE,
+    EXTRA_EXERCISES_FALLBACK_TEMPLATE,
+    GENERIC_FALLBACK_TEMPLATE,
+    DEFAULT_SYSTEM_PROMPT,
+    SYSTEM_PROMPTS,
+    load_fallback_code_template,
+)
+from .ratelimit import RateLimiter, RequestSpacer, call_with_backoff, get_token_counter
 
-# Try to support both the modern OpenAI client and the older openai module
-OPENAI_CLIENT_TYPE = None
+# OpenAI SDK objects, populated by _load_openai() on first use so that importing
+# this module (e.g. for fallback-only generation) does not pay for the SDK import
 OpenAI = None
 openai_legacy = None
-try:
-    # Modern client (openai>=1.x)
-    from openai import OpenAI as OpenAIClient  # type: ignore
-    OPENAI_CLIENT_TYPE = "modern"
-    OpenAI = OpenAIClient
-except Exception:
+_CALL_CHAT = None
+
+
+@lru_cache(maxsize=None)
+def _load_openai() -> Optional[str]:
+    """
+    Import the OpenAI package, supporting both the modern client and the older module.
+    
+    Returns:
+        "modern", "legacy", or None if the package is not installed
+    """
+    global OpenAI, openai_legacy, _CALL_CHAT
+    try:
+        # Modern client (openai>=1.x)
+        from openai import OpenAI as OpenAIClient  # type: ignore
+        OpenAI = OpenAIClient
+        _CALL_CHAT = _call_chat_modern
+        return "modern"
+    except Exception:
+        try:
+            # Fallback to legacy openai package (pre-1.0 API)
+            import openai as openai_legacy_module  # type: ignore
+            openai_legacy = openai_legacy_module
+            _CALL_CHAT = _call_chat_legacy
+            return "legacy"
+        except Exception:
+            return None
+
+
+def __getattr__(name: str):
+    # OPENAI_CLIENT_TYPE is resolved lazily so importing it still reflects the installed SDK
+    if name == "OPENAI_CLIENT_TYPE":
+        return _load_openai()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _call_chat_modern(client, prompt_cache_key: Optional[str] = None, **kwargs):
+    """
+    Stream a chat completion with the modern client, returning (content, tokens used).
+    
+    Chunks are collected as they arrive instead of waiting for the whole
+    completion; usage is reported in the final chunk.
+    """
+    if prompt_cache_key:
+        kwargs["extra_body"] = {"prompt_cache_key": prompt_cache_key}
+    stream = call_with_backoff(lambda: client.chat.completions.create(
+        stream=True,
+        stream_options={"include_usage": True},
+        **kwargs
+    ))
+    
+    parts = []
+    tokens_used = 0
+    for chunk in stream:
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+        if getattr(chunk, 'usage', None):
+            tokens_used = chunk.usage.total_tokens
+    
+    return "".join(parts).strip(), tokens_used
+
+
+def _call_chat_legacy(client, prompt_cache_key: Optional[str] = None, **kwargs):
+    """Create a chat completion with the legacy module, returning (content, tokens used)."""
+    # The pre-1.0 API has no prompt cache routing, so the key is ignored
+    response = client.ChatCompletion.create(**kwargs)
+
+    # Legacy response: dict-like
+    choice = response.choices[0]
+    # Some older versions have .message or ['message'] with dict
+    if hasattr(choice, 'message') and hasattr(choice.message, 'get'):
+        content = choice.message.get('content', '').strip()
+    else:
+        # Fallback to indexing into dict
+        try:
+            content = choice['message']['content'].strip()
+        except Exception:
+            # Another fallback: text field
+            content = getattr(choice, 'text', '') or choice.get('text', '')
+            content = content.strip() if content else content
+
+    # Legacy usage may or may not provide usage info
+    try:
+        tokens_used = response['usage']['total_tokens'] if isinstance(response, dict) and 'usage' in response else getattr(response, 'usage', {}).get('total_tokens', 0)
+    except Exception:
+        tokens_used = 0
+
+    return content, tokens_used
+
+
+def _build_http_client():
+    """
+    Build a pooled HTTP client for the modern OpenAI clients.
+    
+    Reusing keep-alive connections avoids a TCP+TLS handshake per request.
+    Returns None when httpx is unavailable, leaving the SDK's own client in use.
+    """
+    if _load_openai() != "modern":
+        return None
+    
     try:
-        # Fallback to legacy openai package (pre-1.0 API)
-        import openai as openai_legacy_module  # type: ignore
-        OPENAI_CLIENT_TYPE = "legacy"
-        openai_legacy = openai_legacy_module
+        import httpx  # type: ignore
+    except ImportError:
+        return None
+    
+    try:
+        import h2  # noqa: F401  (HTTP/2 is only available with the h2 extra)
+        http2 = True
+    except ImportError:
+        http2 = False
+    
+    try:
+        from openai import DefaultHttpxClient as client_class  # type: ignore
+    except ImportError:
+        client_class = httpx.Client
+    
+    try:
+        return client_class(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            http2=http2
+        )
     except Exception:
-        OPENAI_CLIENT_TYPE = None
+        return None
+
+
+# Shared connection pool, reference counted by ContentGenerator instances.
+# Processes that fork after creating it must not reuse it in the child:
+# call ContentGenerator.close() before forking or create generators post-fork.
+_SHARED_HTTPX = None  # Created by the first _acquire_shared_http_client() call
+_shared_httpx_users = 0
+_shared_httpx_lock = threading.Lock()
+
+
+def _acquire_shared_http_client():
+    """Take a reference to the shared HTTP client, recreating it if it was closed."""
+    global _SHARED_HTTPX, _shared_httpx_users
+    with _shared_httpx_lock:
+        if _SHARED_HTTPX is None or _SHARED_HTTPX.is_closed:
+            _SHARED_HTTPX = _build_http_client()
+        if _SHARED_HTTPX is not None:
+            _shared_httpx_users += 1
+        return _SHARED_HTTPX
+
+
+def _release_shared_http_client() -> None:
+    """Drop a reference to the shared HTTP client, closing it with the last one."""
+    global _shared_httpx_users
+    with _shared_httpx_lock:
+        _shared_httpx_users -= 1
+        if _shared_httpx_users <= 0:
+            _shared_httpx_users = 0
+            if _SHARED_HTTPX is not None:
+                _SHARED_HTTPX.close()
+
+
+# Markdown code fences (```python, ```py or bare ```) around generated code
+_CODE_FENCE_RE = re.compile(r'```(?:python|py)?\n?(.*?)```', re.DOTALL)
+
+# Characters that cannot appear in a generated class name, for the usual
+# ASCII topic names
+_NON_ALNUM_ASCII = str.maketrans("", "", "".join([c for c in map(chr, range(128)) if not c.isalnum()]))
+
+
+@lru_cache(maxsize=1024)
+def _safe_topic_name(topic_name: str) -> str:
+    """
+    Class name stem for a topic: its alphanumeric characters, title-cased one by one.
+    
+    ASCII names are cleaned with one ``str.translate`` pass, where upper-casing
+    is the same as per-character title-casing; other names keep the
+    per-character loop so Unicode title-casing (e.g. of "ß") is unchanged.
+    """
+    if topic_name.isascii():
+        safe_name = topic_name.translate(_NON_ALNUM_ASCII).upper()
+    else:
+        safe_name = ''.join([c.title() if c.isalnum() else '' for c in topic_name])
+    # Ensure it doesn't start with a number
+    if safe_name and safe_name[0].isdigit():
+        safe_name = 'Lesson' + safe_name
+    if not safe_name or not safe_name.isidentifier():
+        safe_name = 'Assignment'
+    return safe_name
+
+
+@lru_cache(maxsize=256)
+def _markdown_list(items: Tuple[str, ...]) -> str:
+    """Render items as a markdown bullet list (topics repeat across modules, so memoized)."""
+    # Most modules have one or two focus areas; skip the list and join for the short cases
+    if len(items) < 2:
+        return f"- {items[0]}" if items else ""
+    return "\n".join([f"- {item}" for item in items])
+
+
+# Fallback content is memoized on its inputs, so retries and re-renders of the
+# same module reuse the text; the bounds keep memory to a few megabytes.
+
+@lru_cache(maxsize=512)
+def _render_fallback(template: Template, **fields: str) -> str:
+    """Fill a fallback template with string fields."""
+    return template.substitute(fields)
+
+
+@lru_cache(maxsize=512)
+def _learning_path_fallback(
+    module_name: str,
+    topic_name: str,
+    objectives: Tuple[str, ...],
+    focus_areas: Tuple[str, ...],
+    difficulty: str
+) -> str:
+    """Render the fallback learning path for a module."""
+    topic_name = topic_name.lower()
+    return LEARNING_PATH_FALLBACK_TEMPLATE.substitute(
+        module_name=module_name,
+        objectives=_markdown_list(objectives),
+        key_concepts="\n".join([f"- **{area.title()}**: Core concept in {topic_name}" for area in focus_areas]),
+        focus_areas=", ".join(focus_areas),
+        estimated_minutes=ESTIMATED_MINUTES.get(difficulty, 120)
+    )
+
+
+@lru_cache(maxsize=512)
+def _extra_exercises_fallback(module_name: str, focus_areas: Tuple[str, ...]) -> str:
+    """Render the fallback extra exercises for a module."""
+    return EXTRA_EXERCISES_FALLBACK_TEMPLATE.substitute(
+        module_name=module_name,
+        focus_csv=', '.join(focus_areas),
+        focus_areas=_markdown_list(tuple(area.title() for area in focus_areas))
+    )
+
+
+# Content types that depend only on the topic and module, so requests for
+# different topics can be packed into a single chat completion
+PACKABLE_CONTENT_TYPES = (
+    "learning_path",
+    "starter_example",
+    "assignment_a",
+    "assignment_b",
+    "extra_exercises",
+)
+
+PACKED_RESPONSE_INSTRUCTIONS = """
+
+You will receive a JSON array of independent requests, each with an "index" and a "prompt".
+Answer every request separately, following the requirements above for each one.
+Respond with a JSON object of the form {"lessons": [{"index": <index>, "content": "<answer>"}, ...]}
+containing exactly one entry per request."""
+
+BUNDLE_SYSTEM_PROMPT = """You are an expert programming educator writing every independent file of one lesson module in a single pass.
+
+You will receive a JSON object whose keys are file kinds and whose values hold the "instructions" and "prompt" for that file.
+Write each file separately, following its own instructions as if it had been requested on its own.
+Respond with a JSON object mapping every key you received to the complete file content as a string."""
+
+# Cost-optimization instructions put in front of each prompt
+COST_OPTIMIZATION_INSTRUCTIONS = MappingProxyType({
+    "starter_example": "Generate a concise code example with minimal comments. Focus on core functionality only.",
+    "assignment_a": "Create a brief assignment with clear objectives. Keep instructions concise.",
+    "assignment_b": "Generate a short, focused assignment. Avoid lengthy descriptions.",
+    "test_starter": "Write minimal test cases covering key functionality only.",
+    "test_assignment_a": "Create essential test cases. Keep test names descriptive but brief.",
+    "test_assignment_b": "Generate focused test cases. Prioritize coverage over quantity.",
+    "extra_exercises": "List 3-5 concise exercises. Keep descriptions short and actionable.",
+    "learning_path": "Create a structured learning guide. Be comprehensive but concise."
+})
+DEFAULT_COST_OPTIMIZATION_INSTRUCTION = "Generate concise, focused content."
+
+# Completion token limits per content type, kept low to minimize costs
+TOKEN_LIMITS = MappingProxyType({
+    "starter_example": 800,      # Reduced from 2000
+    "assignment_a": 600,         # Reduced from 2000
+    "assignment_b": 600,         # Reduced from 2000
+    "test_starter": 400,         # Reduced from 2000
+    "test_assignment_a": 400,    # Reduced from 2000
+    "test_assignment_b": 400,    # Reduced from 2000
+    "extra_exercises": 800,      # Reduced from 2000
+    "learning_path": 1200,       # Keep higher for quality
+})
+
+# Content types that keep GPT-4 when it is configured
+COMPLEX_CONTENT_TYPES = ("learning_path", "project_assignment")
+
+# Batch API statuses after which a batch will not make further progress
+BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
 
 
 class ContentGenerator:
@@ -49,6 +351,25 @@ class ContentGenerator:
     - Explanatory text and descriptions
     """
     
+    __slots__ = (
+        "config",
+        "client",
+        "ai_enabled",
+        "_verbose",
+        "_uses_shared_http_client",
+        "_content_cache",
+        "_ai_calls",
+        "_cache_hits",
+        "_fallback_calls",
+        "_model_for_content_type",
+        "_inflight",
+        "_inflight_lock",
+        "_pending_batches",
+        "_rate_limiter",
+        "_count_tokens",
+        "_request_spacer",
+    )
+    
     def __init__(self, config: GenerationConfig):
         """
         Initialize the content generator.
@@ -57,18 +378,47 @@ class ContentGenerator:
             config: Generation configuration
         """
         self.config = config
+        self._verbose = bool(config.verbose)  # Checked before every diagnostic print
         self.client = None
-        self._content_cache = {}  # Cache for generated content
-        self._generation_stats = {"ai_calls": 0, "cache_hits": 0, "fallback_calls": 0}
+        self._uses_shared_http_client = False
+        # Persistent cache for generated content, shared across runs
+        self._content_cache = None
+        if config.enable_cache:
+            self._content_cache = ResponseCache(
+                config.cache_dir / "responses.sqlite3" if config.cache_dir else None,
+                memory_entries=config.memory_cache_entries
+            )
+        self._ai_calls = 0
+        self._cache_hits = 0
+        self._fallback_calls = 0
+        self._model_for_content_type = {}  # Content type -> model, see _get_cost_optimal_model
+        self._inflight = {}  # Cache key -> Future of a request being generated by another thread
+        self._inflight_lock = threading.Lock()
+        self._pending_batches = {}  # Batch ID -> {custom_id: (cache key, content type)}
+        
+        # Proactive RPM/TPM throttling, shared by every worker using this generator
+        self._rate_limiter = None
+        self._count_tokens = None
+        if config.requests_per_minute or config.tokens_per_minute:
+            self._rate_limiter = RateLimiter(config.requests_per_minute, config.tokens_per_minute)
+            if config.tokens_per_minute:
+                self._count_tokens = get_token_counter(config.openai_model)
+        # Spaces requests by rate_limit_delay across all worker threads and coroutines
+        self._request_spacer = RequestSpacer(config.rate_limit_delay)
         
         # Initialize OpenAI client if configured and available
-        if config.use_ai and config.openai_api_key and OPENAI_CLIENT_TYPE:
+        client_type = _load_openai() if config.use_ai and config.openai_api_key else None
+        if client_type:
             try:
-                if OPENAI_CLIENT_TYPE == "modern":
-                    # Modern client: create instance with provided API key
+                if client_type == "modern":
+                    # Modern client: create instance with provided API key,
+                    # reusing the shared connection pool when available
+                    http_client = _acquire_shared_http_client()
+                    self._uses_shared_http_client = http_client is not None
                     self.client = OpenAI(
                         api_key=config.openai_api_key,
-                        organization=config.openai_organization
+                        organization=config.openai_organization,
+                        http_client=http_client
                     )
                 else:
                     # Legacy client: set global api_key on module
@@ -83,7 +433,7 @@ class ContentGenerator:
 
                 self.ai_enabled = True
                 if config.verbose:
-                    print(f"✓ OpenAI client initialized (client_type={OPENAI_CLIENT_TYPE}) with model: {config.openai_model}")
+                    print(f"✓ OpenAI client initialized (client_type={client_type}) with model: {config.openai_model}")
             except Exception as e:
                 if config.verbose:
                     print(f"⚠ OpenAI initialization failed: {e}")
@@ -94,10 +444,33 @@ class ContentGenerator:
                 reasons = []
                 if not config.openai_api_key:
                     reasons.append("no API key")
-                if not OPENAI_CLIENT_TYPE:
+                elif not client_type:
                     reasons.append("OpenAI package not available")
                 print(f"⚠ AI disabled: {', '.join(reasons)}")
     
+    def close(self) -> None:
+        """
+        Release network and cache resources held by this generator.
+        
+        The shared HTTP connection pool is only closed once the last
+        generator using it has been closed.
+        """
+        if self._uses_shared_http_client:
+            self._uses_shared_http_client = False
+            _release_shared_http_client()
+        self.client = None
+        self.ai_enabled = False
+        
+        if self._content_cache is not None:
+            self._content_cache.close()
+            self._content_cache = None
+    
+    def __enter__(self) -> "ContentGenerator":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     @staticmethod
     def _create_safe_class_name(topic_name: str, suffix: str = "Assignment") -> str:
         """
@@ -111,13 +484,7 @@ class ContentGenerator:
             Valid Python class identifier
         """
         # Create valid Python class name by removing hyphens, spaces, and other invalid characters
-        safe_name = ''.join(c.title() if c.isalnum() else '' for c in topic_name)
-        # Ensure it doesn't start with a number
-        if safe_name and safe_name[0].isdigit():
-            safe_name = 'Lesson' + safe_name
-        if not safe_name or not safe_name.isidentifier():
-            safe_name = 'Assignment'
-        return f"{safe_name}{suffix}"
+        return f"{_safe_topic_name(topic_name)}{suffix}"
     
     def generate_content(
         self, 
@@ -139,52 +506,38 @@ class ContentGenerator:
             Generated content response
         """
         start_time = time.time()
+        ai_active = self._ai_active()
+        request = self._build_request(content_type, topic, module_config, extra_context)
         
-        # Create cache key for cost optimization
-        cache_key = self._create_cache_key(content_type, topic, module_config)
-        
-        # Check cache first to avoid duplicate API calls
-        if self.config.enable_cache and cache_key in self._content_cache:
-            self._generation_stats["cache_hits"] += 1
-            cached_response = self._content_cache[cache_key]
-            if self.config.verbose:
-                print(f"    📋 Using cached content for {content_type}")
-            return cached_response
-        
-        # Create generation request
-        if module_config is None:
-            # Create a default module config for content that doesn't need specific module context
-            from .models import ModuleConfig, ModuleType, CodeComplexity
-            module_config = ModuleConfig(
-                name=f"{topic.name} Module",
-                type=ModuleType.STARTER,
-                focus_areas=["general"],
-                code_complexity=CodeComplexity.SIMPLE
-            )
-        
-        request = ContentGenerationRequest(
-            topic=topic,
-            module=module_config,
-            content_type=content_type,
-            additional_context=extra_context or {}
-        )
+        # Check cache first to avoid duplicate API calls (one key, one lookup).
+        # Fallbacks are not persisted: their renderers are memoized on exactly
+        # the fields they use, which is cheaper than a database round trip and
+        # never serves text from an older template.
+        if ai_active:
+            cache_key = self._create_cache_key(request)
+            if self._content_cache is not None:
+                cached_response = self._content_cache.get(cache_key, ResponseCache.MISS)
+                if cached_response is not ResponseCache.MISS:
+                    self._cache_hits += 1
+                    if self._verbose:
+                        print(f"    📋 Using cached content for {content_type}")
+                    return cached_response
         
         # Generate content using AI or fallback
-        if self.config.verbose:
+        if self._verbose:
             print(f"🤖 Content generation decision for '{content_type}':")
             print(f"   - OpenAI client: {bool(self.client)}")
             print(f"   - use_ai config: {self.config.use_ai}")
             print(f"   - ai_enabled: {getattr(self, 'ai_enabled', 'NOT_SET')}")
             print(f"   - API key available: {bool(self.config.openai_api_key)}")
-            print(f"   - OpenAI package present: {bool(OPENAI_CLIENT_TYPE)} (type={OPENAI_CLIENT_TYPE})")
+            print(f"   - OpenAI package present: {bool(_load_openai())} (type={_load_openai()})")
             
-        if self.client and self.config.use_ai and getattr(self, 'ai_enabled', False):
-            if self.config.verbose:
+        if ai_active:
+            if self._verbose:
                 print(f"🚀 Using AI to generate {content_type}")
-            response = self._generate_ai_content(request, start_time)
-            self._generation_stats["ai_calls"] += 1
+            response = self._generate_ai_content_once(cache_key, request, start_time)
         else:
-            if self.config.verbose:
+            if self._verbose:
                 reasons = []
                 if not self.client:
                     reasons.append("no OpenAI client")
@@ -194,14 +547,75 @@ class ContentGenerator:
                     reasons.append("AI not enabled")
                 print(f"⚠️ Using fallback for {content_type} - Reasons: {', '.join(reasons)}")
             response = self._generate_fallback_content(request, start_time)
-            self._generation_stats["fallback_calls"] += 1
-        
-        # Cache the response for future use
-        if self.config.enable_cache:
-            self._content_cache[cache_key] = response
+            self._fallback_calls += 1
         
         return response
     
+    def _generate_ai_content_once(
+        self,
+        cache_key: str,
+        request: ContentGenerationRequest,
+        start_time: float
+    ) -> ContentGenerationResponse:
+        """
+        Generate AI content, sharing one API call between identical concurrent requests.
+        
+        The first worker thread to miss the cache for ``cache_key`` makes the
+        call; any other thread asking for the same content meanwhile waits for
+        its result instead of paying for a duplicate call.
+        """
+        with self._inflight_lock:
+            inflight = self._inflight.get(cache_key)
+            if inflight is None:
+                future = self._inflight[cache_key] = Future()
+        
+        if inflight is not None:
+            self._cache_hits += 1
+            if self._verbose:
+                print(f"    📋 Sharing in-flight content for {request.content_type}")
+            return inflight.result()
+        
+        try:
+            response = self._generate_ai_content(request, start_time)
+            self._ai_calls += 1
+            
+            # Cache the response for future use, but never pin an AI failure's fallback
+            if self._content_cache is not None and response.model_used != "fallback":
+                self._content_cache.set(cache_key, response)
+            
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
+    
+    def _build_request(
+        self,
+        content_type: str,
+        topic: TopicConfig,
+        module_config: Optional[Any],
+        extra_context: Optional[dict]
+    ) -> ContentGenerationRequest:
+        """Create a generation request, defaulting the module for topic-level content."""
+        if module_config is None:
+            # Create a default module config for content that doesn't need specific module context
+            module_config = ModuleConfig(
+                name=f"{topic.name} Module",
+                type=ModuleType.STARTER,
+                focus_areas=["general"],
+                code_complexity=CodeComplexity.SIMPLE
+            )
+        
+        return ContentGenerationRequest(
+            topic=topic,
+            module=module_config,
+            content_type=content_type,
+            additional_context=extra_context or {}
+        )
+    
     def _generate_ai_content(
         self, 
         request: ContentGenerationRequest, 
@@ -209,69 +623,42 @@ class ContentGenerator:
     ) -> ContentGenerationResponse:
         """Generate content using OpenAI API."""
         
-        if self.config.verbose:
+        if self._verbose:
             print(f"🔥 Making OpenAI API call for {request.content_type}")
         
         # Create appropriate prompt based on content type
         prompt = self._create_prompt(request)
         
         try:
-            # Add rate limiting delay
-            time.sleep(self.config.rate_limit_delay)
-            
-            if self.config.verbose:
-                print(f"📡 Calling OpenAI API with model: {self._get_cost_optimal_model()} (client_type={OPENAI_CLIENT_TYPE})")
+            model = self._get_cost_optimal_model(request.content_type)
+            max_tokens = self._get_optimal_max_tokens(request.content_type)
+            if self._verbose:
+                print(f"📡 Calling OpenAI API with model: {model} (client_type={_load_openai()})")
 
             # Prepare messages
-            messages = [
-                {"role": "system", "content": self._get_system_prompt(request.content_type)},
-                {"role": "user", "content": self._optimize_prompt_for_cost(prompt, request.content_type)}
-            ]
-
-            if OPENAI_CLIENT_TYPE == "modern":
-                response = self.client.chat.completions.create(
-                    model=self._get_cost_optimal_model(),
-                    messages=messages,
-                    temperature=0.3,
-                    max_tokens=self._get_optimal_max_tokens(request.content_type),
-                )
-
-                # Modern client response shape
-                content = response.choices[0].message.content.strip()
-                tokens_used = response.usage.total_tokens if getattr(response, 'usage', None) else 0
-
-            elif OPENAI_CLIENT_TYPE == "legacy":
-                # Legacy client: use openai.ChatCompletion.create
-                response = self.client.ChatCompletion.create(
-                    model=self._get_cost_optimal_model(),
-                    messages=messages,
-                    temperature=0.3,
-                    max_tokens=self._get_optimal_max_tokens(request.content_type),
-                )
-
-                # Legacy response: dict-like
-                choice = response.choices[0]
-                # Some older versions have .message or ['message'] with dict
-                if hasattr(choice, 'message') and hasattr(choice.message, 'get'):
-                    content = choice.message.get('content', '').strip()
-                else:
-                    # Fallback to indexing into dict
-                    try:
-                        content = choice['message']['content'].strip()
-                    except Exception:
-                        # Another fallback: text field
-                        content = getattr(choice, 'text', '') or choice.get('text', '')
-                        content = content.strip() if content else content
-
-                # Legacy usage may or may not provide usage info
-                try:
-                    tokens_used = response['usage']['total_tokens'] if isinstance(response, dict) and 'usage' in response else getattr(response, 'usage', {}).get('total_tokens', 0)
-                except Exception:
-                    tokens_used = 0
-
+            messages = self._build_messages(request, prompt)
+            
+            # Wait for RPM/TPM budget, or for the next slot spaced by rate_limit_delay
+            if self._rate_limiter:
+                token_cost = max_tokens
+                if self._count_tokens:
+                    token_cost += sum(self._count_tokens(message["content"]) for message in messages)
+                self._rate_limiter.acquire(1, token_cost)
             else:
+                self._request_spacer.wait()
+
+            if _CALL_CHAT is None:
                 raise RuntimeError("No OpenAI client available")
 
+            content, tokens_used = _CALL_CHAT(
+                self.client,
+                model=model,
+                messages=messages,
+                temperature=0.3,
+                max_tokens=max_tokens,
+                prompt_cache_key=self._prompt_cache_key(request.content_type),
+            )
+
             # Extract code from markdown blocks if it's Python content
             if request.content_type in ["starter_example", "assignment_a", "assignment_b", "test_starter", "test_assignment_a", "test_assignment_b"]:
                 content = self._extract_code_from_markdown(content)
@@ -285,91 +672,437 @@ class ContentGenerator:
             )
             
         except Exception as e:
-            if self.config.verbose:
+            if self._verbose:
                 print(f"⚠ AI generation failed: {e}, using fallback")
             return self._generate_fallback_content(request, start_time)
     
-    def _get_cost_optimal_model(self) -> str:
-        """Get the most cost-effective model for the task."""
-        # Use GPT-3.5-turbo instead of GPT-4 for significant cost savings
-        # Only use GPT-4 for complex content types that really need it
-        complex_types = ["learning_path", "project_assignment"]
+    def prefetch_packed(self, items, batch_size: int) -> int:
+        """
+        Pre-generate independent content for many modules using packed requests.
         
-        if self.config.openai_model == "gpt-4" and hasattr(self, '_current_content_type'):
-            if self._current_content_type not in complex_types:
-                return "gpt-3.5-turbo"
+        Requests of the same content type are grouped into chunks of
+        ``batch_size`` and sent as one chat completion, so the system prompt is
+        paid for once per chunk instead of once per module. Parsed answers are
+        stored in the content cache, where ``generate_content`` picks them up.
+        Anything that cannot be packed or parsed is left to the normal
+        per-request path.
         
-        return self.config.openai_model
+        Args:
+            items: Iterable of (topic, module_config) pairs
+            batch_size: Maximum number of requests packed into one call
+            
+        Returns:
+            Number of cache entries filled
+        """
+        if batch_size < 2 or self._content_cache is None or not self._ai_active() or _load_openai() != "modern":
+            return 0
+        
+        items = list(items)
+        filled = 0
+        for content_type in PACKABLE_CONTENT_TYPES:
+            pending = [
+                (topic, module_config) for topic, module_config in items
+                if self._create_cache_key(
+                    ContentGenerationRequest(topic=topic, module=module_config, content_type=content_type)
+                ) not in self._content_cache
+            ]
+            for start in range(0, len(pending), batch_size):
+                chunk = pending[start:start + batch_size]
+                if len(chunk) > 1:
+                    filled += self._generate_packed_content(content_type, chunk)
+        
+        return filled
     
-    def _get_optimal_max_tokens(self, content_type: str) -> int:
-        """Get optimal token limits based on content type to minimize costs."""
-        token_limits = {
-            "starter_example": 800,      # Reduced from 2000
-            "assignment_a": 600,         # Reduced from 2000
-            "assignment_b": 600,         # Reduced from 2000
-            "test_starter": 400,         # Reduced from 2000
-            "test_assignment_a": 400,    # Reduced from 2000
-            "test_assignment_b": 400,    # Reduced from 2000
-            "extra_exercises": 800,      # Reduced from 2000
-            "learning_path": 1200,       # Keep higher for quality
+    def _generate_packed_content(self, content_type: str, chunk) -> int:
+        """Generate one packed request for ``chunk`` and cache the parsed answers."""
+        start_time = time.time()
+        
+        requests = []
+        prompts = []
+        for index, (topic, module_config) in enumerate(chunk):
+            request = ContentGenerationRequest(topic=topic, module=module_config, content_type=content_type)
+            requests.append(request)
+            prompts.append({"index": index, "prompt": self._optimize_prompt_for_cost(self._create_prompt(request), content_type)})
+        
+        messages = [
+            {"role": "system", "content": self._get_system_prompt(content_type) + PACKED_RESPONSE_INSTRUCTIONS},
+            {"role": "user", "content": json.dumps(prompts, ensure_ascii=False)}
+        ]
+        max_tokens = self._get_optimal_max_tokens(content_type) * len(chunk)
+        
+        if self._verbose:
+            print(f"📦 Packing {len(chunk)} {content_type} requests into one OpenAI call")
+        
+        try:
+            payload, tokens_used = self._request_json(
+                messages, self._get_cost_optimal_model(content_type), max_tokens, f"packed:{content_type}"
+            )
+            lessons = payload["lessons"]
+        except Exception as e:
+            if self._verbose:
+                print(f"⚠ Packed generation failed for {content_type}: {e}, using per-request calls")
+            return 0
+        
+        self._ai_calls += 1
+        filled = 0
+        for entry in lessons if isinstance(lessons, list) else []:
+            try:
+                index = int(entry["index"])
+                content = entry["content"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not isinstance(content, str) or not 0 <= index < len(chunk) or not content.strip():
+                continue
+            
+            content = content.strip()
+            if content_type in ["starter_example", "assignment_a", "assignment_b"]:
+                content = self._extract_code_from_markdown(content)
+            
+            self._content_cache.set(self._create_cache_key(requests[index]), ContentGenerationResponse(
+                content=content,
+                metadata={"packed_requests": len(chunk)},
+                model_used=self.config.openai_model,
+                tokens_used=tokens_used // len(chunk),
+                generation_time_seconds=time.time() - start_time,
+                success=True
+            ))
+            filled += 1
+        
+        return filled
+    
+    def prefetch_module_bundle(self, topic: TopicConfig, module_config: ModuleConfig) -> int:
+        """
+        Pre-generate a module's independent files with one JSON-mode request.
+        
+        The topic-only content types (everything except the tests, which need
+        the generated code as context) are requested together and the parsed
+        files are stored in the content cache, where ``generate_content`` picks
+        them up. Files that are missing from the answer, or all of them if the
+        answer cannot be parsed, are left to the normal per-request path.
+        
+        Args:
+            topic: Topic configuration
+            module_config: Module configuration
+            
+        Returns:
+            Number of cache entries filled
+        """
+        if (not self.config.bundle_module_requests or self._content_cache is None
+                or not self._ai_active() or _load_openai() != "modern"):
+            return 0
+        
+        requests = {
+            content_type: ContentGenerationRequest(topic=topic, module=module_config, content_type=content_type)
+            for content_type in PACKABLE_CONTENT_TYPES
         }
+        pending = [
+            content_type for content_type, request in requests.items()
+            if self._create_cache_key(request) not in self._content_cache
+        ]
+        if len(pending) < 2:
+            return 0
+        
+        start_time = time.time()
         
-        return token_limits.get(content_type, 600)  # Conservative default
+        files = {}
+        for content_type in pending:
+            request = requests[content_type]
+            files[content_type] = {
+                "instructions": self._get_system_prompt(content_type),
+                "prompt": self._optimize_prompt_for_cost(self._create_prompt(request), content_type)
+            }
+        
+        messages = [
+            {"role": "system", "content": BUNDLE_SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(files, ensure_ascii=False)}
+        ]
+        max_tokens = sum(self._get_optimal_max_tokens(content_type) for content_type in pending)
+        # Use the model a complex file would get if the bundle contains one
+        model = self._get_cost_optimal_model(
+            next((content_type for content_type in pending if content_type in COMPLEX_CONTENT_TYPES), pending[0])
+        )
+        
+        if self._verbose:
+            print(f"📦 Bundling {len(pending)} files of {module_config.name} into one OpenAI call")
+        
+        try:
+            bundle, tokens_used = self._request_json(messages, model, max_tokens, "bundle")
+        except Exception as e:
+            if self._verbose:
+                print(f"⚠ Bundled generation failed for {module_config.name}: {e}, using per-request calls")
+            return 0
+        
+        self._ai_calls += 1
+        filled = 0
+        for content_type in pending:
+            content = bundle.get(content_type) if isinstance(bundle, dict) else None
+            if not isinstance(content, str) or not content.strip():
+                continue
+            
+            content = content.strip()
+            if content_type in ["starter_example", "assignment_a", "assignment_b"]:
+                content = self._extract_code_from_markdown(content)
+            
+            self._content_cache.set(self._create_cache_key(requests[content_type]), ContentGenerationResponse(
+                content=content,
+                metadata={"bundled_requests": len(pending)},
+                model_used=model,
+                tokens_used=tokens_used // len(pending),
+                generation_time_seconds=time.time() - start_time,
+                success=True
+            ))
+            filled += 1
+        
+        return filled
+    
+    def _request_json(self, messages, model: str, max_tokens: int, cache_label: str) -> Tuple[Any, int]:
+        """
+        Send one JSON-mode chat completion within the rate limits.
+        
+        Returns:
+            Parsed response body and total tokens used
+        """
+        if self._rate_limiter:
+            token_cost = max_tokens
+            if self._count_tokens:
+                token_cost += sum(self._count_tokens(message["content"]) for message in messages)
+            self._rate_limiter.acquire(1, token_cost)
+        else:
+            self._request_spacer.wait()
+        
+        response = call_with_backoff(lambda: self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=0.3,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            extra_body={"prompt_cache_key": self._prompt_cache_key(cache_label)},
+        ))
+        tokens_used = response.usage.total_tokens if getattr(response, 'usage', None) else 0
+        return _json_loads(response.choices[0].message.content), tokens_used
+    
+    def submit_batch(self, items) -> Optional[str]:
+        """
+        Submit topic-only content for many modules as one OpenAI Batch API job.
+        
+        Args:
+            items: Iterable of (topic, module_config) pairs
+            
+        Returns:
+            Batch ID, or None if nothing was submitted
+        """
+        return self.generate_content_batch([
+            ContentGenerationRequest(topic=topic, module=module_config, content_type=content_type)
+            for topic, module_config in items
+            for content_type in PACKABLE_CONTENT_TYPES
+        ])
+    
+    def generate_content_batch(self, requests: List[ContentGenerationRequest]) -> Optional[str]:
+        """
+        Submit generation requests as one OpenAI Batch API job.
+        
+        Batch jobs are billed at half price and do not count against the
+        synchronous rate limits, at the cost of completing asynchronously.
+        Results are collected into the content cache with ``collect_batch``,
+        after which ``generate_content`` serves them as cache hits. Requests
+        that are already cached are skipped.
+        
+        Args:
+            requests: Generation requests, e.g. for a whole curriculum
+            
+        Returns:
+            Batch ID, or None if nothing was submitted
+        """
+        if self._content_cache is None or not self._ai_active() or _load_openai() != "modern":
+            return None
+        
+        lines = []
+        cache_keys = {}
+        queued_keys = set()
+        for request in requests:
+            content_type = request.content_type
+            cache_key = self._create_cache_key(request)
+            if cache_key in self._content_cache or cache_key in queued_keys:
+                continue
+            
+            messages = self._build_messages(request, self._create_prompt(request))
+            custom_id = f"request-{len(lines)}"
+            cache_keys[custom_id] = (cache_key, content_type)
+            queued_keys.add(cache_key)
+            lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self._get_cost_optimal_model(content_type),
+                    "messages": messages,
+                    "temperature": 0.3,
+                    "max_tokens": self._get_optimal_max_tokens(content_type),
+                    "prompt_cache_key": self._prompt_cache_key(content_type),
+                },
+            }))
+        
+        if not lines:
+            return None
+        
+        try:
+            batch_file = self.client.files.create(
+                file=("lesson_requests.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+        except Exception as e:
+            if self._verbose:
+                print(f"⚠ Batch submission failed: {e}, using synchronous calls")
+            return None
+        
+        self._pending_batches[batch.id] = cache_keys
+        if self._verbose:
+            print(f"📬 Submitted batch {batch.id} with {len(lines)} requests")
+        return batch.id
+    
+    def collect_batch(self, batch_id: str) -> Optional[int]:
+        """
+        Check a submitted batch and cache its results once it has finished.
+        
+        Args:
+            batch_id: ID returned by ``submit_batch``
+            
+        Returns:
+            Number of cache entries filled, or None while the batch is still running
+        """
+        cache_keys = self._pending_batches.get(batch_id)
+        if cache_keys is None:
+            return 0
+        
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+        except Exception as e:
+            if self._verbose:
+                print(f"⚠ Could not check batch {batch_id}: {e}")
+            return None
+        
+        if batch.status not in BATCH_FINAL_STATUSES:
+            return None
+        
+        del self._pending_batches[batch_id]
+        if batch.status != "completed" or not batch.output_file_id:
+            if self._verbose:
+                print(f"⚠ Batch {batch_id} ended with status '{batch.status}', using synchronous calls")
+            return 0
+        
+        try:
+            output = self.client.files.content(batch.output_file_id).text
+        except Exception as e:
+            if self._verbose:
+                print(f"⚠ Could not download batch {batch_id} results: {e}")
+            return 0
+        
+        filled = 0
+        for line in output.splitlines():
+            try:
+                record = _json_loads(line)
+                cache_key, content_type = cache_keys[record["custom_id"]]
+                body = record["response"]["body"]
+                content = body["choices"][0]["message"]["content"].strip()
+            except (KeyError, IndexError, TypeError, AttributeError, ValueError):
+                continue
+            
+            if content_type in ["starter_example", "assignment_a", "assignment_b", "test_starter", "test_assignment_a", "test_assignment_b"]:
+                content = self._extract_code_from_markdown(content)
+            
+            self._content_cache.set(cache_key, ContentGenerationResponse(
+                content=content,
+                metadata={"batch_id": batch_id},
+                model_used=self.config.openai_model,
+                tokens_used=(body.get("usage") or {}).get("total_tokens", 0),
+                success=True
+            ))
+            self._ai_calls += 1
+            filled += 1
+        
+        return filled
+    
+    def _build_messages(self, request: ContentGenerationRequest, prompt: str) -> list:
+        """Build the chat messages for a generation request."""
+        return [
+            {"role": "system", "content": self._get_system_prompt(request.content_type)},
+            {"role": "user", "content": self._optimize_prompt_for_cost(prompt, request.content_type)}
+        ]
+    
+    def _prompt_cache_key(self, content_type: str) -> str:
+        """
+        Key that routes requests sharing a prompt prefix to the same OpenAI cache.
+        
+        Prompts of one content type share their system message and instructions,
+        so the content type and model are enough to identify the prefix.
+        """
+        return hashlib.blake2b(f"{content_type}|{self.config.openai_model}".encode("utf-8"), digest_size=8).hexdigest()
+    
+    def _get_cost_optimal_model(self, content_type: str) -> str:
+        """Get the most cost-effective model for the content type."""
+        model = self._model_for_content_type.get(content_type)
+        if model is None:
+            # Use GPT-3.5-turbo instead of GPT-4 for significant cost savings
+            # Only use GPT-4 for complex content types that really need it
+            model = self.config.openai_model
+            if model == "gpt-4" and content_type not in COMPLEX_CONTENT_TYPES:
+                model = "gpt-3.5-turbo"
+            self._model_for_content_type[content_type] = model
+        
+        return model
+    
+    def _get_optimal_max_tokens(self, content_type: str) -> int:
+        """Get optimal token limits based on content type to minimize costs."""
+        return TOKEN_LIMITS.get(content_type, 600)  # Conservative default
     
     def _optimize_prompt_for_cost(self, prompt: str, content_type: str) -> str:
         """Optimize prompts to reduce token usage while maintaining quality."""
-        # Store content type for model selection
-        self._current_content_type = content_type
-        
         # Add cost-optimization instructions
-        optimizations = {
-            "starter_example": "Generate a concise code example with minimal comments. Focus on core functionality only.",
-            "assignment_a": "Create a brief assignment with clear objectives. Keep instructions concise.",
-            "assignment_b": "Generate a short, focused assignment. Avoid lengthy descriptions.",
-            "test_starter": "Write minimal test cases covering key functionality only.",
-            "test_assignment_a": "Create essential test cases. Keep test names descriptive but brief.",
-            "test_assignment_b": "Generate focused test cases. Prioritize coverage over quantity.",
-            "extra_exercises": "List 3-5 concise exercises. Keep descriptions short and actionable.",
-            "learning_path": "Create a structured learning guide. Be comprehensive but concise."
-        }
-        
-        optimization_prefix = optimizations.get(content_type, "Generate concise, focused content.")
+        optimization_prefix = COST_OPTIMIZATION_INSTRUCTIONS.get(content_type, DEFAULT_COST_OPTIMIZATION_INSTRUCTION)
         return f"{optimization_prefix}\n\n{prompt}"
     
-    def _create_cache_key(self, content_type: str, topic: TopicConfig, module_config) -> str:
-        """Create a cache key for content to avoid duplicate generation."""
-        module_name = module_config.name if module_config else "no_module"
-        module_type = module_config.type if module_config else "no_type"
-        
-        # Create a simple hash of the key components
-        key_components = [
-            content_type,
-            topic.name.lower().replace(" ", "_"),
-            str(topic.difficulty),
-            module_name.lower().replace(" ", "_"),
-            str(module_type)
-        ]
+    def _create_cache_key(self, request: ContentGenerationRequest) -> str:
+        """
+        Create a cache key for content to avoid duplicate generation.
         
-        return "|".join(key_components)
+        The key hashes the fully rendered messages and the model they are sent
+        to, so every input that shapes the prompt (topic, module, focus areas,
+        learning objectives, code under test and the prompt texts themselves)
+        is covered without listing fields by hand.
+        """
+        messages = self._build_messages(request, self._create_prompt(request))
+        payload = json.dumps(
+            [self._get_cost_optimal_model(request.content_type), messages],
+            ensure_ascii=False,
+            separators=(",", ":")
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _ai_active(self) -> bool:
+        """Whether requests will be sent to OpenAI rather than fallback generators."""
+        return bool(self.client and self.config.use_ai and getattr(self, 'ai_enabled', False))
     
     def get_generation_stats(self) -> Dict[str, Any]:
         """Get statistics about content generation for cost analysis."""
-        total_calls = sum(self._generation_stats.values())
-        
-        stats = self._generation_stats.copy()
-        stats["total_calls"] = total_calls
-        stats["cache_efficiency"] = (
-            self._generation_stats["cache_hits"] / max(total_calls, 1)
-        ) * 100
-        stats["ai_usage"] = (
-            self._generation_stats["ai_calls"] / max(total_calls, 1)
-        ) * 100
-        
-        return stats
+        total_calls = self._ai_calls + self._cache_hits + self._fallback_calls
+        
+        return {
+            "ai_calls": self._ai_calls,
+            "cache_hits": self._cache_hits,
+            "fallback_calls": self._fallback_calls,
+            "total_calls": total_calls,
+            "cache_efficiency": (self._cache_hits / max(total_calls, 1)) * 100,
+            "ai_usage": (self._ai_calls / max(total_calls, 1)) * 100,
+        }
     
     def print_cost_summary(self):
         """Print a cost optimization summary."""
-        if not self.config.verbose:
+        if not self._verbose:
             return
             
         stats = self.get_generation_stats()
@@ -387,19 +1120,8 @@ class ContentGenerator:
     ) -> ContentGenerationResponse:
         """Generate fallback content when AI is unavailable."""
         
-        content_generators = {
-            "learning_path": self._generate_learning_path_fallback,
-            "starter_example": self._generate_starter_example_fallback,
-            "assignment_a": self._generate_assignment_a_fallback,
-            "assignment_b": self._generate_assignment_b_fallback,
-            "test_starter": self._generate_test_fallback,
-            "test_assignment_a": self._generate_test_assignment_a_fallback,
-            "test_assignment_b": self._generate_test_assignment_b_fallback,
-            "extra_exercises": self._generate_extra_exercises_fallback
-        }
-        
-        generator = content_generators.get(request.content_type, self._generate_generic_fallback)
-        content = generator(request)
+        generator = self._FALLBACK_DISPATCH.get(request.content_type, ContentGenerator._generate_generic_fallback)
+        content = generator(self, request)
         
         return ContentGenerationResponse(
             content=content,
@@ -410,727 +1132,108 @@ class ContentGenerator:
     
     def _create_prompt(self, request: ContentGenerationRequest) -> str:
         """Create appropriate prompt for OpenAI based on content type."""
+        topic = request.topic
+        module = request.module
+        focus_areas = module.focus_areas
+        code_to_test = request.additional_context.get('code_to_test')
         
-        base_context = f"""
-Topic: {request.topic.name}
-Difficulty: {request.topic.difficulty}
-Module: {request.module.name}
-Module Type: {request.module.type}
-Focus Areas: {', '.join(request.module.focus_areas)}
-Learning Objectives: {', '.join(request.topic.learning_objectives)}
-"""
-        
-        prompts = {
-            "learning_path": f"""
-Create a comprehensive learning path guide for {request.module.name}.
-{base_context}
-
-Generate a detailed markdown guide with COMPLETE content including:
-
-## 🎯 Learning Objectives
-List 4-5 specific, measurable learning objectives for {', '.join(request.module.focus_areas)} in {request.topic.name}
-
-## 📚 Introduction  
-2-3 paragraph introduction explaining what {request.topic.name} is and why it's important
-
-## 🔑 Key Concepts
-Detailed explanation of 3-4 key concepts students will learn:
-- Concept 1: Definition and examples
-- Concept 2: Definition and examples  
-- Concept 3: Definition and examples
-
-Include practical examples relevant to {request.topic.name} for {request.topic.difficulty} level students.
-
-## 🛠️ Step-by-Step Learning Path
-
-Follow this exact sequence for optimal learning:
-
-### 📝 **Step 1: Study the Starter Example**
-**File to work with**: `starter_example.py`
-
-**ACTION ITEMS**:
-1. **Open and read** `starter_example.py` carefully
-2. **Run the code** to see the concepts in action:
-   ```bash
-   python starter_example.py
-   ```
-3. **Understand the implementation** - examine how each method demonstrates {', '.join(request.module.focus_areas)} concepts
-4. **Review the comments** and docstrings to understand the design decisions
-
-### 🧪 **Step 2: Understand the Tests**
-**File to work with**: `test_starter_example.py`
-
-**ACTION ITEMS**:
-1. **Read through** `test_starter_example.py` to understand testing approaches
-2. **Run the tests** to see how the starter example is validated:
-   ```bash
-   python -m pytest test_starter_example.py -v
-   ```
-3. **Analyze test patterns** - notice how different scenarios are tested
-4. **Understand test structure** - observe setup, execution, and assertion patterns
-
-### 📝 **Step 3: Write Tests for Assignment A**
-**Files to work with**: `assignment_a.py` → `test_assignment_a.py`
-
-**OBJECTIVE**: Practice test-driven learning by writing comprehensive tests
-
-**ACTION ITEMS**:
-1. **Study the code** in `assignment_a.py` thoroughly
-2. **Analyze the class structure** and method signatures
-3. **Write comprehensive tests** in `test_assignment_a.py` to achieve 100% coverage
-4. **Test edge cases** and error conditions
-5. **Run your tests** to verify they work:
-   ```bash
-   python -m pytest test_assignment_a.py -v
-   ```
-
-### 🚀 **Step 4: Implement Assignment B**
-**Files to work with**: `test_assignment_b.py` → `assignment_b.py`
-
-**OBJECTIVE**: Practice implementation by making tests pass
-
-**ACTION ITEMS**:
-1. **Study the test requirements** in `test_assignment_b.py`
-2. **Understand what needs to be implemented** by reading test expectations
-3. **Implement the methods** in `assignment_b.py` to make tests pass
-4. **Run tests iteratively** to check progress:
-   ```bash
-   python -m pytest test_assignment_b.py -v
-   ```
-5. **Refine your implementation** until all tests pass
-
-### 🎯 **Step 5: Extra Practice**
-**File to work with**: `extra_exercises.md`
-
-**ACTION ITEMS**:
-1. **Complete the additional exercises** for deeper understanding
-2. **Apply concepts** to new scenarios
-3. **Challenge yourself** with advanced variations
-
-## ✅ Success Criteria & Estimated Time
-- [ ] Successfully ran and understood `starter_example.py`
-- [ ] Comprehended test patterns in `test_starter_example.py`
-- [ ] Achieved 100% test coverage for `assignment_a.py`
-- [ ] Made all tests pass in `test_assignment_b.py`
-- [ ] Completed extra exercises
-
-**Estimated Time**: {60 if request.topic.difficulty == 'beginner' else 90 if request.topic.difficulty == 'intermediate' else 120} minutes
-
-Make it engaging and practical with real examples, not placeholders.
-""",
-            
-            "starter_example": f"""
-Create a Python code example for this module.
-{base_context}
-
-Generate ONLY executable Python code (no markdown formatting) with:
-1. A complete Python class demonstrating {', '.join(request.module.focus_areas)}
-2. Clear docstrings explaining the purpose
-3. Well-commented methods with practical examples
-4. Appropriate complexity for {request.topic.difficulty} level
-5. Error handling where relevant
-6. Example usage at the end
-
-Return only valid Python code that can be executed directly.
-""",
-            
-            "assignment_a": f"""
-Create Python code that students will write tests for.
-{base_context}
-
-Generate ONLY executable Python code (no markdown formatting) with:
-1. A Python class demonstrating {', '.join(request.module.focus_areas)}
-2. Multiple methods of varying complexity for {request.topic.difficulty} level
-3. Clear docstrings with parameters and return values
-4. Some edge cases and error conditions to test
-5. Methods that require comprehensive testing
-
-Return only valid Python code that students can write tests for.
-""",
-            
-            "assignment_b": f"""
-Create a Python class template with method signatures and docstrings.
-{base_context}
-
-Generate ONLY executable Python code (no markdown formatting) with:
-1. A Python class focused on {', '.join(request.module.focus_areas)}
-2. Method signatures only with 'pass' or 'raise NotImplementedError()'
-3. Detailed docstrings explaining what each method should do
-4. Parameter descriptions and return value specifications
-5. Appropriate complexity for {request.topic.difficulty} level
-
-Students will implement these methods to make tests pass.
-Return only valid Python code template.
-""",
-            
-            "extra_exercises": f"""
-Create 3 specific practice exercises for {request.module.name} focusing on {', '.join(request.module.focus_areas)}.
-{base_context}
-
-Generate a markdown document with COMPLETE, SPECIFIC exercises:
-
-## Exercise 1: Basic {request.topic.name.title()} Practice
-**Difficulty**: Beginner  
-Create a specific coding challenge that practices {request.module.focus_areas[0] if request.module.focus_areas else request.topic.name}.
-Include:
-- Exact problem description with specific requirements
-- Example input/output 
-- Step-by-step solution approach
-- Code template to get started
-
-## Exercise 2: Intermediate Challenge  
-**Difficulty**: Intermediate
-Design a more complex problem involving {', '.join(request.module.focus_areas[:2]) if len(request.module.focus_areas) > 1 else request.topic.name}.
-Include specific requirements, constraints, and expected behavior.
-
-## Exercise 3: Real-World Application
-**Difficulty**: Advanced
-Create a practical project that applies {request.topic.name} to solve a real problem.
-Provide specific requirements and deliverables.
-
-NO placeholders - provide complete, actionable exercises.
-""",
-            
-            "test_starter": f"""
-Create comprehensive pytest test cases for the starter example.
-{base_context}
-
-{f"CODE TO TEST:{chr(10)}{request.additional_context.get('code_to_test', 'No code provided')}{chr(10)}" if request.additional_context.get('code_to_test') else ""}
-
-Generate ONLY executable Python test code (no markdown formatting) with:
-1. Import statements: `import pytest` and `from starter_example import ClassName` (use the actual class name from the code above)
-2. Test class that follows pytest conventions
-3. Comprehensive test methods covering:
-   - Normal functionality  
-   - Edge cases
-   - Error conditions
-   - Method interactions
-4. Use clear, descriptive test method names
-5. Include docstrings explaining what each test verifies
-6. Use appropriate pytest features (fixtures, parametrize, etc.)
-
-CRITICAL SYNTAX REQUIREMENTS:
-- ALL strings must be properly quoted with matching quotes
-- ALL parentheses, brackets, and braces must be balanced
-- ALL indentation must use 4 spaces consistently
-- Import from the filename 'starter_example', not from any module name
-- Example: `from starter_example import ActualClassName`
-
-Analyze the actual code structure and create tests that match the real class names and methods.
-Return only valid, syntax-error-free Python test code.
-""",
-            
-            "test_assignment_a": f"""
-Create comprehensive pytest test cases for assignment A.
-{base_context}
-
-{f"CODE TO TEST:{chr(10)}{request.additional_context.get('code_to_test', 'No code provided')}{chr(10)}" if request.additional_context.get('code_to_test') else ""}
-
-Generate ONLY executable Python test code (no markdown formatting) with:
-1. Import statements: `import pytest` and `from assignment_a import ClassName` (use the actual class name from the code above)
-2. Test class following pytest conventions  
-3. Comprehensive test methods that achieve high coverage:
-   - All public methods tested
-   - Normal cases and edge cases
-   - Error conditions and exception handling
-   - Boundary conditions
-4. Use descriptive test method names
-5. Include setup and teardown if needed
-6. Use pytest features appropriately
-
-CRITICAL SYNTAX REQUIREMENTS:
-- ALL strings must be properly quoted with matching quotes
-- ALL parentheses, brackets, and braces must be balanced
-- ALL indentation must use 4 spaces consistently
-- Import from the filename 'assignment_a', not from any module name
-- Example: `from assignment_a import ActualClassName`
-
-Analyze the actual code structure and create tests that match the real class names and methods.
-Return only valid, syntax-error-free Python test code that students can run to verify their understanding.
-""",
-            
-            "test_assignment_b": f"""
-Create pytest test cases that assignment B code must pass.
-{base_context}
-
-{f"CODE TO TEST:{chr(10)}{request.additional_context.get('code_to_test', 'No code provided')}{chr(10)}" if request.additional_context.get('code_to_test') else ""}
-
-Generate ONLY executable Python test code (no markdown formatting) with:
-1. Import statements: `import pytest` and `from assignment_b import ClassName` (use the actual class name from the code above)
-2. Test class following pytest conventions
-3. Test methods that verify the implementation requirements:
-   - Test method signatures and return types
-   - Test expected behavior and outputs
-   - Test edge cases and error handling
-   - Test method interactions
-4. Use clear, descriptive test names
-5. Include helpful assertions with descriptive messages
-
-CRITICAL SYNTAX REQUIREMENTS:
-- ALL strings must be properly quoted with matching quotes
-- ALL parentheses, brackets, and braces must be balanced
-- ALL indentation must use 4 spaces consistently
-- Import from the filename 'assignment_b', not from any module name
-- Example: `from assignment_b import ActualClassName`
-
-Analyze the actual code structure and create tests that the student implementation must pass.
-Return only valid, syntax-error-free Python test code.
-"""
+        context = {
+            "content_type": request.content_type,
+            "topic_name": topic.name,
+            "difficulty": format(topic.difficulty),
+            "module_name": module.name,
+            "module_type": format(module.type),
+            "focus_areas": ', '.join(focus_areas),
+            "learning_objectives": ', '.join(topic.learning_objectives),
+            "primary_focus": focus_areas[0] if focus_areas else topic.name,
+            "first_two_focus": ', '.join(focus_areas[:2]) if len(focus_areas) > 1 else topic.name,
+            "estimated_minutes": ESTIMATED_MINUTES.get(topic.difficulty, 120),
+            "code_to_test_section": f"CODE TO TEST:\n{code_to_test}\n" if code_to_test else "",
         }
+        context["base_context"] = BASE_CONTEXT_TEMPLATE.substitute(context)
         
-        return prompts.get(request.content_type, f"Generate {request.content_type} content for {request.module.name}")
+        return PROMPT_TEMPLATES.get(request.content_type, DEFAULT_PROMPT_TEMPLATE).safe_substitute(context)
     
     def _generate_learning_path_fallback(self, request: ContentGenerationRequest) -> str:
         """Generate fallback learning path content."""
-        return f"""# {request.module.name} - Learning Path
-
-## 🎯 Learning Objectives
-
-By the end of this module, you will understand:
-{chr(10).join(f"- {objective}" for objective in request.topic.learning_objectives)}
-
-## 🔑 Key Concepts
-
-{chr(10).join(f"- **{area.title()}**: Core concept in {request.topic.name.lower()}" for area in request.module.focus_areas)}
-
-## �️ Step-by-Step Learning Path
-
-Follow this exact sequence for optimal learning:
-
-### 📝 **Step 1: Study the Starter Example**
-**File to work with**: `starter_example.py`
-
-**ACTION ITEMS**:
-1. **Open and read** `starter_example.py` carefully
-2. **Run the code** to see the concepts in action:
-   ```bash
-   python starter_example.py
-   ```
-3. **Understand the implementation** - examine how each method demonstrates {", ".join(request.module.focus_areas)} concepts
-4. **Review the comments** and docstrings to understand the design decisions
-
-### 🧪 **Step 2: Understand the Tests**
-**File to work with**: `test_starter_example.py`
-
-**ACTION ITEMS**:
-1. **Read through** `test_starter_example.py` to understand testing approaches
-2. **Run the tests** to see how the starter example is validated:
-   ```bash
-   python -m pytest test_starter_example.py -v
-   ```
-3. **Analyze test patterns** - notice how different scenarios are tested
-4. **Understand test structure** - observe setup, execution, and assertion patterns
-
-### 📝 **Step 3: Write Tests for Assignment A**
-**Files to work with**: `assignment_a.py` → `test_assignment_a.py`
-
-**OBJECTIVE**: Practice test-driven learning by writing comprehensive tests
-
-**ACTION ITEMS**:
-1. **Study the code** in `assignment_a.py` thoroughly
-2. **Analyze the class structure** and method signatures
-3. **Write comprehensive tests** in `test_assignment_a.py` to achieve 100% coverage
-4. **Test edge cases** and error conditions
-5. **Run your tests** to verify they work:
-   ```bash
-   python -m pytest test_assignment_a.py -v
-   ```
-
-### 🚀 **Step 4: Implement Assignment B**
-**Files to work with**: `test_assignment_b.py` → `assignment_b.py`
-
-**OBJECTIVE**: Practice implementation by making tests pass
-
-**ACTION ITEMS**:
-1. **Study the test requirements** in `test_assignment_b.py`
-2. **Understand what needs to be implemented** by reading test expectations
-3. **Implement the methods** in `assignment_b.py` to make tests pass
-4. **Run tests iteratively** to check progress:
-   ```bash
-   python -m pytest test_assignment_b.py -v
-   ```
-5. **Refine your implementation** until all tests pass
-
-### 🎯 **Step 5: Extra Practice**
-**File to work with**: `extra_exercises.md`
-
-**ACTION ITEMS**:
-1. **Complete the additional exercises** for deeper understanding
-2. **Apply concepts** to new scenarios
-3. **Challenge yourself** with advanced variations
-
-## ✅ Success Criteria
-
-- [ ] Successfully ran and understood `starter_example.py`
-- [ ] Comprehended test patterns in `test_starter_example.py`
-- [ ] Achieved 100% test coverage for `assignment_a.py`
-- [ ] Made all tests pass in `test_assignment_b.py`
-- [ ] Completed extra exercises
-
-**Estimated Time**: {60 if request.topic.difficulty == 'beginner' else 90 if request.topic.difficulty == 'intermediate' else 120} minutes
-"""
+        return _learning_path_fallback(
+            request.module.name,
+            request.topic.name,
+            tuple(request.topic.learning_objectives),
+            tuple(request.module.focus_areas),
+            request.topic.difficulty
+        )
     
     def _generate_starter_example_fallback(self, request: ContentGenerationRequest) -> str:
         """Generate fallback starter example."""
-        class_name = self._create_safe_class_name(request.topic.name, "Example")
-        return f'''"""
-Starter Example: {request.module.name}
-
-This example demonstrates {", ".join(request.module.focus_areas)} concepts
-in {request.topic.name.lower()}.
-
-Learning Objectives:
-- Understand {request.topic.name.lower()} concepts
-- Practice implementation and testing skills
-"""
-
-# Starter Example for {request.module.name}
-
-class {class_name}:
-    """
-    Example class for {request.module.name}.
-    
-    This is a starter example to demonstrate {", ".join(request.module.focus_areas)} concepts
-    in {request.topic.name.lower()}.
-    Study this code to understand the patterns and techniques used.
-    """
-    
-    def __init__(self):
-        """Initialize the example."""
-        self.data = {{}}
-    
-    def example_method(self, param):
-        """
-        Example method demonstrating basic functionality.
-        
-        Args:
-            param: Example parameter
-            
-        Returns:
-            Processed result
-        """
-        # TODO: Add meaningful implementation
-        return f"Processed: {{param}}"
-    
-    def demonstrate_concept(self):
-        """Demonstrate the main concept of this module."""
-        # TODO: Add concept demonstration
-        print(f"Demonstrating {request.module.focus_areas[0] if request.module.focus_areas else 'concepts'}")
-
-
-if __name__ == "__main__":
-    example = {class_name}()
-    result = example.example_method("test")
-    print(result)
-    example.demonstrate_concept()
-'''
+        return _render_fallback(
+            load_fallback_code_template("starter_example"),
+            module_name=request.module.name,
+            topic_name=request.topic.name.lower(),
+            focus_areas=", ".join(request.module.focus_areas),
+            primary_focus=request.module.focus_areas[0] if request.module.focus_areas else 'concepts',
+            class_name=self._create_safe_class_name(request.topic.name, "Example")
+        )
     
     def _generate_assignment_a_fallback(self, request: ContentGenerationRequest) -> str:
         """Generate fallback assignment A."""
-        class_name = self._create_safe_class_name(request.topic.name, "Assignment")
-        return f'''"""
-Assignment A: {request.module.name}
-Students need to write tests to achieve 100% coverage.
-
-Learning Objectives:
-- Understand {request.topic.name.lower()} concepts
-- Practice implementation and testing skills
-"""
-
-# Assignment A: {request.module.name}
-# Students need to write tests for this code
-
-class {class_name}:
-    """
-    Assignment class for testing practice.
-    
-    TASK: Write comprehensive tests for this class in test_assignment_a.py
-    Focus on:
-    - Testing all methods with various inputs
-    - Edge cases and error conditions
-    - Code coverage of all branches
-    """
-    
-    def process_data(self, data):
-        """Process input data and return result."""
-        if not data:
-            return None
-        return str(data).upper()
-    
-    def calculate_result(self, a, b):
-        """Calculate result from two inputs."""
-        if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
-            raise TypeError("Inputs must be numbers")
-        return a + b
-    
-    def validate_input(self, value):
-        """Validate input and return boolean."""
-        return value is not None and len(str(value)) > 0
-'''
+        return _render_fallback(
+            load_fallback_code_template("assignment_a"),
+            module_name=request.module.name,
+            topic_name=request.topic.name.lower(),
+            class_name=self._create_safe_class_name(request.topic.name, "Assignment")
+        )
     
     def _generate_assignment_b_fallback(self, request: ContentGenerationRequest) -> str:
         """Generate fallback assignment B."""
-        class_name = self._create_safe_class_name(request.topic.name, "Implementation")
-        return f'''"""
-Assignment B: {request.module.name}
-Students need to implement methods to make tests pass.
-
-Learning Objectives:
-- Understand {request.topic.name.lower()} concepts
-- Practice implementation and testing skills
-"""
-
-# Assignment B: {request.module.name}  
-# Students need to implement code to make tests pass
-
-class {class_name}:
-    """
-    Implementation class for {request.module.name}.
-    
-    TASK: Implement the methods below to make the tests in test_assignment_b.py pass.
-    Follow the method signatures and docstrings carefully.
-    """
-    
-    def __init__(self):
-        """Initialize the implementation."""
-        # TODO: Add initialization code
-        pass
-    
-    def required_method(self, param):
-        """
-        Implement this method according to test requirements.
-        
-        Args:
-            param: Input parameter
-            
-        Returns:
-            Expected result based on tests
-        """
-        # TODO: Implement to make tests pass
-        raise NotImplementedError("Implement this method")
-    
-    def helper_method(self, data):
-        """
-        Helper method for processing data.
-        
-        Args:
-            data: Data to process
-            
-        Returns:
-            Processed data
-        """
-        # TODO: Implement helper functionality
-        raise NotImplementedError("Implement this method")
-'''
+        return _render_fallback(
+            load_fallback_code_template("assignment_b"),
+            module_name=request.module.name,
+            topic_name=request.topic.name.lower(),
+            class_name=self._create_safe_class_name(request.topic.name, "Implementation")
+        )
     
     def _generate_test_fallback(self, request: ContentGenerationRequest) -> str:
         """Generate fallback test content."""
-        return f'''"""
-Tests for {request.module.name}
-"""
-
-import pytest
-
-
-class TestModule:
-    """Test cases for the module."""
-    
-    def setup_method(self):
-        """Set up test fixtures."""
-        pass
-    
-    def test_basic_functionality(self):
-        """Test basic functionality works."""
-        # TODO: Add meaningful test
-        assert True
-    
-    def test_edge_cases(self):
-        """Test edge cases."""
-        # TODO: Add edge case tests
-        assert True
-
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
-'''
+        return _render_fallback(load_fallback_code_template("test_starter"), module_name=request.module.name)
     
     def _generate_test_assignment_a_fallback(self, request: ContentGenerationRequest) -> str:
         """Generate fallback assignment A tests."""
-        return f'''"""
-Assignment A Test Template: {request.module.name}
-
-STUDENT TASK: Write comprehensive tests for assignment_a.py
-Focus on achieving 100% code coverage and testing edge cases.
-"""
-
-import pytest
-# TODO: Import your classes from assignment_a.py
-
-
-class TestAssignment:
-    """
-    Test cases for Assignment A.
-    
-    INSTRUCTIONS:
-    1. Import the class from assignment_a.py
-    2. Write tests for all methods
-    3. Achieve 100% code coverage
-    4. Test edge cases and error conditions
-    """
-    
-    def setup_method(self):
-        """Set up test fixtures before each test method."""
-        # TODO: Initialize test objects here
-        pass
-    
-    # TODO: Write your test methods here
-    def test_placeholder(self):
-        """Remove this test once you add real tests."""
-        assert True
-
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
-'''
+        return _render_fallback(load_fallback_code_template("test_assignment_a"), module_name=request.module.name)
     
     def _generate_test_assignment_b_fallback(self, request: ContentGenerationRequest) -> str:
         """Generate fallback assignment B tests."""
-        class_name = f"{request.module.name.replace(' ', '')}Implementation"
-        return f'''"""
-Assignment B Tests: {request.module.name}
-Students need to implement code to make these tests pass.
-"""
-
-import pytest
-from assignment_b import {class_name}
-
-
-class Test{class_name}:
-    """Tests that student implementation must pass."""
-    
-    def setup_method(self):
-        """Setup test fixture."""
-        self.implementation = {class_name}()
-    
-    def test_required_method_basic(self):
-        """Test required method with basic input."""
-        result = self.implementation.required_method("test")
-        assert result is not None
-    
-    def test_helper_method(self):
-        """Test helper method functionality."""
-        result = self.implementation.helper_method("data")
-        assert result is not None
-
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
-'''
+        return _render_fallback(
+            load_fallback_code_template("test_assignment_b"),
+            module_name=request.module.name,
+            class_name=f"{request.module.name.replace(' ', '')}Implementation"
+        )
     
     def _generate_extra_exercises_fallback(self, request: ContentGenerationRequest) -> str:
         """Generate fallback extra exercises."""
-        return f"""# Extra Exercises: {request.module.name}
-
-## 🎯 Objective
-Practice and reinforce {', '.join(request.module.focus_areas)} concepts.
-
-## 📚 Focus Areas
-{chr(10).join(f"- {area.title()}" for area in request.module.focus_areas)}
-
----
-
-## 🚀 Exercise 1: Basic Practice
-**Difficulty**: ⭐⭐
-
-Apply the concepts from this module in a simple scenario.
-
-**Task**:
-1. Create a simple implementation using the module concepts
-2. Write tests for your implementation
-3. Ensure all tests pass
-
----
-
-## 🚀 Exercise 2: Intermediate Challenge
-**Difficulty**: ⭐⭐⭐
-
-Extend the concepts to handle more complex scenarios.
-
-**Task**:
-1. Design a solution that combines multiple concepts
-2. Handle edge cases and errors
-3. Write comprehensive tests
-
----
-
-## 🚀 Exercise 3: Advanced Application
-**Difficulty**: ⭐⭐⭐⭐
-
-Create a real-world application using the module concepts.
-
-**Task**:
-1. Identify a practical problem to solve
-2. Design and implement a complete solution
-3. Include documentation and tests
-4. Consider performance and maintainability
-
-## 🧪 Testing Your Solutions
-
-Run your exercise tests:
-```bash
-pytest test_exercise_*.py -v
-```
-
-## 📋 Success Criteria
-
-- [ ] Complete all exercises
-- [ ] Achieve good test coverage
-- [ ] Follow best practices
-- [ ] Document your solutions
-"""
+        return _extra_exercises_fallback(request.module.name, tuple(request.module.focus_areas))
     
     def _get_system_prompt(self, content_type: str) -> str:
         """Get appropriate system prompt based on content type."""
-        if content_type in ["test_starter", "test_assignment_a", "test_assignment_b"]:
-            return """You are an expert Python programming instructor specializing in test generation. 
-
-CRITICAL REQUIREMENTS:
-1. Generate ONLY valid, executable Python code with NO syntax errors
-2. ALL strings must be properly quoted and terminated
-3. ALL parentheses, brackets, and braces must be balanced
-4. ALL indentation must be consistent (4 spaces)
-5. NO markdown formatting, comments outside the code, or explanations
-6. Verify all imports are correct and match actual file names
-7. Double-check all method names match the actual code being tested
-
-Focus on creating comprehensive, syntactically perfect pytest test cases."""
-        elif content_type in ["starter_example", "assignment_a", "assignment_b"]:
-            return """You are an expert Python programming instructor. 
-
-CRITICAL REQUIREMENTS:
-1. Generate ONLY valid, executable Python code with NO syntax errors
-2. ALL strings must be properly quoted and terminated  
-3. ALL parentheses, brackets, and braces must be balanced
-4. ALL indentation must be consistent (4 spaces)
-5. NO markdown formatting, comments outside the code, or explanations
-6. Include proper docstrings and meaningful implementations
-7. Focus on practical, educational examples with proper error handling
-
-Generate clean, professional Python code that students can learn from."""
-        else:
-            return "You are an expert educational content creator. Generate practical, engaging educational content focused on programming concepts. Use clear explanations and real-world examples."
+        return SYSTEM_PROMPTS.get(content_type, DEFAULT_SYSTEM_PROMPT)
 
     def _extract_code_from_markdown(self, content: str) -> str:
         """Extract Python code from markdown code blocks."""
-        import re
+        # A block needs an opening and a closing fence; bare code (or output
+        # truncated after the opening fence) skips the regex entirely
+        first_fence = content.find("```")
+        if first_fence == -1 or content.find("```", first_fence + 3) == -1:
+            return content
         
-        # Look for Python code blocks (```python or ```py or just ```)
-        code_block_pattern = r'```(?:python|py)?\n?(.*?)```'
-        matches = re.findall(code_block_pattern, content, re.DOTALL)
+        # Look for Python code blocks (```python or ```py or just ```),
+        # keeping the first of the largest ones in a single pass
+        largest_block = None
+        for match in _CODE_FENCE_RE.finditer(content, first_fence):
+            block = match.group(1)
+            if largest_block is None or len(block) > len(largest_block):
+                largest_block = block
         
-        if matches:
-            # If we found code blocks, return the first/largest one
-            largest_block = max(matches, key=len)
+        if largest_block is not None:
             return largest_block.strip()
         
         # If no code blocks found, return original content
@@ -1138,17 +1241,26 @@ Generate clean, professional Python code that students can learn from."""
 
     def _generate_generic_fallback(self, request: ContentGenerationRequest) -> str:
         """Generate generic fallback content."""
-        return f"""# {request.content_type.title()}: {request.module.name}
-
-This is placeholder content for {request.content_type}.
-
-## Module Information
-- **Topic**: {request.topic.name}
-- **Module**: {request.module.name}
-- **Type**: {request.module.type}
-- **Focus Areas**: {', '.join(request.module.focus_areas)}
-- **Difficulty**: {request.topic.difficulty}
+        return _render_fallback(
+            GENERIC_FALLBACK_TEMPLATE,
+            content_type=request.content_type,
+            content_title=request.content_type.title(),
+            module_name=request.module.name,
+            topic_name=request.topic.name,
+            module_type=format(request.module.type),
+            focus_areas=', '.join(request.module.focus_areas),
+            difficulty=format(request.topic.difficulty)
+        )
 
-## TODO
-Implement {request.content_type} content for this module.
-"""
\ No newline at end of file
+    # Fallback renderer per content type, built once for the class instead of
+    # binding eight methods on every fallback call
+    _FALLBACK_DISPATCH = MappingProxyType({
+        "learning_path": _generate_learning_path_fallback,
+        "starter_example": _generate_starter_example_fallback,
+        "assignment_a": _generate_assignment_a_fallback,
+        "assignment_b": _generate_assignment_b_fallback,
+        "test_starter": _generate_test_fallback,
+        "test_assignment_a": _generate_test_assignment_a_fallback,
+        "test_assignment_b": _generate_test_assignment_b_fallback,
+        "extra_exercises": _generate_extra_exercises_fallback
+    })
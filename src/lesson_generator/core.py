@@ -7,21 +7,204 @@ template rendering, and file structure creation.
 """
 
 import ast
+import re
 import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional, Tuple, Union
 
 from .models import (
     TopicConfig, 
     GenerationConfig, 
     LessonGenerationResult,
-    ModuleGenerationResult
+    ModuleGenerationResult,
+    GeneratedFile
 )
-from .content import ContentGenerator
+from .content import ContentGenerator, _safe_topic_name
 from .templates import TemplateEngine
 from .quality import QualityAssurance
 from .utils.validation import validate_topic
 
+# Upper bound on concurrent file generations within one module
+MODULE_FILE_WORKERS = 8
+
+
+class _ModuleFileSpec(NamedTuple):
+    """How one file of a standard module is generated."""
+    content_type: str
+    template_name: str
+    is_python: bool
+    code_file: Optional[str] = None  # Code file a test file covers
+
+
+# Files of a standard module, in the order they are reported
+_STANDARD_MODULE_FILES = {
+    "learning_path.md": _ModuleFileSpec("learning_path", "learning_path.md.j2", False),
+    "starter_example.py": _ModuleFileSpec("starter_example", "assignment.py.j2", True),
+    "test_starter_example.py": _ModuleFileSpec("test_starter", "test_template.py.j2", True, "starter_example.py"),
+    "assignment_a.py": _ModuleFileSpec("assignment_a", "assignment.py.j2", True),
+    "test_assignment_a.py": _ModuleFileSpec("test_assignment_a", "test_template.py.j2", True, "assignment_a.py"),
+    "assignment_b.py": _ModuleFileSpec("assignment_b", "assignment.py.j2", True),
+    "test_assignment_b.py": _ModuleFileSpec("test_assignment_b", "test_template.py.j2", True, "assignment_b.py"),
+    "extra_exercises.md": _ModuleFileSpec("extra_exercises", "extra_exercises.md.j2", False)
+}
+
+# Test file to start once a code file of a standard module is written
+_TEST_FILE_FOR = {
+    spec.code_file: filename for filename, spec in _STANDARD_MODULE_FILES.items() if spec.code_file
+}
+
+# requirements.txt written into every lesson
+_REQUIREMENTS_TXT = """pytest>=7.0.0
+pytest-cov>=4.0.0
+pylint>=2.17.0
+black>=23.0.0
+"""
+
+# pytest.ini written into every lesson
+_PYTEST_INI = """[tool:pytest]
+testpaths = .
+python_files = test_*.py
+python_classes = Test*
+python_functions = test_*
+addopts = --tb=short --cov=. --cov-report=term-missing
+"""
+
+# Makefile written into every lesson
+_MAKEFILE = """# Makefile for lesson
+
+.PHONY: test lint format clean install
+
+install:
+	pip install -r requirements.txt
+
+test:
+	pytest
+
+lint:
+	pylint **/*.py
+
+format:
+	black **/*.py
+
+clean:
+	find . -type d -name "__pycache__" -delete
+	find . -type f -name "*.pyc" -delete
+	rm -rf .pytest_cache
+	rm -rf .coverage
+"""
+
+# setup.cfg written into every lesson
+_SETUP_CFG = """[pylint]
+disable = missing-docstring,too-few-public-methods
+
+[coverage:run]
+source = .
+omit = test_*, *_test.py
+
+[coverage:report]
+exclude_lines =
+    pragma: no cover
+    def __repr__
+    raise AssertionError
+    raise NotImplementedError
+"""
+
+# .gitignore written into every lesson
+_GITIGNORE = """# Python
+__pycache__/
+*.py[cod]
+*$py.class
+*.so
+.Python
+build/
+develop-eggs/
+dist/
+downloads/
+eggs/
+.eggs/
+lib/
+lib64/
+parts/
+sdist/
+var/
+wheels/
+*.egg-info/
+.installed.cfg
+*.egg
+
+# Testing
+.pytest_cache/
+.coverage
+htmlcov/
+.tox/
+
+# IDEs
+.vscode/
+.idea/
+*.swp
+*.swo
+
+# OS
+.DS_Store
+Thumbs.db
+"""
+
+
+@lru_cache(maxsize=128)
+def _parse_python(content: str) -> Union[ast.Module, Exception]:
+    """
+    Parse Python source into an AST, or return the parse error.
+    
+    Memoized because the same source is validated again after a no-op syntax
+    fix, analyzed again when its test file is generated, and fallback files
+    repeat across modules. Callers must treat the tree as read-only.
+    """
+    try:
+        return ast.parse(content)
+    except Exception as e:
+        # Drop the traceback so cached errors do not keep parser frames alive
+        return e.with_traceback(None)
+
+
+# First thing that looks like a class statement; every class the AST scan can
+# find matches it, so code without a match is not parsed for analysis
+_CLASS_NAME_RE = re.compile(r'class\s+(\w+)')
+
+
+@lru_cache(maxsize=256)
+def _class_outline(content: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """
+    Name and public method names of the class tests are generated for.
+    
+    Generated code defines its class at module level, so the top-level
+    statements are scanned first and the whole tree is only walked when the
+    class is nested somewhere (ast.walk is breadth-first, so it would find the
+    same top-level class first). The small result is cached separately from
+    the AST so repeated analyses skip the scan too.
+    
+    Returns:
+        ``(class_name, method_names)``, or None if there is no class
+        
+    Raises:
+        ValueError: If the code does not parse
+    """
+    tree = _parse_python(content)
+    if isinstance(tree, Exception):
+        raise ValueError(str(tree))
+    
+    class_node = next((node for node in tree.body if isinstance(node, ast.ClassDef)), None)
+    if class_node is None:
+        class_node = next((node for node in ast.walk(tree) if isinstance(node, ast.ClassDef)), None)
+    if class_node is None:
+        return None
+    
+    return class_node.name, tuple(
+        item.name for item in class_node.body
+        if isinstance(item, ast.FunctionDef) and not item.name.startswith('_')
+    )
+
 
 class LessonGenerator:
     """
@@ -48,6 +231,9 @@ class LessonGenerator:
         self.template_engine = TemplateEngine(config)
         self.quality_assurance = QualityAssurance(config)
         
+        # The reference lesson is looked at once per generator, not per lesson
+        self._reference_checked = False
+        
         # Ensure output directory exists
         self.config.output_dir.mkdir(parents=True, exist_ok=True)
         
@@ -65,19 +251,17 @@ class LessonGenerator:
         Returns:
             Tuple of (is_valid: bool, error_message: str)
         """
-        try:
-            ast.parse(content)
+        error = _parse_python(content)
+        if not isinstance(error, Exception):
             return True, ""
-        except SyntaxError as e:
-            error_msg = f"Syntax error in {filename} at line {e.lineno}: {e.msg}"
-            if self.config.verbose:
-                print(f"⚠ {error_msg}")
-            return False, error_msg
-        except Exception as e:
-            error_msg = f"Parse error in {filename}: {str(e)}"
-            if self.config.verbose:
-                print(f"⚠ {error_msg}")
-            return False, error_msg
+        
+        if isinstance(error, SyntaxError):
+            error_msg = f"Syntax error in {filename} at line {error.lineno}: {error.msg}"
+        else:
+            error_msg = f"Parse error in {filename}: {str(error)}"
+        if self.config.verbose:
+            print(f"⚠ {error_msg}")
+        return False, error_msg
     
     def _fix_common_syntax_issues(self, content: str, filename: str) -> str:
         """
@@ -96,10 +280,14 @@ class LessonGenerator:
         # Common fixes
         lines = content.split('\n')
         fixed_lines = []
+        # Index of the last line holding a triple quote, so the "does a later
+        # line close this docstring" check below is O(1) instead of a rescan
+        last_quote_line = max((i for i, line in enumerate(lines) if '"""' in line), default=-1)
         
         for i, line in enumerate(lines):
-            # Fix invalid class names (remove hyphens)
-            if line.strip().startswith('class ') and '-' in line:
+            # Fix invalid class names (remove hyphens); the cheap membership
+            # test goes first so most lines are never stripped
+            if '-' in line and line.lstrip().startswith('class '):
                 line = line.replace('-', '')
                 if self.config.verbose:
                     print(f"Fixed class name on line {i+1}")
@@ -107,8 +295,7 @@ class LessonGenerator:
             # Fix unclosed docstrings
             if '"""' in line and line.count('"""') == 1:
                 # Check if this starts a docstring that never closes
-                remaining_lines = lines[i+1:]
-                has_closing = any('"""' in l for l in remaining_lines)
+                has_closing = last_quote_line > i
                 if not has_closing:
                     # Add closing docstring
                     line += '\n"""'
@@ -136,7 +323,7 @@ class LessonGenerator:
             # Validate topic configuration
             validation_result = validate_topic(topic)
             if not validation_result.is_valid:
-                return LessonGenerationResult(
+                return LessonGenerationResult.model_construct(
                     topic_name=topic.name,
                     topic_slug=topic.slug,
                     success=False,
@@ -147,8 +334,10 @@ class LessonGenerator:
             if self.config.verbose and validation_result.warnings:
                 print(f"Warnings for topic '{topic.name}': {'; '.join(validation_result.warnings)}")
             
-            # Check if we need to extract templates from reference lesson
-            if (self.config.reference_lesson_dir and 
+            # Check if we need to extract templates from reference lesson. This
+            # only depends on the configuration, so batch runs decide it once.
+            if (not self._reference_checked and
+                self.config.reference_lesson_dir and 
                 Path(self.config.reference_lesson_dir).exists() and 
                 not self.template_engine.has_custom_templates()):
                 
@@ -162,6 +351,7 @@ class LessonGenerator:
                 except Exception as e:
                     if self.config.verbose:
                         print(f"⚠ Template extraction failed: {e}, using built-in templates")
+            self._reference_checked = True
             
             # Create lesson directory
             lesson_dir = self.config.output_dir / topic.slug
@@ -173,7 +363,7 @@ class LessonGenerator:
                 print(f"Using templates: {template_source}")
             
             # Generate lesson structure
-            result = LessonGenerationResult(
+            result = LessonGenerationResult.model_construct(
                 topic_name=topic.name,
                 topic_slug=topic.slug,
                 success=True,
@@ -181,12 +371,41 @@ class LessonGenerator:
                 ai_model_used=self.config.openai_model if self.config.use_ai else None
             )
             
-            # Generate each module
-            for i, module in enumerate(topic.modules):
+            # Generate the modules concurrently; each writes only to its own
+            # module directory, and results are handled in module order
+            def generate_module(module):
                 if self.config.verbose:
                     print(f"  Generating module: {module.name}")
-                
-                module_result = self._generate_module(topic, module, lesson_dir)
+                return self._generate_module(topic, module, lesson_dir)
+            
+            # Each finished module is quality-checked on a background thread
+            # while later modules are still generating; the lesson-level check
+            # below reuses those results. Directories shared by several modules
+            # are left to the lesson-level check.
+            module_dirs = [self._module_dir(lesson_dir, module) for module in topic.modules]
+            module_checks = {}
+            
+            # Module names that map to the same directory would write the same
+            # files concurrently; generate those lessons one module at a time
+            max_workers = min(self.config.max_parallel_modules, len(topic.modules)) or 1
+            if len(set(module_dirs)) < len(module_dirs):
+                max_workers = 1
+            with ThreadPoolExecutor(max_workers=1) as qa_executor:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        executor.submit(generate_module, module): module_dir
+                        for module, module_dir in zip(topic.modules, module_dirs)
+                    }
+                    for future in as_completed(futures):
+                        module_dir = futures[future]
+                        if future.result().success and module_dirs.count(module_dir) == 1:
+                            module_checks[module_dir] = qa_executor.submit(
+                                self.quality_assurance.validate_module, module_dir
+                            )
+                    module_results = [future.result() for future in futures]
+                module_checks = {module_dir: check.result() for module_dir, check in module_checks.items()}
+            
+            for module, module_result in zip(topic.modules, module_results):
                 result.modules.append(module_result)
                 
                 if not module_result.success:
@@ -203,7 +422,7 @@ class LessonGenerator:
                 if self.config.verbose:
                     print("  Running quality assurance...")
                 
-                quality_report = self.quality_assurance.validate_lesson(lesson_dir)
+                quality_report = self.quality_assurance.validate_lesson(lesson_dir, module_checks)
                 result.quality_report = quality_report
                 
                 # Mark as failed if quality is too low
@@ -224,7 +443,7 @@ class LessonGenerator:
             return result
             
         except Exception as e:
-            return LessonGenerationResult(
+            return LessonGenerationResult.model_construct(
                 topic_name=topic.name,
                 topic_slug=topic.slug,
                 success=False,
@@ -233,6 +452,11 @@ class LessonGenerator:
                 generation_time_seconds=time.time() - start_time
             )
     
+    @staticmethod
+    def _module_dir(lesson_dir: Path, module_config) -> Path:
+        """Get the directory a module is generated into."""
+        return lesson_dir / f"module_{module_config.name.lower().replace(' ', '_')}"
+    
     def _generate_module(
         self, 
         topic: TopicConfig, 
@@ -254,11 +478,10 @@ class LessonGenerator:
         
         try:
             # Create module directory
-            module_name = module_config.name.lower().replace(' ', '_')
-            module_dir = lesson_dir / f"module_{module_name}"
+            module_dir = self._module_dir(lesson_dir, module_config)
             module_dir.mkdir(parents=True, exist_ok=True)
             
-            result = ModuleGenerationResult(
+            result = ModuleGenerationResult.model_construct(
                 module_name=module_config.name,
                 success=True
             )
@@ -275,7 +498,7 @@ class LessonGenerator:
             return result
             
         except Exception as e:
-            return ModuleGenerationResult(
+            return ModuleGenerationResult.model_construct(
                 module_name=module_config.name,
                 success=False,
                 error=str(e),
@@ -284,139 +507,164 @@ class LessonGenerator:
     
     def _generate_standard_module_files(self, topic, module_config, module_dir, result):
         """Generate standard files for a module."""
+        files_to_generate = _STANDARD_MODULE_FILES
         
-        # Define file types and their corresponding content types
-        files_to_generate = {
-            "learning_path.md": ("learning_path", "learning_path.md.j2"),
-            "starter_example.py": ("starter_example", "assignment.py.j2"),
-            "test_starter_example.py": ("test_starter", "test_template.py.j2"),
-            "assignment_a.py": ("assignment_a", "assignment.py.j2"),
-            "test_assignment_a.py": ("test_assignment_a", "test_template.py.j2"),
-            "assignment_b.py": ("assignment_b", "assignment.py.j2"),
-            "test_assignment_b.py": ("test_assignment_b", "test_template.py.j2"),
-            "extra_exercises.md": ("extra_exercises", "extra_exercises.md.j2")
-        }
+        # Request the module's independent files together; whatever this
+        # leaves uncached is generated per file below
+        self.content_generator.prefetch_module_bundle(topic, module_config)
         
         # Store generated content for contextual generation
         generated_content = {}
         
-        for filename, (content_type, template_name) in files_to_generate.items():
-            try:
-                # For test files, include the corresponding code file content as context
-                extra_context = {}
-                if filename.startswith('test_'):
-                    # Get the corresponding code file
-                    code_file = filename.replace('test_', '', 1)
-                    if code_file in generated_content:
-                        extra_context['code_to_test'] = generated_content[code_file]
-                        if self.config.verbose:
-                            print(f"    Adding code context for {filename}: {code_file} ({len(generated_content[code_file])} chars)")
-                    else:
-                        if self.config.verbose:
-                            print(f"    No code context available for {filename} (looking for {code_file})")
-                            print(f"    Available files: {list(generated_content.keys())}")
-                
-                # Generate content using AI or fallback
-                content_response = self.content_generator.generate_content(
-                    content_type, topic, module_config, extra_context
-                )
-                
-                # Prepare template context
-                context = self._create_template_context(topic, module_config, content_type, content_response, extra_context)
-                
-                # Determine content source based on type and AI availability
-                if filename.endswith('.md') and content_response.model_used != "fallback":
-                    # Always use AI for markdown files when available
-                    if self.config.verbose:
-                        print(f"    Using AI-generated content for {filename}")
-                    content = content_response.content
-                elif filename.startswith(('assignment_', 'starter_')) and content_response.model_used != "fallback":
-                    # Use AI for assignment and starter files when available
-                    if self.config.verbose:
-                        print(f"    Using AI-generated content for {filename}")
-                    content = content_response.content
-                elif filename.startswith('test_') and extra_context.get('code_to_test') and content_response.model_used != "fallback":
-                    # Use AI for test files with contextual information
-                    if self.config.verbose:
-                        print(f"    Using AI-generated content for {filename} (contextual test generation)")
-                    content = content_response.content
-                elif self.template_engine.template_exists(template_name):
-                    # Use template as fallback
+        # Code and markdown files are independent of each other, while each test
+        # file needs its code file as context. Independent files start at once on
+        # a small thread pool and each test starts as soon as its code file is
+        # written, so the network-bound generations overlap.
+        generated_files = {}
+        
+        def submit(filename):
+            return executor.submit(
+                self._generate_module_file,
+                topic, module_config, module_dir, filename, files_to_generate[filename], generated_content
+            )
+        
+        with ThreadPoolExecutor(max_workers=min(MODULE_FILE_WORKERS, len(files_to_generate))) as executor:
+            futures = {
+                submit(filename): filename for filename, spec in files_to_generate.items()
+                if spec.code_file not in files_to_generate
+            }
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    filename = futures.pop(future)
+                    generated_files[filename] = future.result()
+                    test_filename = _TEST_FILE_FOR.get(filename)
+                    if test_filename is not None:
+                        futures[submit(test_filename)] = test_filename
+        
+        # Report files in their usual order regardless of completion order
+        result.files.extend([generated_files[filename] for filename in files_to_generate])
+    
+    def _generate_module_file(self, topic, module_config, module_dir, filename, spec, generated_content):
+        """Generate, validate and write one module file, falling back to a stub on errors."""
+        content_type, template_name = spec.content_type, spec.template_name
+        try:
+            # For test files, include the corresponding code file content as context
+            extra_context = {}
+            code_file = spec.code_file
+            if code_file is not None:
+                # Get the corresponding code file
+                if code_file in generated_content:
+                    extra_context['code_to_test'] = generated_content[code_file]
                     if self.config.verbose:
-                        print(f"    Using template: {template_name}")
-                    content = self.template_engine.render_template(template_name, context)
+                        print(f"    Adding code context for {filename}: {code_file} ({len(generated_content[code_file])} chars)")
                 else:
                     if self.config.verbose:
-                        print(f"    Template {template_name} not found, using generated content")
-                    content = content_response.content
-                
-                # Validate Python syntax before writing
-                file_path = module_dir / filename
-                if filename.endswith('.py'):
-                    is_valid, error_msg = self._validate_python_syntax(content, filename)
-                    if not is_valid:
-                        # Try to fix common issues
-                        content = self._fix_common_syntax_issues(content, filename)
-                        # Validate again after fix
-                        is_valid, error_msg = self._validate_python_syntax(content, filename)
-                        if not is_valid and self.config.verbose:
-                            print(f"⚠ Still has syntax errors after fix attempt: {error_msg}")
-                
-                # Store generated content for contextual generation of related files
-                generated_content[filename] = content
-                
-                file_path.write_text(content, encoding='utf-8')
-                
-                from .models import GeneratedFile
-                generated_file = GeneratedFile(
-                    path=file_path,
-                    content=content,
-                    file_type="python" if filename.endswith('.py') else "markdown",
-                    size_bytes=len(content.encode('utf-8'))
-                )
-                result.files.append(generated_file)
-                
+                        print(f"    No code context available for {filename} (looking for {code_file})")
+                        print(f"    Available files: {list(generated_content.keys())}")
+            
+            # Generate content using AI or fallback
+            content_response = self.content_generator.generate_content(
+                content_type, topic, module_config, extra_context
+            )
+            
+            # Determine content source based on type and AI availability. The
+            # template context (which analyzes the code under test for test
+            # files) is only built when a template is actually rendered.
+            ai_content = content_response.model_used != "fallback"
+            if not spec.is_python and ai_content:
+                # Always use AI for markdown files when available
                 if self.config.verbose:
-                    print(f"    ✓ Generated {filename} ({len(content)} chars)")
-                
-            except Exception as e:
+                    print(f"    Using AI-generated content for {filename}")
+                content = content_response.content
+            elif spec.is_python and code_file is None and ai_content:
+                # Use AI for assignment and starter files when available
                 if self.config.verbose:
-                    print(f"    ✗ Failed to generate {filename}: {e}")
-                
-                # Create minimal fallback file
-                fallback_content = f"# {filename}\n\n# Error generating content: {e}\n# TODO: Implement {filename} for {module_config.name}\n"
-                file_path = module_dir / filename
-                
-                # Validate fallback content too if it's Python
-                if filename.endswith('.py'):
-                    is_valid, error_msg = self._validate_python_syntax(fallback_content, filename)
-                    if not is_valid:
-                        fallback_content = f'"""\n{filename}\n\nError generating content: {e}\nTODO: Implement {filename} for {module_config.name}\n"""\n\npass\n'
-                
-                file_path.write_text(fallback_content, encoding='utf-8')
-                
-                from .models import GeneratedFile
-                generated_file = GeneratedFile(
-                    path=file_path,
-                    content=fallback_content,
-                    file_type="python" if filename.endswith('.py') else "markdown",
-                    size_bytes=len(fallback_content.encode('utf-8'))
-                )
-                result.files.append(generated_file)
+                    print(f"    Using AI-generated content for {filename}")
+                content = content_response.content
+            elif code_file is not None and extra_context.get('code_to_test') and ai_content:
+                # Use AI for test files with contextual information
+                if self.config.verbose:
+                    print(f"    Using AI-generated content for {filename} (contextual test generation)")
+                content = content_response.content
+            elif self.template_engine.template_exists(template_name):
+                # Use template as fallback
+                if self.config.verbose:
+                    print(f"    Using template: {template_name}")
+                context = self._create_template_context(topic, module_config, content_type, content_response, extra_context)
+                content = self.template_engine.render_template(template_name, context)
+            else:
+                if self.config.verbose:
+                    print(f"    Template {template_name} not found, using generated content")
+                content = content_response.content
+            
+            # Validate Python syntax before writing
+            file_path = module_dir / filename
+            if spec.is_python:
+                is_valid, error_msg = self._validate_python_syntax(content, filename)
+                if not is_valid:
+                    # Try to fix common issues
+                    content = self._fix_common_syntax_issues(content, filename)
+                    # Validate again after fix
+                    is_valid, error_msg = self._validate_python_syntax(content, filename)
+                    if not is_valid and self.config.verbose:
+                        print(f"⚠ Still has syntax errors after fix attempt: {error_msg}")
+            
+            # Store generated content for contextual generation of related files
+            generated_content[filename] = content
+            
+            encoded = content.encode('utf-8')
+            file_path.write_bytes(encoded)
+            
+            generated_file = GeneratedFile.model_construct(
+                path=file_path,
+                content=content,
+                file_type="python" if spec.is_python else "markdown",
+                size_bytes=len(encoded)
+            )
+            
+            if self.config.verbose:
+                print(f"    ✓ Generated {filename} ({len(content)} chars)")
+            return generated_file
+            
+        except Exception as e:
+            if self.config.verbose:
+                print(f"    ✗ Failed to generate {filename}: {e}")
+            
+            # Create minimal fallback file
+            fallback_content = f"# {filename}\n\n# Error generating content: {e}\n# TODO: Implement {filename} for {module_config.name}\n"
+            file_path = module_dir / filename
+            
+            # Validate fallback content too if it's Python
+            if spec.is_python:
+                is_valid, error_msg = self._validate_python_syntax(fallback_content, filename)
+                if not is_valid:
+                    fallback_content = f'"""\n{filename}\n\nError generating content: {e}\nTODO: Implement {filename} for {module_config.name}\n"""\n\npass\n'
+            
+            encoded = fallback_content.encode('utf-8')
+            file_path.write_bytes(encoded)
+            
+            generated_file = GeneratedFile.model_construct(
+                path=file_path,
+                content=fallback_content,
+                file_type="python" if spec.is_python else "markdown",
+                size_bytes=len(encoded)
+            )
+            return generated_file
     
     def _generate_extra_module_files(self, topic, module_config, module_dir, result):
         """Generate files for extra exercises module."""
         file_path = module_dir / "extra_exercises.md"
         content = f"# Extra Exercises: {module_config.name}\n\n# TODO: Implement extra exercises\n"
         
-        file_path.write_text(content, encoding='utf-8')
+        encoded = content.encode('utf-8')
+        file_path.write_bytes(encoded)
         
-        from .models import GeneratedFile
-        generated_file = GeneratedFile(
+        generated_file = GeneratedFile.model_construct(
             path=file_path,
             content=content,
             file_type="markdown",
-            size_bytes=len(content.encode('utf-8'))
+            size_bytes=len(encoded)
         )
         result.files.append(generated_file)
     
@@ -433,34 +681,37 @@ class LessonGenerator:
         
         for filename, content in config_files.items():
             file_path = lesson_dir / filename
-            file_path.write_text(content, encoding='utf-8')
+            encoded = content.encode('utf-8')
+            file_path.write_bytes(encoded)
             
-            from .models import GeneratedFile
-            generated_file = GeneratedFile(
+            generated_file = GeneratedFile.model_construct(
                 path=file_path,
                 content=content,
                 file_type="text",
-                size_bytes=len(content.encode('utf-8'))
+                size_bytes=len(encoded)
             )
             result.config_files.append(generated_file)
     
     def _generate_lesson_readme(self, topic) -> str:
         """Generate main README.md for the lesson."""
+        objectives = "\n".join([f"- {obj}" for obj in topic.learning_objectives])
+        prerequisites = "\n".join([f"- {prereq}" for prereq in topic.prerequisites]) if topic.prerequisites else "None"
+        modules = "\n".join([f"{i+1}. {module.name}" for i, module in enumerate(topic.modules)])
         return f"""# {topic.name}
 
 {topic.description}
 
 ## Learning Objectives
 
-{chr(10).join(f"- {obj}" for obj in topic.learning_objectives)}
+{objectives}
 
 ## Prerequisites
 
-{chr(10).join(f"- {prereq}" for prereq in topic.prerequisites) if topic.prerequisites else "None"}
+{prerequisites}
 
 ## Modules
 
-{chr(10).join(f"{i+1}. {module.name}" for i, module in enumerate(topic.modules))}
+{modules}
 
 ## Getting Started
 
@@ -477,104 +728,23 @@ This lesson should take approximately {topic.estimated_hours} hours to complete.
     
     def _generate_requirements_txt(self, topic) -> str:
         """Generate requirements.txt for the lesson."""
-        return """pytest>=7.0.0
-pytest-cov>=4.0.0
-pylint>=2.17.0
-black>=23.0.0
-"""
+        return _REQUIREMENTS_TXT
     
     def _generate_pytest_ini(self, topic) -> str:
         """Generate pytest.ini configuration."""
-        return """[tool:pytest]
-testpaths = .
-python_files = test_*.py
-python_classes = Test*
-python_functions = test_*
-addopts = --tb=short --cov=. --cov-report=term-missing
-"""
+        return _PYTEST_INI
     
     def _generate_makefile(self, topic) -> str:
         """Generate Makefile for the lesson."""
-        return """# Makefile for lesson
-
-.PHONY: test lint format clean install
-
-install:
-	pip install -r requirements.txt
-
-test:
-	pytest
-
-lint:
-	pylint **/*.py
-
-format:
-	black **/*.py
-
-clean:
-	find . -type d -name "__pycache__" -delete
-	find . -type f -name "*.pyc" -delete
-	rm -rf .pytest_cache
-	rm -rf .coverage
-"""
+        return _MAKEFILE
     
     def _generate_setup_cfg(self, topic) -> str:
         """Generate setup.cfg configuration."""
-        return """[pylint]
-disable = missing-docstring,too-few-public-methods
-
-[coverage:run]
-source = .
-omit = test_*, *_test.py
-
-[coverage:report]
-exclude_lines =
-    pragma: no cover
-    def __repr__
-    raise AssertionError
-    raise NotImplementedError
-"""
+        return _SETUP_CFG
     
     def _generate_gitignore(self, topic) -> str:
         """Generate .gitignore file."""
-        return """# Python
-__pycache__/
-*.py[cod]
-*$py.class
-*.so
-.Python
-build/
-develop-eggs/
-dist/
-downloads/
-eggs/
-.eggs/
-lib/
-lib64/
-parts/
-sdist/
-var/
-wheels/
-*.egg-info/
-.installed.cfg
-*.egg
-
-# Testing
-.pytest_cache/
-.coverage
-htmlcov/
-.tox/
-
-# IDEs
-.vscode/
-.idea/
-*.swp
-*.swo
-
-# OS
-.DS_Store
-Thumbs.db
-"""
+        return _GITIGNORE
     
     def _create_template_context(self, topic, module_config, content_type, content_response, extra_context=None):
         """Create template context for rendering."""
@@ -606,12 +776,7 @@ Thumbs.db
         # Add content-type specific context
         if content_type in ['assignment_a', 'assignment_b', 'starter_example']:
             # Create valid Python class name by removing hyphens, spaces, and other invalid characters
-            safe_topic_name = ''.join(c.title() if c.isalnum() else '' for c in topic.name)
-            # Ensure it doesn't start with a number
-            if safe_topic_name and safe_topic_name[0].isdigit():
-                safe_topic_name = 'Lesson' + safe_topic_name
-            if not safe_topic_name or not safe_topic_name.isidentifier():
-                safe_topic_name = 'Assignment'
+            safe_topic_name = _safe_topic_name(topic.name)
                 
             # Create proper descriptions based on assignment type
             if content_type == 'assignment_a':
@@ -660,11 +825,7 @@ Thumbs.db
         # Add test-specific context - need to define safe_topic_name here too
         if content_type.startswith('test_'):
             # Create valid Python class name - same logic as above
-            safe_topic_name = ''.join(c.title() if c.isalnum() else '' for c in topic.name)
-            if safe_topic_name and safe_topic_name[0].isdigit():
-                safe_topic_name = 'Lesson' + safe_topic_name
-            if not safe_topic_name or not safe_topic_name.isidentifier():
-                safe_topic_name = 'Assignment'
+            safe_topic_name = _safe_topic_name(topic.name)
                 
             test_type = content_type.replace('test_', '')
             class_name = f"{safe_topic_name}Assignment" if test_type != 'starter' else f"{safe_topic_name}Example"
@@ -691,9 +852,6 @@ Thumbs.db
     
     def _analyze_code_for_testing(self, code_content: str, content_type: str) -> dict:
         """Analyze Python code to extract information for test generation."""
-        import ast
-        import re
-        
         analysis = {
             'class_name': None,
             'instance_name': None,
@@ -703,36 +861,33 @@ Thumbs.db
         }
         
         try:
-            # Parse the Python code
-            tree = ast.parse(code_content)
-            
-            # Find classes and their methods
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    class_name = node.name
-                    analysis['class_name'] = class_name
-                    analysis['instance_name'] = class_name.lower().replace('example', '').replace('assignment', '') or 'instance'
-                    
-                    # Extract methods from the class
-                    methods = []
-                    for item in node.body:
-                        if isinstance(item, ast.FunctionDef) and not item.name.startswith('_'):
-                            method_info = {
-                                'name': f'test_{item.name}',
-                                'description': f'Test {item.name} method functionality.',
-                                'setup': f'{analysis["instance_name"]} = {class_name}()',
-                                'action': f'result = {analysis["instance_name"]}.{item.name}()',
-                                'assertions': 'assert result is not None'
-                            }
-                            methods.append(method_info)
-                    
-                    analysis['test_methods'] = methods
-                    break  # Use the first class found
+            # Find the class and its methods (parsed once and shared with the
+            # syntax check of the code file). Code without a class statement
+            # skips parsing and goes straight to the generic names below.
+            class_match = _CLASS_NAME_RE.search(code_content)
+            outline = _class_outline(code_content) if class_match else None
+            if outline is not None:
+                class_name, method_names = outline
+                analysis['class_name'] = class_name
+                analysis['instance_name'] = class_name.lower().replace('example', '').replace('assignment', '') or 'instance'
+                
+                # Describe a test for each public method of the class
+                methods = []
+                for method_name in method_names:
+                    method_info = {
+                        'name': f'test_{method_name}',
+                        'description': f'Test {method_name} method functionality.',
+                        'setup': f'{analysis["instance_name"]} = {class_name}()',
+                        'action': f'result = {analysis["instance_name"]}.{method_name}()',
+                        'assertions': 'assert result is not None'
+                    }
+                    methods.append(method_info)
+                
+                analysis['test_methods'] = methods
             
             # If no class found, create a generic test structure
             if not analysis['class_name']:
                 # Try to extract class name from code using regex as fallback
-                class_match = re.search(r'class\s+(\w+)', code_content)
                 if class_match:
                     analysis['class_name'] = class_match.group(1)
                     analysis['instance_name'] = analysis['class_name'].lower()
@@ -765,7 +920,7 @@ Thumbs.db
         
         return analysis
     
-    async def generate_lesson_async(self, topic) -> LessonGenerationResult:
+    async def generate_lesson_async(self, topic, executor: Optional[Executor] = None) -> LessonGenerationResult:
         """
         Async wrapper for lesson generation.
         
@@ -774,12 +929,31 @@ Thumbs.db
         
         Args:
             topic: TopicConfig object or topic name/slug
+            executor: Executor to run on, defaulting to the loop's thread pool.
+                With a ProcessPoolExecutor the lesson is generated by a
+                generator living in the worker process, built from this
+                generator's configuration.
             
         Returns:
             LessonGenerationResult with generation details
         """
         import asyncio
         
-        # Run the synchronous method in a thread pool
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.generate_lesson, topic)
\ No newline at end of file
+        if isinstance(executor, ProcessPoolExecutor):
+            return await loop.run_in_executor(executor, _generate_lesson_in_process, self.config, topic)
+        
+        # Run the synchronous method in a thread pool
+        return await loop.run_in_executor(executor, self.generate_lesson, topic)
+
+
+# Generator reused by all lessons a process pool worker generates
+_process_generator: Optional[LessonGenerator] = None
+
+
+def _generate_lesson_in_process(config: GenerationConfig, topic: TopicConfig) -> LessonGenerationResult:
+    """Process pool entry point: generate a lesson with this worker's generator."""
+    global _process_generator
+    if _process_generator is None or _process_generator.config != config:
+        _process_generator = LessonGenerator(config)
+    return _process_generator.generate_lesson(topic)
\ No newline at end of file
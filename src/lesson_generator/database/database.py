@@ -8,7 +8,7 @@ and database initialization for the Lesson Generator.
 import os
 from typing import AsyncGenerator
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -28,10 +28,34 @@ SQLITE_CONFIG = {
     },
 }
 
+# Applied to every new SQLite connection. WAL lets readers proceed during
+# writes and, with synchronous=NORMAL, avoids an fsync on every commit; the
+# larger page cache (64 MB) and memory-mapped I/O keep hot pages resident.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Configure a new SQLite connection (sync or aiosqlite) for write-heavy use."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
 # Create engines
 if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(DATABASE_URL, **SQLITE_CONFIG)
     async_engine = create_async_engine(ASYNC_DATABASE_URL, **SQLITE_CONFIG)
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
 else:
     # For PostgreSQL and other databases
     engine = create_engine(DATABASE_URL)
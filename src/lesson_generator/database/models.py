@@ -5,21 +5,90 @@ This module defines SQLAlchemy models for storing lesson data, files,
 and generation progress in a relational database.
 """
 
+import gzip
 import json
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
 from sqlalchemy import (
     Column, String, Integer, Float, Text, DateTime, 
-    LargeBinary, ForeignKey, JSON, text
+    LargeBinary, ForeignKey, Index, JSON, text
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 Base = declarative_base()
 
 
+# Frame magic number at the start of every zstd-compressed body; gzip bodies
+# start with 1f 8b, so stored content identifies its own codec
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_GZIP_MAGIC = b'\x1f\x8b'
+_ZSTD_LEVEL = 3
+
+# Serialized JSON values at least this large are stored compressed
+JSON_COMPRESS_MIN_BYTES = 512
+
+
+def _compress(data: bytes) -> bytes:
+    """Compress a stored body with zstd when available, otherwise gzip."""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+    return gzip.compress(data)
+
+
+def _decompress(data: bytes) -> bytes:
+    """Decompress a stored body, returning it as-is if it is not compressed."""
+    if data[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError("Stored content is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    try:
+        return gzip.decompress(data)
+    except gzip.BadGzipFile:
+        # File wasn't compressed, return as-is
+        return data
+
+
+class CompressedJSON(TypeDecorator):
+    """
+    JSON value stored as a compact blob on SQLite, compressed once it is large.
+    
+    SQLite does not enforce column types, so JSON text written while the
+    column was a plain ``JSON`` column sits next to the blobs and is still
+    read; existing SQLite databases need no migration. Other databases keep
+    their native ``JSON`` column, which would reject bytes.
+    """
+    
+    impl = JSON
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(LargeBinary())
+        return dialect.type_descriptor(JSON())
+    
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        data = json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        return _compress(data) if len(data) >= JSON_COMPRESS_MIN_BYTES else data
+    
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        if isinstance(value, str):
+            return json.loads(value)
+        return json.loads(_decompress(bytes(value)))
+
+
 class Lesson(Base):
     """
     Main lesson record containing metadata and generation status.
@@ -51,7 +120,7 @@ class Lesson(Base):
     error_message = Column(Text)
     
     # Generation metadata
-    generation_config = Column(JSON)  # Serialized GenerationConfig
+    generation_config = Column(CompressedJSON)  # Serialized GenerationConfig
     ai_model = Column(String(50))
     
     # File statistics
@@ -93,6 +162,10 @@ class LessonFile(Base):
     """
     
     __tablename__ = "lesson_files"
+    __table_args__ = (
+        # Serves the per-lesson file listing in path order without a sort
+        Index("ix_files_lesson_path", "lesson_id", "file_path"),
+    )
     
     # Primary key
     file_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -101,7 +174,7 @@ class LessonFile(Base):
     lesson_id = Column(String(50), ForeignKey("lessons.lesson_id", ondelete="CASCADE"), nullable=False, index=True)
     
     # File metadata
-    file_path = Column(String(500), nullable=False, index=True)  # Relative path within lesson
+    file_path = Column(String(500), nullable=False)  # Relative path within lesson
     file_name = Column(String(255), nullable=False, index=True)
     file_type = Column(String(50), nullable=False, index=True)  # py, md, txt, etc.
     content_type = Column(String(100))  # MIME type
@@ -116,9 +189,9 @@ class LessonFile(Base):
     # Relationships
     lesson = relationship("Lesson", back_populates="files")
     
-    def to_dict(self, include_content: bool = False) -> Dict[str, Any]:
-        """Convert file to dictionary for API responses."""
-        result = {
+    def to_metadata_dict(self) -> Dict[str, Any]:
+        """Convert file metadata (without the content) to a dictionary for API responses."""
+        return {
             "file_id": self.file_id,
             "lesson_id": self.lesson_id,
             "file_path": self.file_path,
@@ -128,6 +201,15 @@ class LessonFile(Base):
             "file_size": self.file_size,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
+    
+    def to_dict(self, include_content: bool = False) -> Dict[str, Any]:
+        """
+        Convert file to dictionary for API responses.
+        
+        Embedding the content copies the whole blob (twice for base64); large
+        files should be served with ``FileRepository.stream_file_content``.
+        """
+        result = self.to_metadata_dict()
         
         if include_content and self.file_content:
             # Decode binary content to string (assuming UTF-8 text files)
@@ -151,6 +233,10 @@ class GenerationProgress(Base):
     """
     
     __tablename__ = "generation_progress"
+    __table_args__ = (
+        # Serves the per-lesson progress listing in start order without a sort
+        Index("ix_progress_lesson_started", "lesson_id", "started_at"),
+    )
     
     # Primary key
     progress_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -171,7 +257,7 @@ class GenerationProgress(Base):
     error_message = Column(Text)
     
     # Additional metadata
-    step_metadata = Column(JSON)  # Additional step-specific data
+    step_metadata = Column(CompressedJSON)  # Additional step-specific data
     
     # Relationships
     lesson = relationship("Lesson", back_populates="progress_entries")
@@ -6,15 +6,48 @@ and progress tracking with a clean interface for the web API.
 """
 
 import gzip
+import io
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Integer, Row, case, cast, desc, and_, func, insert, select, update
 
-from .models import Lesson, LessonFile, GenerationProgress
+from .models import (
+    Lesson, LessonFile, GenerationProgress,
+    zstandard, _ZSTD_MAGIC, _GZIP_MAGIC, _compress, _decompress
+)
+
+
+# MIME types of known file extensions; anything else is stored as binary
+_CONTENT_TYPES = {
+    'py': 'text/x-python',
+    'md': 'text/markdown',
+    'txt': 'text/plain',
+    'json': 'application/json',
+    'yml': 'text/yaml',
+    'yaml': 'text/yaml',
+}
+
+# Text file extensions whose content is stored compressed
+_COMPRESSIBLE_TYPES = frozenset(_CONTENT_TYPES)
+
+# Size of the chunks file content is streamed in
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _classify(file_path: str) -> Tuple[str, str, str, bool]:
+    """Get the name, type, MIME type and compressibility of a lesson file path."""
+    path_obj = Path(file_path)
+    file_type = path_obj.suffix.lstrip('.')
+    return (
+        path_obj.name,
+        file_type,
+        _CONTENT_TYPES.get(file_type, 'application/octet-stream'),
+        file_type in _COMPRESSIBLE_TYPES,
+    )
 
 
 class LessonRepository:
@@ -30,26 +63,52 @@ class LessonRepository:
         generation_config: Optional[Dict[str, Any]] = None,
         ai_model: Optional[str] = None,
     ) -> Lesson:
-        """Create a new lesson record."""
+        """
+        Create a new lesson record.
+        
+        The timestamps are read back with RETURNING in the INSERT itself, so
+        the returned lesson is built from known values rather than refreshed.
+        It is not attached to the session.
+        """
         
-        lesson = Lesson(
+        values = dict(
             lesson_id=lesson_id,
             status="pending",
             topics=topics,
             total_topics=len(topics),
+            progress_percentage=0.0,
+            topics_completed=0,
             generation_config=generation_config,
             ai_model=ai_model,
+            total_files=0,
+            total_size=0,
         )
         
-        self.db.add(lesson)
+        row = self.db.execute(
+            insert(Lesson).values(**values).returning(Lesson.created_at, Lesson.updated_at)
+        ).one()
         self.db.commit()
-        self.db.refresh(lesson)
         
-        return lesson
+        return Lesson(**values, created_at=row.created_at, updated_at=row.updated_at)
     
-    def get_lesson(self, lesson_id: str) -> Optional[Lesson]:
-        """Get a lesson by ID."""
-        return self.db.query(Lesson).filter(Lesson.lesson_id == lesson_id).first()
+    def get_lesson(
+        self,
+        lesson_id: str,
+        load_files: bool = False,
+        load_progress: bool = False,
+    ) -> Optional[Lesson]:
+        """
+        Get a lesson by ID.
+        
+        Relationships the caller is going to iterate can be loaded up front
+        with one extra SELECT each instead of lazily on first access.
+        """
+        query = self.db.query(Lesson)
+        if load_files:
+            query = query.options(selectinload(Lesson.files))
+        if load_progress:
+            query = query.options(selectinload(Lesson.progress_entries))
+        return query.filter(Lesson.lesson_id == lesson_id).first()
     
     def update_lesson_status(
         self,
@@ -60,37 +119,49 @@ class LessonRepository:
         topics_completed: Optional[int] = None,
         error_message: Optional[str] = None,
     ) -> bool:
-        """Update lesson status and progress."""
+        """
+        Update lesson status and progress.
         
-        lesson = self.get_lesson(lesson_id)
-        if not lesson:
-            return False
+        Issues a single UPDATE without loading the lesson first; returns
+        False if no lesson matched.
+        """
         
-        lesson.status = status
-        lesson.updated_at = datetime.now()
+        values = dict(status=status, updated_at=func.now())
         
         if progress_percentage is not None:
-            lesson.progress_percentage = progress_percentage
+            values["progress_percentage"] = progress_percentage
         
         if current_step is not None:
-            lesson.current_step = current_step
+            values["current_step"] = current_step
         
         if topics_completed is not None:
-            lesson.topics_completed = topics_completed
+            values["topics_completed"] = topics_completed
         
         if error_message is not None:
-            lesson.error_message = error_message
+            values["error_message"] = error_message
         
+        result = self.db.execute(
+            update(Lesson)
+            .where(Lesson.lesson_id == lesson_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
         self.db.commit()
-        return True
+        return result.rowcount > 0
     
     def list_lessons(
         self,
         status: Optional[str] = None,
         limit: int = 50,
         offset: int = 0,
+        load_files: bool = False,
     ) -> Tuple[List[Lesson], int]:
-        """List lessons with optional filtering and pagination."""
+        """
+        List lessons with optional filtering and pagination.
+        
+        Pass ``load_files`` when the files of each lesson are going to be
+        accessed, so they are fetched in one query for the whole page.
+        """
         
         query = self.db.query(Lesson)
         
@@ -100,6 +171,9 @@ class LessonRepository:
         # Get total count for pagination
         total_count = query.count()
         
+        if load_files:
+            query = query.options(selectinload(Lesson.files))
+        
         # Apply pagination and ordering
         lessons = (
             query.order_by(desc(Lesson.created_at))
@@ -110,6 +184,39 @@ class LessonRepository:
         
         return lessons, total_count
     
+    def list_lesson_statuses(
+        self,
+        status: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[Row]:
+        """
+        List the status fields of lessons, newest first.
+        
+        Only the columns a status listing shows are selected, so no ORM objects
+        are built and the stored generation config is never decoded. Rows
+        expose the same attribute names as ``Lesson``.
+        """
+        
+        query = select(
+            Lesson.lesson_id,
+            Lesson.status,
+            Lesson.created_at,
+            Lesson.updated_at,
+            Lesson.topics,
+            Lesson.progress_percentage,
+            Lesson.current_step,
+            Lesson.topics_completed,
+            Lesson.total_topics,
+            Lesson.error_message,
+        )
+        
+        if status:
+            query = query.where(Lesson.status == status)
+        
+        query = query.order_by(desc(Lesson.created_at)).offset(offset).limit(limit)
+        return list(self.db.execute(query))
+    
     def delete_lesson(self, lesson_id: str) -> bool:
         """Delete a lesson and all associated data."""
         
@@ -125,33 +232,48 @@ class LessonRepository:
     def update_file_statistics(self, lesson_id: str) -> bool:
         """Update file count and total size for a lesson."""
         
-        lesson = self.get_lesson(lesson_id)
-        if not lesson:
-            return False
-        
-        # Calculate statistics from associated files
-        file_stats = (
-            self.db.query(
-                func.count(LessonFile.file_id).label('total_files'),
-                func.sum(LessonFile.file_size).label('total_size')
+        # Calculate statistics from associated files in the same statement,
+        # without loading the lesson; the commit expires any loaded copy
+        file_stats = select(LessonFile).where(LessonFile.lesson_id == lesson_id)
+        result = self.db.execute(
+            update(Lesson)
+            .where(Lesson.lesson_id == lesson_id)
+            .values(
+                total_files=file_stats.with_only_columns(func.count(LessonFile.file_id)).scalar_subquery(),
+                total_size=file_stats.with_only_columns(
+                    func.coalesce(func.sum(LessonFile.file_size), 0)
+                ).scalar_subquery(),
             )
-            .filter(LessonFile.lesson_id == lesson_id)
-            .first()
+            .execution_options(synchronize_session=False)
         )
         
-        lesson.total_files = file_stats.total_files or 0
-        lesson.total_size = file_stats.total_size or 0
-        
         self.db.commit()
-        return True
+        return result.rowcount > 0
 
 
 class FileRepository:
-    """Repository for lesson file operations."""
+    """
+    Repository for lesson file operations.
+    
+    The ``total_files``/``total_size`` counters of the owning lesson are kept
+    up to date in the same transaction as every file write.
+    """
     
     def __init__(self, db: Session):
         self.db = db
     
+    def _add_to_statistics(self, lesson_id: str, file_count: int, total_size: int) -> None:
+        """Bump the lesson's file counters without loading or aggregating anything."""
+        self.db.execute(
+            update(Lesson)
+            .where(Lesson.lesson_id == lesson_id)
+            .values(
+                total_files=func.coalesce(Lesson.total_files, 0) + file_count,
+                total_size=func.coalesce(Lesson.total_size, 0) + total_size,
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
     def store_file(
         self,
         lesson_id: str,
@@ -159,28 +281,21 @@ class FileRepository:
         file_content: bytes,
         compress: bool = True,
     ) -> LessonFile:
-        """Store a file in the database."""
+        """
+        Store a file in the database.
+        
+        Like ``LessonRepository.create_lesson``, the generated ID and timestamp
+        come back via RETURNING and the returned record is not attached to
+        the session.
+        """
         
-        path_obj = Path(file_path)
-        file_name = path_obj.name
-        file_type = path_obj.suffix.lstrip('.')
+        file_name, file_type, content_type, compressible = _classify(file_path)
         
         # Compress content if requested (for text files)
-        if compress and file_type in ['py', 'md', 'txt', 'json', 'yml', 'yaml']:
-            file_content = gzip.compress(file_content)
-        
-        # Determine content type
-        content_type_map = {
-            'py': 'text/x-python',
-            'md': 'text/markdown',
-            'txt': 'text/plain',
-            'json': 'application/json',
-            'yml': 'text/yaml',
-            'yaml': 'text/yaml',
-        }
-        content_type = content_type_map.get(file_type, 'application/octet-stream')
-        
-        lesson_file = LessonFile(
+        if compress and compressible:
+            file_content = _compress(file_content)
+        
+        values = dict(
             lesson_id=lesson_id,
             file_path=file_path,
             file_name=file_name,
@@ -190,11 +305,13 @@ class FileRepository:
             file_content=file_content,
         )
         
-        self.db.add(lesson_file)
+        row = self.db.execute(
+            insert(LessonFile).values(**values).returning(LessonFile.file_id, LessonFile.created_at)
+        ).one()
+        self._add_to_statistics(lesson_id, 1, len(file_content))
         self.db.commit()
-        self.db.refresh(lesson_file)
         
-        return lesson_file
+        return LessonFile(**values, file_id=row.file_id, created_at=row.created_at)
     
     def get_file(self, file_id: int) -> Optional[LessonFile]:
         """Get a file by ID."""
@@ -216,18 +333,56 @@ class FileRepository:
         if not file_record:
             return None
         
+        return self.read_file_content(file_record, decompress)
+    
+    @staticmethod
+    def read_file_content(file_record: LessonFile, decompress: bool = True) -> bytes:
+        """
+        Get the content of an already loaded file record.
+        
+        Use this when iterating over ``get_lesson_files`` results instead of
+        ``get_file_content``, which queries each file again by ID.
+        """
         content = file_record.file_content
         
         # Decompress if it's a compressed text file
-        if decompress and file_record.file_type in ['py', 'md', 'txt', 'json', 'yml', 'yaml']:
-            try:
-                content = gzip.decompress(content)
-            except gzip.BadGzipFile:
-                # File wasn't compressed, return as-is
-                pass
+        if decompress and file_record.file_type in _COMPRESSIBLE_TYPES:
+            content = _decompress(content)
         
         return content
     
+    @staticmethod
+    def stream_file_content(file_record: LessonFile, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yield the decompressed content of a loaded file record in chunks.
+        
+        Unlike ``read_file_content`` the decompressed file is never held in
+        memory as a whole, and uncompressed content is yielded as zero-copy
+        ``memoryview`` slices of the stored blob.
+        """
+        content = file_record.file_content
+        
+        if file_record.file_type in _COMPRESSIBLE_TYPES:
+            if content[:4] == _ZSTD_MAGIC:
+                if zstandard is None:
+                    raise ValueError("Stored content is zstd-compressed but zstandard is not installed")
+                reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(content))
+            elif content[:2] == _GZIP_MAGIC:
+                reader = gzip.GzipFile(fileobj=io.BytesIO(content))
+            else:
+                reader = None
+            
+            if reader is not None:
+                with reader:
+                    for chunk in iter(lambda: reader.read(chunk_size), b''):
+                        yield chunk
+                return
+        
+        # File wasn't compressed, serve the stored bytes as they are
+        view = memoryview(content)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+    
     def delete_lesson_files(self, lesson_id: str) -> int:
         """Delete all files for a lesson."""
         
@@ -237,6 +392,12 @@ class FileRepository:
             .delete()
         )
         
+        self.db.execute(
+            update(Lesson)
+            .where(Lesson.lesson_id == lesson_id)
+            .values(total_files=0, total_size=0)
+            .execution_options(synchronize_session=False)
+        )
         self.db.commit()
         return deleted_count
     
@@ -246,46 +407,56 @@ class FileRepository:
         files: List[Tuple[str, bytes]],
         compress: bool = True,
     ) -> List[LessonFile]:
-        """Store multiple files efficiently."""
+        """
+        Store multiple files efficiently.
         
-        lesson_files = []
+        Rows go through a single Core INSERT (one executemany) rather than ORM
+        objects, so nothing is added to the session's identity map. As in
+        ``store_file``, IDs and timestamps come back via RETURNING and the
+        returned records are not attached to the session.
+        
+        Returns:
+            The stored files, in input order
+        """
+        
+        rows = []
+        total_size = 0
         
         for file_path, file_content in files:
-            path_obj = Path(file_path)
-            file_name = path_obj.name
-            file_type = path_obj.suffix.lstrip('.')
+            file_name, file_type, content_type, compressible = _classify(file_path)
             
             # Compress content if requested
-            if compress and file_type in ['py', 'md', 'txt', 'json', 'yml', 'yaml']:
-                file_content = gzip.compress(file_content)
-            
-            content_type_map = {
-                'py': 'text/x-python',
-                'md': 'text/markdown',
-                'txt': 'text/plain',
-                'json': 'application/json',
-                'yml': 'text/yaml',
-                'yaml': 'text/yaml',
-            }
-            content_type = content_type_map.get(file_type, 'application/octet-stream')
+            if compress and compressible:
+                file_content = _compress(file_content)
             
-            lesson_file = LessonFile(
-                lesson_id=lesson_id,
-                file_path=file_path,
-                file_name=file_name,
-                file_type=file_type,
-                content_type=content_type,
-                file_size=len(file_content),
-                file_content=file_content,
-            )
-            
-            lesson_files.append(lesson_file)
+            rows.append({
+                'lesson_id': lesson_id,
+                'file_path': file_path,
+                'file_name': file_name,
+                'file_type': file_type,
+                'content_type': content_type,
+                'file_size': len(file_content),
+                'file_content': file_content,
+            })
+            total_size += len(file_content)
+        
+        if not rows:
+            return []
         
         # Bulk insert
-        self.db.add_all(lesson_files)
+        result = self.db.execute(
+            insert(LessonFile).returning(
+                LessonFile.file_id, LessonFile.created_at, sort_by_parameter_order=True
+            ),
+            rows,
+        ).all()
+        self._add_to_statistics(lesson_id, len(rows), total_size)
         self.db.commit()
         
-        return lesson_files
+        return [
+            LessonFile(**values, file_id=row.file_id, created_at=row.created_at)
+            for values, row in zip(rows, result)
+        ]
 
 
 class ProgressRepository:
@@ -376,20 +547,37 @@ class ProgressRepository:
         )
     
     def get_progress_summary(self, lesson_id: str) -> Dict[str, Any]:
-        """Get a summary of progress for a lesson."""
-        
-        progress_entries = self.get_lesson_progress(lesson_id)
-        
-        total_steps = len(progress_entries)
-        completed_steps = sum(1 for p in progress_entries if p.status == "completed")
-        failed_steps = sum(1 for p in progress_entries if p.status == "failed")
-        in_progress_steps = sum(1 for p in progress_entries if p.status == "started")
-        
-        # Calculate total duration for completed steps
-        total_duration = 0
-        for progress in progress_entries:
-            if progress.duration_seconds:
-                total_duration += progress.duration_seconds
+        """Get a summary of progress for a lesson, aggregated in a single query."""
+        
+        if self.db.get_bind().dialect.name == "sqlite":
+            # SQLite has no interval type. Sum exact integer microseconds: whole
+            # seconds from strftime('%s') plus the stored .ffffff suffix.
+            def microseconds(column):
+                return (cast(func.strftime("%s", column), Integer) * 1000000
+                        + cast(func.substr(column, 21), Integer))
+            
+            duration = (microseconds(GenerationProgress.completed_at)
+                        - microseconds(GenerationProgress.started_at))
+            units_per_second = 1000000
+        else:
+            duration = func.extract("epoch", GenerationProgress.completed_at - GenerationProgress.started_at)
+            units_per_second = 1
+        
+        def count_status(status: str):
+            return func.coalesce(func.sum(case((GenerationProgress.status == status, 1), else_=0)), 0)
+        
+        totals = self.db.execute(
+            select(
+                func.count(GenerationProgress.progress_id),
+                count_status("completed"),
+                count_status("failed"),
+                count_status("started"),
+                # Steps without both timestamps have a NULL duration, which SUM skips
+                func.coalesce(func.sum(duration), 0),
+            ).where(GenerationProgress.lesson_id == lesson_id)
+        ).one()
+        total_steps, completed_steps, failed_steps, in_progress_steps, total_duration = totals
+        total_duration = float(total_duration) / units_per_second
         
         return {
             "lesson_id": lesson_id,
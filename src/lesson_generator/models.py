@@ -130,15 +130,21 @@ class GenerationConfig(BaseModel):
     use_ai: bool = True
     strict_ai: bool = True
     workers: int = Field(default=1, ge=1, le=8)
+    max_parallel_modules: int = Field(default=4, ge=1, le=16)
     custom_templates_dir: Optional[Path] = None
     reference_lesson_dir: Optional[Path] = None
     enable_cache: bool = True
+    cache_dir: Optional[Path] = None  # Keeps caches across runs; None caches in memory only
+    bundle_module_requests: bool = True
+    memory_cache_entries: int = Field(default=2048, ge=0)
     verbose: bool = False
     openai_api_key: Optional[str] = None
     openai_model: str = "gpt-4"
     openai_organization: Optional[str] = None
     request_timeout: int = 30
     rate_limit_delay: float = 1.0
+    requests_per_minute: Optional[int] = Field(default=None, ge=1)
+    tokens_per_minute: Optional[int] = Field(default=None, ge=1)
     
     class Config:
         """Pydantic configuration."""
@@ -183,6 +189,12 @@ class GenerationConfig(BaseModel):
         return v.resolve()
 
 
+# The result models below have no validators of their own. The generator and
+# quality checks build them from values they produced themselves, using
+# model_construct to skip validation. Data from outside (configuration files,
+# CLI options, cached results) still goes through normal validation.
+
+
 class GeneratedFile(BaseModel):
     """Represents a generated file."""
     
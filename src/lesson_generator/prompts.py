@@ -0,0 +1,501 @@
+"""
+Prompt and fallback templates module.
+
+This module holds the text sent to OpenAI (system prompts and per-content-type
+prompt templates) and the templates used to write lesson files when AI
+generation is unavailable. Templates are ``string.Template`` objects built once
+(at import, or on first use for the fallback Python files) and filled in by
+``ContentGenerator``.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+
+
+# Prompt templates per content type, formatted with the context built in
+# ContentGenerator._create_prompt. Instructions only refer to the lesson context
+# and the context itself comes last, so every request of a content type shares
+# the same prompt prefix and can hit OpenAI's server-side prompt cache.
+BASE_CONTEXT_TEMPLATE = Template("""
+LESSON CONTEXT:
+Topic: ${topic_name}
+Difficulty: ${difficulty}
+Module: ${module_name}
+Module Type: ${module_type}
+Focus Areas: ${focus_areas}
+Learning Objectives: ${learning_objectives}
+""")
+
+PROMPT_TEMPLATES = {
+    "learning_path": Template("""
+Create a comprehensive learning path guide for the module described in the lesson context below.
+
+Generate a detailed markdown guide with COMPLETE content including:
+
+## 🎯 Learning Objectives
+List 4-5 specific, measurable learning objectives for the module's focus areas in the topic
+
+## 📚 Introduction  
+2-3 paragraph introduction explaining what the topic is and why it's important
+
+## 🔑 Key Concepts
+Detailed explanation of 3-4 key concepts students will learn:
+- Concept 1: Definition and examples
+- Concept 2: Definition and examples  
+- Concept 3: Definition and examples
+
+Include practical examples relevant to the topic for students at the given difficulty level.
+
+## 🛠️ Step-by-Step Learning Path
+
+Follow this exact sequence for optimal learning:
+
+### 📝 **Step 1: Study the Starter Example**
+**File to work with**: `starter_example.py`
+
+**ACTION ITEMS**:
+1. **Open and read** `starter_example.py` carefully
+2. **Run the code** to see the concepts in action:
+   ```bash
+   python starter_example.py
+   ```
+3. **Understand the implementation** - examine how each method demonstrates the focus area concepts
+4. **Review the comments** and docstrings to understand the design decisions
+
+### 🧪 **Step 2: Understand the Tests**
+**File to work with**: `test_starter_example.py`
+
+**ACTION ITEMS**:
+1. **Read through** `test_starter_example.py` to understand testing approaches
+2. **Run the tests** to see how the starter example is validated:
+   ```bash
+   python -m pytest test_starter_example.py -v
+   ```
+3. **Analyze test patterns** - notice how different scenarios are tested
+4. **Understand test structure** - observe setup, execution, and assertion patterns
+
+### 📝 **Step 3: Write Tests for Assignment A**
+**Files to work with**: `assignment_a.py` → `test_assignment_a.py`
+
+**OBJECTIVE**: Practice test-driven learning by writing comprehensive tests
+
+**ACTION ITEMS**:
+1. **Study the code** in `assignment_a.py` thoroughly
+2. **Analyze the class structure** and method signatures
+3. **Write comprehensive tests** in `test_assignment_a.py` to achieve 100% coverage
+4. **Test edge cases** and error conditions
+5. **Run your tests** to verify they work:
+   ```bash
+   python -m pytest test_assignment_a.py -v
+   ```
+
+### 🚀 **Step 4: Implement Assignment B**
+**Files to work with**: `test_assignment_b.py` → `assignment_b.py`
+
+**OBJECTIVE**: Practice implementation by making tests pass
+
+**ACTION ITEMS**:
+1. **Study the test requirements** in `test_assignment_b.py`
+2. **Understand what needs to be implemented** by reading test expectations
+3. **Implement the methods** in `assignment_b.py` to make tests pass
+4. **Run tests iteratively** to check progress:
+   ```bash
+   python -m pytest test_assignment_b.py -v
+   ```
+5. **Refine your implementation** until all tests pass
+
+### 🎯 **Step 5: Extra Practice**
+**File to work with**: `extra_exercises.md`
+
+**ACTION ITEMS**:
+1. **Complete the additional exercises** for deeper understanding
+2. **Apply concepts** to new scenarios
+3. **Challenge yourself** with advanced variations
+
+## ✅ Success Criteria & Estimated Time
+- [ ] Successfully ran and understood `starter_example.py`
+- [ ] Comprehended test patterns in `test_starter_example.py`
+- [ ] Achieved 100% test coverage for `assignment_a.py`
+- [ ] Made all tests pass in `test_assignment_b.py`
+- [ ] Completed extra exercises
+
+End with an **Estimated Time** line giving the estimated minutes from the lesson context.
+
+Make it engaging and practical with real examples, not placeholders.
+${base_context}Estimated Time: ${estimated_minutes} minutes
+"""),
+    
+    "starter_example": Template("""
+Create a Python code example for this module.
+
+Generate ONLY executable Python code (no markdown formatting) with:
+1. A complete Python class demonstrating the focus areas
+2. Clear docstrings explaining the purpose
+3. Well-commented methods with practical examples
+4. Appropriate complexity for the difficulty level
+5. Error handling where relevant
+6. Example usage at the end
+
+Return only valid Python code that can be executed directly.
+${base_context}"""),
+    
+    "assignment_a": Template("""
+Create Python code that students will write tests for.
+
+Generate ONLY executable Python code (no markdown formatting) with:
+1. A Python class demonstrating the focus areas
+2. Multiple methods of varying complexity for the difficulty level
+3. Clear docstrings with parameters and return values
+4. Some edge cases and error conditions to test
+5. Methods that require comprehensive testing
+
+Return only valid Python code that students can write tests for.
+${base_context}"""),
+    
+    "assignment_b": Template("""
+Create a Python class template with method signatures and docstrings.
+
+Generate ONLY executable Python code (no markdown formatting) with:
+1. A Python class focused on the focus areas
+2. Method signatures only with 'pass' or 'raise NotImplementedError()'
+3. Detailed docstrings explaining what each method should do
+4. Parameter descriptions and return value specifications
+5. Appropriate complexity for the difficulty level
+
+Students will implement these methods to make tests pass.
+Return only valid Python code template.
+${base_context}"""),
+    
+    "extra_exercises": Template("""
+Create 3 specific practice exercises for the module described in the lesson context below, focusing on its focus areas.
+
+Generate a markdown document with COMPLETE, SPECIFIC exercises:
+
+## Exercise 1: Basic Practice (name it after the topic in the lesson context)
+**Difficulty**: Beginner  
+Create a specific coding challenge that practices the Exercise 1 focus from the lesson context.
+Include:
+- Exact problem description with specific requirements
+- Example input/output 
+- Step-by-step solution approach
+- Code template to get started
+
+## Exercise 2: Intermediate Challenge  
+**Difficulty**: Intermediate
+Design a more complex problem involving the Exercise 2 focus from the lesson context.
+Include specific requirements, constraints, and expected behavior.
+
+## Exercise 3: Real-World Application
+**Difficulty**: Advanced
+Create a practical project that applies the topic to solve a real problem.
+Provide specific requirements and deliverables.
+
+NO placeholders - provide complete, actionable exercises.
+${base_context}Exercise 1 focus: ${primary_focus}
+Exercise 2 focus: ${first_two_focus}
+"""),
+    
+    "test_starter": Template("""
+Create comprehensive pytest test cases for the starter example.
+Generate ONLY executable Python test code (no markdown formatting) with:
+1. Import statements: `import pytest` and `from starter_example import ClassName` (use the actual class name from the code below)
+2. Test class that follows pytest conventions
+3. Comprehensive test methods covering:
+   - Normal functionality  
+   - Edge cases
+   - Error conditions
+   - Method interactions
+4. Use clear, descriptive test method names
+5. Include docstrings explaining what each test verifies
+6. Use appropriate pytest features (fixtures, parametrize, etc.)
+
+CRITICAL SYNTAX REQUIREMENTS:
+- ALL strings must be properly quoted with matching quotes
+- ALL parentheses, brackets, and braces must be balanced
+- ALL indentation must use 4 spaces consistently
+- Import from the filename 'starter_example', not from any module name
+- Example: `from starter_example import ActualClassName`
+
+Analyze the actual code structure and create tests that match the real class names and methods.
+Return only valid, syntax-error-free Python test code.
+${base_context}${code_to_test_section}"""),
+    
+    "test_assignment_a": Template("""
+Create comprehensive pytest test cases for assignment A.
+Generate ONLY executable Python test code (no markdown formatting) with:
+1. Import statements: `import pytest` and `from assignment_a import ClassName` (use the actual class name from the code below)
+2. Test class following pytest conventions  
+3. Comprehensive test methods that achieve high coverage:
+   - All public methods tested
+   - Normal cases and edge cases
+   - Error conditions and exception handling
+   - Boundary conditions
+4. Use descriptive test method names
+5. Include setup and teardown if needed
+6. Use pytest features appropriately
+
+CRITICAL SYNTAX REQUIREMENTS:
+- ALL strings must be properly quoted with matching quotes
+- ALL parentheses, brackets, and braces must be balanced
+- ALL indentation must use 4 spaces consistently
+- Import from the filename 'assignment_a', not from any module name
+- Example: `from assignment_a import ActualClassName`
+
+Analyze the actual code structure and create tests that match the real class names and methods.
+Return only valid, syntax-error-free Python test code that students can run to verify their understanding.
+${base_context}${code_to_test_section}"""),
+    
+    "test_assignment_b": Template("""
+Create pytest test cases that assignment B code must pass.
+Generate ONLY executable Python test code (no markdown formatting) with:
+1. Import statements: `import pytest` and `from assignment_b import ClassName` (use the actual class name from the code below)
+2. Test class following pytest conventions
+3. Test methods that verify the implementation requirements:
+   - Test method signatures and return types
+   - Test expected behavior and outputs
+   - Test edge cases and error handling
+   - Test method interactions
+4. Use clear, descriptive test names
+5. Include helpful assertions with descriptive messages
+
+CRITICAL SYNTAX REQUIREMENTS:
+- ALL strings must be properly quoted with matching quotes
+- ALL parentheses, brackets, and braces must be balanced
+- ALL indentation must use 4 spaces consistently
+- Import from the filename 'assignment_b', not from any module name
+- Example: `from assignment_b import ActualClassName`
+
+Analyze the actual code structure and create tests that the student implementation must pass.
+Return only valid, syntax-error-free Python test code.
+${base_context}${code_to_test_section}"""),
+}
+
+DEFAULT_PROMPT_TEMPLATE = Template("Generate ${content_type} content for ${module_name}")
+
+# Estimated lesson time in minutes by difficulty (anything else: 120)
+ESTIMATED_MINUTES = {"beginner": 60, "intermediate": 90, "advanced": 120}
+
+# Learning path written when AI generation is unavailable
+LEARNING_PATH_FALLBACK_TEMPLATE = Template("""# ${module_name} - Learning Path
+
+## 🎯 Learning Objectives
+
+By the end of this module, you will understand:
+${objectives}
+
+## 🔑 Key Concepts
+
+${key_concepts}
+
+## �️ Step-by-Step Learning Path
+
+Follow this exact sequence for optimal learning:
+
+### 📝 **Step 1: Study the Starter Example**
+**File to work with**: `starter_example.py`
+
+**ACTION ITEMS**:
+1. **Open and read** `starter_example.py` carefully
+2. **Run the code** to see the concepts in action:
+   ```bash
+   python starter_example.py
+   ```
+3. **Understand the implementation** - examine how each method demonstrates ${focus_areas} concepts
+4. **Review the comments** and docstrings to understand the design decisions
+
+### 🧪 **Step 2: Understand the Tests**
+**File to work with**: `test_starter_example.py`
+
+**ACTION ITEMS**:
+1. **Read through** `test_starter_example.py` to understand testing approaches
+2. **Run the tests** to see how the starter example is validated:
+   ```bash
+   python -m pytest test_starter_example.py -v
+   ```
+3. **Analyze test patterns** - notice how different scenarios are tested
+4. **Understand test structure** - observe setup, execution, and assertion patterns
+
+### 📝 **Step 3: Write Tests for Assignment A**
+**Files to work with**: `assignment_a.py` → `test_assignment_a.py`
+
+**OBJECTIVE**: Practice test-driven learning by writing comprehensive tests
+
+**ACTION ITEMS**:
+1. **Study the code** in `assignment_a.py` thoroughly
+2. **Analyze the class structure** and method signatures
+3. **Write comprehensive tests** in `test_assignment_a.py` to achieve 100% coverage
+4. **Test edge cases** and error conditions
+5. **Run your tests** to verify they work:
+   ```bash
+   python -m pytest test_assignment_a.py -v
+   ```
+
+### 🚀 **Step 4: Implement Assignment B**
+**Files to work with**: `test_assignment_b.py` → `assignment_b.py`
+
+**OBJECTIVE**: Practice implementation by making tests pass
+
+**ACTION ITEMS**:
+1. **Study the test requirements** in `test_assignment_b.py`
+2. **Understand what needs to be implemented** by reading test expectations
+3. **Implement the methods** in `assignment_b.py` to make tests pass
+4. **Run tests iteratively** to check progress:
+   ```bash
+   python -m pytest test_assignment_b.py -v
+   ```
+5. **Refine your implementation** until all tests pass
+
+### 🎯 **Step 5: Extra Practice**
+**File to work with**: `extra_exercises.md`
+
+**ACTION ITEMS**:
+1. **Complete the additional exercises** for deeper understanding
+2. **Apply concepts** to new scenarios
+3. **Challenge yourself** with advanced variations
+
+## ✅ Success Criteria
+
+- [ ] Successfully ran and understood `starter_example.py`
+- [ ] Comprehended test patterns in `test_starter_example.py`
+- [ ] Achieved 100% test coverage for `assignment_a.py`
+- [ ] Made all tests pass in `test_assignment_b.py`
+- [ ] Completed extra exercises
+
+**Estimated Time**: ${estimated_minutes} minutes
+""")
+
+# Python files written when AI generation is unavailable live next to the Jinja
+# templates as templates/fallback/<content_type>.py.tmpl, so they can be edited
+# without touching this module and are only read when a fallback is rendered
+FALLBACK_CODE_TEMPLATES_DIR = Path(__file__).parent / "templates" / "fallback"
+
+
+@lru_cache(maxsize=None)
+def load_fallback_code_template(content_type: str) -> Template:
+    """
+    Load the fallback Python file template for a content type, once per process.
+    
+    Args:
+        content_type: One of the starter, assignment or test content types
+        
+    Returns:
+        Template read from ``FALLBACK_CODE_TEMPLATES_DIR``
+    """
+    return Template((FALLBACK_CODE_TEMPLATES_DIR / f"{content_type}.py.tmpl").read_text(encoding="utf-8"))
+
+
+# Extra exercises written when AI generation is unavailable
+EXTRA_EXERCISES_FALLBACK_TEMPLATE = Template("""# Extra Exercises: ${module_name}
+
+## 🎯 Objective
+Practice and reinforce ${focus_csv} concepts.
+
+## 📚 Focus Areas
+${focus_areas}
+
+---
+
+## 🚀 Exercise 1: Basic Practice
+**Difficulty**: ⭐⭐
+
+Apply the concepts from this module in a simple scenario.
+
+**Task**:
+1. Create a simple implementation using the module concepts
+2. Write tests for your implementation
+3. Ensure all tests pass
+
+---
+
+## 🚀 Exercise 2: Intermediate Challenge
+**Difficulty**: ⭐⭐⭐
+
+Extend the concepts to handle more complex scenarios.
+
+**Task**:
+1. Design a solution that combines multiple concepts
+2. Handle edge cases and errors
+3. Write comprehensive tests
+
+---
+
+## 🚀 Exercise 3: Advanced Application
+**Difficulty**: ⭐⭐⭐⭐
+
+Create a real-world application using the module concepts.
+
+**Task**:
+1. Identify a practical problem to solve
+2. Design and implement a complete solution
+3. Include documentation and tests
+4. Consider performance and maintainability
+
+## 🧪 Testing Your Solutions
+
+Run your exercise tests:
+```bash
+pytest test_exercise_*.py -v
+```
+
+## 📋 Success Criteria
+
+- [ ] Complete all exercises
+- [ ] Achieve good test coverage
+- [ ] Follow best practices
+- [ ] Document your solutions
+""")
+
+# Placeholder for content types without a dedicated fallback
+GENERIC_FALLBACK_TEMPLATE = Template("""# ${content_title}: ${module_name}
+
+This is placeholder content for ${content_type}.
+
+## Module Information
+- **Topic**: ${topic_name}
+- **Module**: ${module_name}
+- **Type**: ${module_type}
+- **Focus Areas**: ${focus_areas}
+- **Difficulty**: ${difficulty}
+
+## TODO
+Implement ${content_type} content for this module.
+""")
+
+# System prompts per content type
+_TEST_SYSTEM_PROMPT = """You are an expert Python programming instructor specializing in test generation. 
+
+CRITICAL REQUIREMENTS:
+1. Generate ONLY valid, executable Python code with NO syntax errors
+2. ALL strings must be properly quoted and terminated
+3. ALL parentheses, brackets, and braces must be balanced
+4. ALL indentation must be consistent (4 spaces)
+5. NO markdown formatting, comments outside the code, or explanations
+6. Verify all imports are correct and match actual file names
+7. Double-check all method names match the actual code being tested
+
+Focus on creating comprehensive, syntactically perfect pytest test cases."""
+
+_CODE_SYSTEM_PROMPT = """You are an expert Python programming instructor. 
+
+CRITICAL REQUIREMENTS:
+1. Generate ONLY valid, executable Python code with NO syntax errors
+2. ALL strings must be properly quoted and terminated  
+3. ALL parentheses, brackets, and braces must be balanced
+4. ALL indentation must be consistent (4 spaces)
+5. NO markdown formatting, comments outside the code, or explanations
+6. Include proper docstrings and meaningful implementations
+7. Focus on practical, educational examples with proper error handling
+
+Generate clean, professional Python code that students can learn from."""
+
+DEFAULT_SYSTEM_PROMPT = "You are an expert educational content creator. Generate practical, engaging educational content focused on programming concepts. Use clear explanations and real-world examples."
+
+SYSTEM_PROMPTS = {
+    "test_starter": _TEST_SYSTEM_PROMPT,
+    "test_assignment_a": _TEST_SYSTEM_PROMPT,
+    "test_assignment_b": _TEST_SYSTEM_PROMPT,
+    "starter_example": _CODE_SYSTEM_PROMPT,
+    "assignment_a": _CODE_SYSTEM_PROMPT,
+    "assignment_b": _CODE_SYSTEM_PROMPT,
+}
@@ -14,6 +14,28 @@ from typing import List, Dict, Any, Optional
 from .models import GenerationConfig, QualityReport, ValidationResult
 
 
+def _validation_result(file_path: Path, errors: List[str]) -> ValidationResult:
+    """Build a syntax check result without validation; all values are our own."""
+    return ValidationResult.model_construct(
+        file_path=file_path,
+        is_valid=not errors,
+        errors=errors,
+        warnings=[]
+    )
+
+
+def _quality_report(lesson_path: Path) -> QualityReport:
+    """Build the initial report without validation; all values are our own."""
+    return QualityReport.model_construct(
+        lesson_path=lesson_path,
+        python_files_valid=True,
+        tests_executable=True,
+        quality_score=0.0,
+        issues=[],
+        metrics={}
+    )
+
+
 class QualityAssurance:
     """
     Quality assurance system for lesson content.
@@ -34,36 +56,69 @@ class QualityAssurance:
         """
         self.config = config
     
-    def validate_lesson(self, lesson_path: Path) -> QualityReport:
+    def validate_module(self, module_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Run the per-file checks for a single module directory.
+        
+        The result can be passed to ``validate_lesson`` so that a module checked
+        while later modules were still being generated is not scanned again.
+        
+        Args:
+            module_path: Path to a generated module directory
+            
+        Returns:
+            Partial check results, or None if the directory could not be scanned
+        """
+        try:
+            return self._check_files([path for path in module_path.rglob("*") if path.is_file()])
+        except Exception:
+            return None
+    
+    def validate_lesson(
+        self,
+        lesson_path: Path,
+        module_checks: Optional[Dict[Path, Optional[Dict[str, Any]]]] = None
+    ) -> QualityReport:
         """
         Perform comprehensive quality validation on a generated lesson.
         
         Args:
             lesson_path: Path to generated lesson directory
+            module_checks: Results of ``validate_module`` keyed by module
+                directory; those directories are not scanned again
             
         Returns:
             Quality report with validation results
         """
-        report = QualityReport(
-            lesson_path=lesson_path,
-            python_files_valid=True,
-            tests_executable=True,
-            quality_score=0.0,
-            issues=[],
-            metrics={}
-        )
+        report = _quality_report(lesson_path)
         
         try:
+            # Check every file that was not already checked with its module
+            module_checks = module_checks or {}
+            checks = []
+            remaining_files = []
+            for entry in lesson_path.iterdir():
+                if module_checks.get(entry) is not None:
+                    checks.append(module_checks[entry])
+                elif entry.is_dir():
+                    remaining_files.extend(path for path in entry.rglob("*") if path.is_file())
+                elif entry.is_file():
+                    remaining_files.append(entry)
+            checks.append(self._check_files(remaining_files))
+            
             # Validate Python syntax
-            syntax_results = self._validate_python_syntax(lesson_path)
-            report.python_files_valid = all(result.is_valid for result in syntax_results)
+            report.python_files_valid = all(
+                result.is_valid for check in checks for result in check['syntax_results']
+            )
             
             # Check test executability
-            test_results = self._validate_tests(lesson_path)
+            test_results = self._validate_tests(
+                lesson_path, [test_file for check in checks for test_file in check['test_files']]
+            )
             report.tests_executable = test_results.get('executable', False)
             
             # Calculate quality metrics
-            metrics = self._calculate_quality_metrics(lesson_path)
+            metrics = self._calculate_quality_metrics(lesson_path, [check['counts'] for check in checks])
             report.metrics = metrics
             
             # Calculate overall quality score
@@ -78,11 +133,22 @@ class QualityAssurance:
         
         return report
     
-    def _validate_python_syntax(self, lesson_path: Path) -> List[ValidationResult]:
+    def _check_files(self, files: List[Path]) -> Dict[str, Any]:
+        """Run the checks that look at individual files."""
+        return {
+            'syntax_results': self._validate_python_syntax(files),
+            'test_files': [path for path in files if path.suffix == '.py' and path.name.startswith('test_')],
+            'counts': self._count_files(files)
+        }
+    
+    def _validate_python_syntax(self, files: List[Path]) -> List[ValidationResult]:
         """Validate Python syntax for all .py files."""
         results = []
         
-        for py_file in lesson_path.rglob("*.py"):
+        for py_file in files:
+            if py_file.suffix != '.py':
+                continue
+
             try:
                 with open(py_file, 'r', encoding='utf-8') as f:
                     content = f.read()
@@ -90,31 +156,16 @@ class QualityAssurance:
                 # Parse with AST to check syntax
                 ast.parse(content, filename=str(py_file))
                 
-                results.append(ValidationResult(
-                    file_path=py_file,
-                    is_valid=True,
-                    errors=[],
-                    warnings=[]
-                ))
+                results.append(_validation_result(py_file, []))
                 
             except SyntaxError as e:
-                results.append(ValidationResult(
-                    file_path=py_file,
-                    is_valid=False,
-                    errors=[f"Syntax error at line {e.lineno}: {e.msg}"],
-                    warnings=[]
-                ))
+                results.append(_validation_result(py_file, [f"Syntax error at line {e.lineno}: {e.msg}"]))
             except Exception as e:
-                results.append(ValidationResult(
-                    file_path=py_file,
-                    is_valid=False,
-                    errors=[f"Validation error: {e}"],
-                    warnings=[]
-                ))
+                results.append(_validation_result(py_file, [f"Validation error: {e}"]))
         
         return results
     
-    def _validate_tests(self, lesson_path: Path) -> Dict[str, Any]:
+    def _validate_tests(self, lesson_path: Path, test_files: List[Path]) -> Dict[str, Any]:
         """Validate that tests can be executed."""
         results = {
             'executable': False,
@@ -123,8 +174,6 @@ class QualityAssurance:
         }
         
         try:
-            # Find test files
-            test_files = list(lesson_path.rglob("test_*.py"))
             results['test_files'] = [str(f) for f in test_files]
             
             if not test_files:
@@ -145,7 +194,36 @@ class QualityAssurance:
         
         return results
     
-    def _calculate_quality_metrics(self, lesson_path: Path) -> Dict[str, Any]:
+    def _count_files(self, files: List[Path]) -> Dict[str, int]:
+        """Count files by kind and their total number of lines."""
+        counts = {
+            'total_files': 0,
+            'python_files': 0,
+            'test_files': 0,
+            'markdown_files': 0,
+            'total_lines': 0
+        }
+        
+        for file_path in files:
+            counts['total_files'] += 1
+            
+            if file_path.suffix == '.py':
+                counts['python_files'] += 1
+                if file_path.name.startswith('test_'):
+                    counts['test_files'] += 1
+            elif file_path.suffix == '.md':
+                counts['markdown_files'] += 1
+            
+            # Count lines
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    counts['total_lines'] += len(f.readlines())
+            except:
+                pass  # Skip binary files
+        
+        return counts
+    
+    def _calculate_quality_metrics(self, lesson_path: Path, file_counts: List[Dict[str, int]]) -> Dict[str, Any]:
         """Calculate quality metrics for the lesson."""
         metrics = {
             'total_files': 0,
@@ -160,24 +238,10 @@ class QualityAssurance:
         }
         
         try:
-            # Count files and lines
-            for file_path in lesson_path.rglob("*"):
-                if file_path.is_file():
-                    metrics['total_files'] += 1
-                    
-                    if file_path.suffix == '.py':
-                        metrics['python_files'] += 1
-                        if file_path.name.startswith('test_'):
-                            metrics['test_files'] += 1
-                    elif file_path.suffix == '.md':
-                        metrics['markdown_files'] += 1
-                    
-                    # Count lines
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            metrics['total_lines'] += len(f.readlines())
-                    except:
-                        pass  # Skip binary files
+            # Add up the file and line counts
+            for counts in file_counts:
+                for key, value in counts.items():
+                    metrics[key] += value
             
             # Check for important files
             metrics['has_readme'] = (lesson_path / "README.md").exists()
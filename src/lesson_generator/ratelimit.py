@@ -0,0 +1,204 @@
+"""
+Rate limiting module.
+
+This module provides proactive requests-per-minute and tokens-per-minute
+throttling for OpenAI calls, following the capacity-refill scheduler from the
+OpenAI cookbook's parallel request processor, plus exponential backoff for the
+429 responses that still slip through.
+"""
+
+import random
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+MAX_ATTEMPTS = 5
+FALLBACK_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=None)
+def _rate_limit_error():
+    """Get openai's RateLimitError, imported on first use, or None without the SDK."""
+    try:
+        from openai import RateLimitError  # type: ignore
+    except Exception:
+        return None
+    return RateLimitError
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    rate_limit_error = _rate_limit_error()
+    return rate_limit_error is not None and isinstance(error, rate_limit_error)
+
+
+class RateLimiter:
+    """
+    Thread-safe request and token budget shared by all generation workers.
+
+    Capacity refills continuously at ``per_minute / 60`` units per second and is
+    capped at one minute's worth, so short bursts are allowed while sustained
+    throughput stays under the account limits. A limit of ``None`` disables
+    that dimension.
+    """
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Maximum requests per minute, or None for unlimited
+            tokens_per_minute: Maximum tokens per minute, or None for unlimited
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_request_capacity = float(requests_per_minute or 0)
+        self.available_token_capacity = float(tokens_per_minute or 0)
+        self._last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Top up both capacities for the time elapsed since the last update."""
+        elapsed = now - self._last_update
+        self._last_update = now
+        if self.requests_per_minute:
+            self.available_request_capacity = min(
+                self.requests_per_minute,
+                self.available_request_capacity + elapsed * self.requests_per_minute / 60.0
+            )
+        if self.tokens_per_minute:
+            self.available_token_capacity = min(
+                self.tokens_per_minute,
+                self.available_token_capacity + elapsed * self.tokens_per_minute / 60.0
+            )
+
+    def _wait_time(self, request_cost: float, token_cost: float) -> float:
+        """Seconds until the given cost fits, or 0 if it fits now."""
+        wait = 0.0
+        if self.requests_per_minute and self.available_request_capacity < request_cost:
+            missing = request_cost - self.available_request_capacity
+            wait = max(wait, missing * 60.0 / self.requests_per_minute)
+        if self.tokens_per_minute and self.available_token_capacity < token_cost:
+            missing = token_cost - self.available_token_capacity
+            wait = max(wait, missing * 60.0 / self.tokens_per_minute)
+        return wait
+
+    def acquire(self, request_cost: float = 1, token_cost: float = 0) -> None:
+        """
+        Block until the request fits in the budget, then consume it.
+
+        Args:
+            request_cost: Number of requests about to be made
+            token_cost: Estimated prompt plus completion tokens for the request
+        """
+        # A single request larger than the whole budget could never fit
+        if self.tokens_per_minute:
+            token_cost = min(token_cost, self.tokens_per_minute)
+
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                wait = self._wait_time(request_cost, token_cost)
+                if wait <= 0:
+                    if self.requests_per_minute:
+                        self.available_request_capacity -= request_cost
+                    if self.tokens_per_minute:
+                        self.available_token_capacity -= token_cost
+                    return
+            time.sleep(wait)
+
+
+class RequestSpacer:
+    """
+    Limiter that spaces requests at least ``delay`` seconds apart.
+    
+    Each caller reserves the next free slot and sleeps until it arrives, so
+    concurrent callers queue up instead of all sleeping the same delay and
+    then firing at once. One spacer is shared by every worker thread of a
+    generator; slot reservation is guarded by a lock.
+    """
+
+    def __init__(self, delay: float):
+        """
+        Initialize the spacer.
+
+        Args:
+            delay: Minimum interval between requests in seconds
+        """
+        self.delay = delay
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Reserve the next request slot and return the seconds until it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.delay
+        return slot - now
+
+    def wait(self) -> None:
+        """Block until this caller's request slot."""
+        if self.delay <= 0:
+            return
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+def call_with_backoff(
+    func: Callable[[], T],
+    max_attempts: int = MAX_ATTEMPTS,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0
+) -> T:
+    """
+    Call ``func``, retrying with jittered exponential backoff on rate limit errors.
+
+    Args:
+        func: Zero-argument callable performing the API request
+        max_attempts: Total number of attempts before giving up
+        base_delay: Delay before the first retry in seconds
+        max_delay: Upper bound for a single delay in seconds
+
+    Returns:
+        The return value of ``func``
+    """
+    attempt = 1
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if not _is_rate_limit_error(e) or attempt >= max_attempts:
+                raise
+        delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+        time.sleep(delay * (1 + random.random()))
+        attempt += 1
+
+
+def get_token_counter(model: str) -> Callable[[str], int]:
+    """
+    Get a function that counts the tokens of a prompt for the given model.
+
+    Falls back to a rough four-characters-per-token estimate when tiktoken or
+    its encoding files are unavailable.
+
+    Args:
+        model: OpenAI model name
+
+    Returns:
+        Callable mapping text to an approximate token count
+    """
+    try:
+        import tiktoken
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception:
+        return lambda text: len(text) // 4 + 1
+
+    return lambda text: len(encoding.encode(text))
@@ -10,7 +10,7 @@ from typing import Dict, Any, Optional
 import tempfile
 import shutil
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape, Template, TemplateNotFound
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape, Template, TemplateNotFound
 
 from .models import GenerationConfig
 from .template_extraction import TemplateExtractor
@@ -47,12 +47,17 @@ class TemplateEngine:
         # Set up template directory priority
         self._setup_template_directories()
         
-        # Initialize Jinja2 environment
+        # Initialize Jinja2 environment. Each template is compiled once and kept;
+        # an engine lives for one generation run, so templates are not re-stat'ed
+        # for changes on every lookup.
         self.env = Environment(
             loader=FileSystemLoader(self.template_dirs),
             autoescape=select_autoescape(['html', 'xml']),
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            auto_reload=False,
+            cache_size=400,
+            bytecode_cache=self._create_bytecode_cache()
         )
         
         # Add custom filters
@@ -62,6 +67,22 @@ class TemplateEngine:
         if config.verbose:
             print(f"🎨 Template engine initialized with {len(self.template_dirs)} template directories")
     
+    @staticmethod
+    def _create_bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+        """
+        Get a bytecode cache so compiled templates are reused across runs.
+        
+        Jinja keeps it in a private per-user temp directory and checks each
+        entry against the template source, so edited templates are recompiled.
+        
+        Returns:
+            Bytecode cache, or None if no usable cache directory exists
+        """
+        try:
+            return FileSystemBytecodeCache()
+        except (OSError, RuntimeError):
+            return None
+    
     def _setup_template_directories(self):
         """Set up template directories in priority order."""
         
@@ -263,7 +284,7 @@ class TemplateEngine:
 
 ## Learning Objectives
 
-{chr(10).join(f"- {obj}" for obj in topic.get('learning_objectives', ['Learn key concepts']))}
+{chr(10).join([f"- {obj}" for obj in topic.get('learning_objectives', ['Learn key concepts'])])}
 
 ## Getting Started
 
@@ -5,12 +5,47 @@ This module provides validation functions for topics, configurations,
 and generated content to ensure quality and consistency.
 """
 
+import functools
 import json
 import re
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, NamedTuple, Tuple
 
-from ..models import TopicConfig, ValidationResult
+from ..models import DifficultyLevel, TopicConfig, ValidationResult
+
+
+class _ModuleSnapshot(NamedTuple):
+    """Hashable view of the module fields checked by ``validate_topic``."""
+    name: str
+    type: str
+
+
+class _TopicSnapshot(NamedTuple):
+    """Hashable view of the topic fields checked by ``validate_topic``."""
+    name: str
+    slug: str
+    description: str
+    estimated_hours: float
+    concepts: Tuple[str, ...]
+    learning_objectives: Tuple[str, ...]
+    modules: Tuple[_ModuleSnapshot, ...]
+    prerequisites: Tuple[str, ...]
+    difficulty: str
+    
+    @classmethod
+    def from_topic(cls, topic: TopicConfig) -> "_TopicSnapshot":
+        """Capture the validated fields of a topic configuration."""
+        return cls(
+            name=topic.name,
+            slug=topic.slug,
+            description=topic.description,
+            estimated_hours=topic.estimated_hours,
+            concepts=tuple(topic.concepts),
+            learning_objectives=tuple(topic.learning_objectives),
+            modules=tuple(_ModuleSnapshot(m.name, m.type) for m in topic.modules),
+            prerequisites=tuple(topic.prerequisites),
+            difficulty=topic.difficulty
+        )
 
 
 def validate_topic(topic: TopicConfig) -> ValidationResult:
@@ -23,6 +58,13 @@ def validate_topic(topic: TopicConfig) -> ValidationResult:
     Returns:
         ValidationResult with any errors, warnings, or suggestions
     """
+    # Results are memoized per topic content; hand out a copy callers may modify
+    return _validate_topic_snapshot(_TopicSnapshot.from_topic(topic)).model_copy(deep=True)
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_topic_snapshot(topic: _TopicSnapshot) -> ValidationResult:
+    """Validate a topic snapshot (memoized implementation of ``validate_topic``)."""
     errors = []
     warnings = []
     suggestions = []
@@ -119,6 +161,37 @@ def validate_topic(topic: TopicConfig) -> ValidationResult:
     )
 
 
+_VALID_DIFFICULTIES = frozenset(level.value for level in DifficultyLevel)
+
+
+def validate_topics(topics: List[TopicConfig]) -> None:
+    """
+    Validate a batch of topic configurations in one pass.
+    
+    Checks shared across the batch (difficulty levels, module presence) run
+    once over the whole list; per-topic checks use the memoized
+    ``validate_topic``.
+    
+    Args:
+        topics: Topic configurations to validate
+        
+    Raises:
+        ValueError: If any topic is invalid
+    """
+    difficulties = frozenset(getattr(topic.difficulty, 'value', topic.difficulty) for topic in topics)
+    unknown = difficulties - _VALID_DIFFICULTIES
+    if unknown:
+        raise ValueError(f"Unknown difficulty level(s): {', '.join(sorted(unknown))}")
+    
+    if not all(topic.modules for topic in topics):
+        raise ValueError("Every topic needs at least 1 module")
+    
+    for topic in topics:
+        result = validate_topic(topic)
+        if not result.is_valid:
+            raise ValueError(f"Invalid topic '{topic.name}': {'; '.join(result.errors)}")
+
+
 def validate_output_path(output_path: Path) -> bool:
     """
     Validate that an output path is suitable for lesson generation.
@@ -293,6 +366,10 @@ def validate_openai_api_key(api_key: str) -> bool:
     return True
 
 
+# Position of each difficulty in the expected progression
+_DIFFICULTY_RANK = {"beginner": 0, "intermediate": 1, "advanced": 2}
+
+
 def validate_difficulty_progression(topics: List[TopicConfig]) -> ValidationResult:
     """
     Validate that a series of topics has appropriate difficulty progression.
@@ -312,14 +389,11 @@ def validate_difficulty_progression(topics: List[TopicConfig]) -> ValidationResu
     difficulties = [topic.difficulty for topic in topics]
     
     # Check for appropriate progression
-    difficulty_order = ["beginner", "intermediate", "advanced"]
+    ranks = [_DIFFICULTY_RANK[difficulty] for difficulty in difficulties]
     
     # Find any backward progressions
     for i in range(1, len(difficulties)):
-        current_idx = difficulty_order.index(difficulties[i])
-        previous_idx = difficulty_order.index(difficulties[i-1])
-        
-        if current_idx < previous_idx - 1:
+        if ranks[i] < ranks[i-1] - 1:
             warnings.append(
                 f"Large difficulty drop from '{difficulties[i-1]}' to '{difficulties[i]}' "
                 f"between topics {i} and {i+1}"
@@ -4,14 +4,30 @@ File management API endpoints.
 This module provides endpoints for file upload, download, and management.
 """
 
+import re
 from pathlib import Path
 from typing import List
+from urllib.parse import quote
 
 from fastapi import APIRouter, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 
 router = APIRouter()
 
+# Characters that cannot appear in a quoted header filename
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\x20-\x7e]|["\\]')
+
+
+def _content_disposition(file_name: str) -> str:
+    """
+    Build an attachment Content-Disposition header for a file name.
+    
+    Sends an ASCII fallback as a quoted ``filename`` and the exact name as an
+    RFC 5987 encoded ``filename*``.
+    """
+    fallback = _UNSAFE_FILENAME_CHARS.sub("_", file_name)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(file_name, safe='')}"
+
 
 @router.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
@@ -32,17 +48,36 @@ async def upload_file(file: UploadFile = File(...)):
 
 
 @router.get("/{file_id}/download")
-async def download_file(file_id: str):
+async def download_file(file_id: str, lesson_id: str):
     """
-    Download a specific file by ID.
+    Download a specific file of a lesson by ID.
+    
+    Like the lesson endpoints, access is granted by knowing the lesson ID;
+    a file of any other lesson is reported as not found. The content is
+    decompressed and sent in chunks, so large files are never held in
+    memory as a whole.
     """
     
-    # TODO: Implement file serving with proper security
-    # - Validate file ID and permissions
-    # - Serve file with appropriate headers
-    # - Handle different file types
+    from ...database import SessionLocal
+    from ...database.repositories import FileRepository
+    
+    if not file_id.isdigit():
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    db = SessionLocal()
+    try:
+        file_repo = FileRepository(db)
+        lesson_file = file_repo.get_file(int(file_id))
+        if not lesson_file or lesson_file.lesson_id != lesson_id:
+            raise HTTPException(status_code=404, detail="File not found")
+    finally:
+        db.close()
     
-    raise HTTPException(status_code=404, detail="File not found")
+    return StreamingResponse(
+        file_repo.stream_file_content(lesson_file),
+        media_type=lesson_file.content_type or "application/octet-stream",
+        headers={"Content-Disposition": _content_disposition(lesson_file.file_name)}
+    )
 
 
 @router.get("/")
@@ -292,7 +292,7 @@ async def preview_lesson(
             # Check if this is a README file
             if Path(file_path).name.lower() in ['readme.md', 'readme.txt']:
                 try:
-                    content = file_repo.get_file_content(lesson_file.file_id)
+                    content = file_repo.read_file_content(lesson_file)
                     if content:
                         content_str = content if isinstance(content, str) else content.decode('utf-8', errors='ignore')
                         readme_content = content_str[:2000] + "..." if len(content_str) > 2000 else content_str
@@ -173,7 +173,7 @@ class DatabaseTaskManager:
             repo = LessonRepository(db)
             
             db_status = self._convert_api_status(status) if status else None
-            lessons, _ = repo.list_lessons(status=db_status, limit=limit)
+            lessons = repo.list_lesson_statuses(status=db_status, limit=limit)
             
             # Convert to API format
             result = []
@@ -219,7 +219,6 @@ class DatabaseTaskManager:
         db = SessionLocal()
         try:
             file_repo = FileRepository(db)
-            lesson_repo = LessonRepository(db)
             
             files_to_store = []
             
@@ -281,10 +280,6 @@ class DatabaseTaskManager:
                     file_repo.bulk_store_files(lesson_id, files_to_store)
                     print(f"✅ Bulk storage completed for lesson {lesson_id}")
                     
-                    # Update lesson statistics
-                    lesson_repo.update_file_statistics(lesson_id)
-                    print(f"✅ Updated statistics for lesson {lesson_id}")
-                    
                     # Verify storage by counting files
                     file_count = db.query(LessonFile).filter_by(lesson_id=lesson_id).count()
                     print(f"🔧 DEBUG: Database now contains {file_count} files for lesson {lesson_id}")
@@ -332,7 +327,7 @@ class DatabaseTaskManager:
             with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
                 # Add each file to the ZIP
                 for lesson_file in lesson_files:
-                    content = file_repo.get_file_content(lesson_file.file_id)
+                    content = file_repo.read_file_content(lesson_file)
                     if content:
                         zipf.writestr(lesson_file.file_path, content)
                 
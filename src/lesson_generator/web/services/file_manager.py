@@ -5,11 +5,15 @@ This module handles file operations for the web interface including
 uploads, downloads, and temporary file management.
 """
 
+import re
 import shutil
 from pathlib import Path
 from typing import List, Optional
 import tempfile
 
+# Anything other than alphanumerics, '.', '-' and '_' (\w is alphanumeric or '_')
+_UNSAFE_FILENAME_CHAR_RE = re.compile(r'[^\w.-]')
+
 
 class FileManager:
     """
@@ -82,14 +86,7 @@ class FileManager:
         safe_name = Path(filename).name
         
         # Replace potentially dangerous characters
-        safe_chars = []
-        for char in safe_name:
-            if char.isalnum() or char in '.-_':
-                safe_chars.append(char)
-            else:
-                safe_chars.append('_')
-        
-        return ''.join(safe_chars)
+        return _UNSAFE_FILENAME_CHAR_RE.sub('_', safe_name)
     
     async def list_files(
         self,
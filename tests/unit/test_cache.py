@@ -0,0 +1,265 @@
+"""
+Unit tests for the cache module.
+
+This module tests the response cache, including its in-memory LRU tier, row
+eviction and handling of untrusted database contents, and the lesson cache
+and the settings its keys cover.
+"""
+
+import os
+import pickle
+import sqlite3
+
+import pytest
+
+from lesson_generator.cache import LessonCache, ResponseCache
+from lesson_generator.cli import create_topic_from_name
+from lesson_generator.models import ContentGenerationResponse, GenerationConfig, LessonGenerationResult
+
+
+def make_response(content: str) -> ContentGenerationResponse:
+    """Create a response as the content generator would cache it."""
+    return ContentGenerationResponse(content=content, model_used="gpt-4o-mini", tokens_used=42)
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Test cases for ResponseCache."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a stored response is read back from a fresh connection."""
+        db_path = tmp_path / "responses.sqlite3"
+        cache = ResponseCache(db_path)
+        cache.set("key", make_response("hello"))
+        cache.close()
+
+        reopened = ResponseCache(db_path)
+        try:
+            response = reopened.get("key")
+            assert isinstance(response, ContentGenerationResponse)
+            assert response.content == "hello"
+            assert response.tokens_used == 42
+            assert "key" in reopened
+        finally:
+            reopened.close()
+
+    def test_miss_returns_default(self, tmp_path):
+        """Test that unknown keys return the given default."""
+        cache = ResponseCache(tmp_path / "responses.sqlite3")
+        try:
+            assert cache.get("missing") is None
+            assert cache.get("missing", ResponseCache.MISS) is ResponseCache.MISS
+            assert "missing" not in cache
+        finally:
+            cache.close()
+
+    def test_values_are_stored_as_json(self, tmp_path):
+        """Test that rows hold JSON rather than pickled objects."""
+        db_path = tmp_path / "responses.sqlite3"
+        cache = ResponseCache(db_path)
+        cache.set("key", make_response("hello"))
+        cache.close()
+
+        with sqlite3.connect(db_path) as conn:
+            (value,) = conn.execute("SELECT value FROM responses WHERE key = 'key'").fetchone()
+        assert ContentGenerationResponse.model_validate_json(value).content == "hello"
+
+    def test_untrusted_rows_are_misses(self, tmp_path):
+        """Test that pickled or malformed rows are never loaded."""
+        db_path = tmp_path / "responses.sqlite3"
+        ResponseCache(db_path).close()
+        with sqlite3.connect(db_path) as conn:
+            conn.executemany(
+                "INSERT INTO responses (key, value, hits, last_used) VALUES (?, ?, 0, 0)",
+                [("pickled", pickle.dumps(make_response("x"))), ("garbage", b"{not json")]
+            )
+
+        cache = ResponseCache(db_path)
+        try:
+            assert cache.get("pickled") is None
+            assert cache.get("garbage") is None
+        finally:
+            cache.close()
+
+    def test_memory_tier_evicts_least_recently_used(self, tmp_path):
+        """Test that the in-memory LRU keeps only the most recently used values."""
+        cache = ResponseCache(tmp_path / "responses.sqlite3", memory_entries=2)
+        try:
+            for key in ("a", "b", "c"):
+                cache.set(key, make_response(key))
+            assert list(cache._memory) == ["b", "c"]
+
+            # A hit moves the entry to the most recently used end
+            cache.get("b")
+            assert list(cache._memory) == ["c", "b"]
+
+            # Evicted from memory, but still served from SQLite
+            assert cache.get("a").content == "a"
+            assert list(cache._memory) == ["b", "a"]
+        finally:
+            cache.close()
+
+    def test_memory_tier_can_be_disabled(self, tmp_path):
+        """Test that memory_entries=0 keeps nothing in memory."""
+        cache = ResponseCache(tmp_path / "responses.sqlite3", memory_entries=0)
+        try:
+            cache.set("a", make_response("a"))
+            assert cache.get("a").content == "a"
+            assert not cache._memory
+        finally:
+            cache.close()
+
+    def test_rows_beyond_max_entries_are_evicted(self, tmp_path):
+        """Test that the least recently used rows are deleted from SQLite."""
+        cache = ResponseCache(tmp_path / "responses.sqlite3", max_entries=2, memory_entries=0)
+        try:
+            for key in ("a", "b", "c"):
+                cache.set(key, make_response(key))
+            assert "a" not in cache
+            assert cache.get("b").content == "b"
+            assert cache.get("c").content == "c"
+        finally:
+            cache.close()
+
+    def test_replacing_a_row_does_not_evict(self, tmp_path):
+        """Test that storing an existing key again keeps the other rows."""
+        cache = ResponseCache(tmp_path / "responses.sqlite3", max_entries=2, memory_entries=0)
+        try:
+            cache.set("a", make_response("a"))
+            cache.set("b", make_response("b"))
+            cache.set("a", make_response("a2"))
+            assert cache.get("a").content == "a2"
+            assert cache.get("b").content == "b"
+        finally:
+            cache.close()
+
+    def test_existing_rows_count_towards_max_entries(self, tmp_path):
+        """Test that rows from an earlier run are evicted once a reopened cache is full."""
+        db_path = tmp_path / "responses.sqlite3"
+        cache = ResponseCache(db_path, memory_entries=0)
+        for key in ("a", "b", "c"):
+            cache.set(key, make_response(key))
+        cache.close()
+
+        cache = ResponseCache(db_path, max_entries=2, memory_entries=0)
+        try:
+            cache.set("d", make_response("d"))
+            assert "a" not in cache
+            assert "b" not in cache
+            assert "c" in cache
+            assert "d" in cache
+        finally:
+            cache.close()
+
+    def test_eviction_uses_last_used_index(self, tmp_path):
+        """Test that finding the least recently used rows does not scan the table."""
+        db_path = tmp_path / "responses.sqlite3"
+        ResponseCache(db_path).close()
+        with sqlite3.connect(db_path) as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT key FROM responses ORDER BY last_used LIMIT 1"
+            ).fetchall()
+        assert any("responses_last_used" in row[-1] for row in plan)
+
+    def test_without_path_caches_in_memory(self, tmp_path):
+        """Test that no database file is written without a path."""
+        cache = ResponseCache()
+        try:
+            cache.set("key", make_response("hello"))
+            assert cache.get("key").content == "hello"
+            assert cache.db_path is None
+        finally:
+            cache.close()
+
+    def test_unwritable_location_falls_back_to_memory(self, tmp_path):
+        """Test that a database path that cannot be created still gives a working cache."""
+        blocker = tmp_path / "not_a_directory"
+        blocker.write_text("")
+        cache = ResponseCache(blocker / "responses.sqlite3")
+        try:
+            cache.set("key", make_response("hello"))
+            assert cache.get("key").content == "hello"
+        finally:
+            cache.close()
+
+
+@pytest.mark.unit
+class TestLessonCache:
+    """Test cases for LessonCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.topic = create_topic_from_name("Python Basics", "beginner", 2)
+
+    def make_result(self, output_path, success=True) -> LessonGenerationResult:
+        """Create a lesson result pointing at ``output_path``."""
+        return LessonGenerationResult(
+            topic_name=self.topic.name,
+            topic_slug=self.topic.slug,
+            success=success,
+            output_path=output_path
+        )
+
+    def test_round_trip(self, tmp_path):
+        """Test that a stored result is returned while its lesson exists."""
+        lesson_dir = tmp_path / "lessons" / "python_basics"
+        lesson_dir.mkdir(parents=True)
+        cache = LessonCache(tmp_path / "cache")
+
+        cache.put("key", self.make_result(lesson_dir))
+        cached = cache.get("key")
+        assert cached is not None
+        assert cached.topic_slug == "python_basics"
+
+        lesson_dir.rmdir()
+        assert cache.get("key") is None
+
+    def test_failed_results_are_not_stored(self, tmp_path):
+        """Test that only successful generations are cached."""
+        cache = LessonCache(tmp_path / "cache")
+        cache.put("key", self.make_result(tmp_path, success=False))
+        assert cache.get("key") is None
+        assert not (tmp_path / "cache").exists()
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that entries beyond max_entries are removed oldest first."""
+        cache = LessonCache(tmp_path / "cache", max_entries=2)
+        for index, key in enumerate(("a", "b", "c")):
+            cache.put(key, self.make_result(tmp_path))
+            # Give each entry a distinct modification time
+            os.utime(tmp_path / "cache" / f"{key}.json", ns=(index, index))
+            cache._evict()
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        assert cache.get("c") is not None
+
+    def test_key_covers_content_shaping_settings(self, tmp_path):
+        """Test that templates, reference lessons and AI settings change the key."""
+        templates = tmp_path / "templates"
+        templates.mkdir()
+        base = GenerationConfig(output_dir=tmp_path / "out", use_ai=False)
+        key = LessonCache.make_key(self.topic, base)
+        assert LessonCache.make_key(self.topic, base) == key
+
+        variants = [
+            base.model_copy(update={"openai_model": "gpt-3.5-turbo"}),
+            base.model_copy(update={"use_ai": True}),
+            base.model_copy(update={"output_dir": tmp_path / "other"}),
+            base.model_copy(update={"custom_templates_dir": templates}),
+            base.model_copy(update={"reference_lesson_dir": templates}),
+        ]
+        keys = {LessonCache.make_key(self.topic, config) for config in variants}
+        assert key not in keys
+        assert len(keys) == len(variants)
+
+    def test_key_changes_when_templates_are_edited(self, tmp_path):
+        """Test that editing a custom template invalidates cached lessons."""
+        templates = tmp_path / "templates"
+        templates.mkdir()
+        template = templates / "README.md.j2"
+        template.write_text("# {{ topic.name }}")
+        config = GenerationConfig(output_dir=tmp_path / "out", use_ai=False, custom_templates_dir=templates)
+        key = LessonCache.make_key(self.topic, config)
+
+        template.write_text("# {{ topic.name }} (revised)")
+        assert LessonCache.make_key(self.topic, config) != key
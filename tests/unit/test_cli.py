@@ -5,14 +5,15 @@ This module tests the command-line interface functionality including
 argument parsing, validation, and basic command execution.
 """
 
+import click
 import pytest
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from click.testing import CliRunner
 
 # Skip import errors during development
 try:
-    from lesson_generator.cli import cli, create_topic_from_name
+    from lesson_generator.cli import CachedPath, cli, create_topic_from_name, load_topics_from_config
     from lesson_generator.models import DifficultyLevel, ModuleType
     CLI_AVAILABLE = True
 except ImportError:
@@ -60,6 +61,28 @@ class TestCLI:
             assert 'OPENAI_API_KEY' in content
 
 
+@pytest.mark.unit
+@pytest.mark.skipif(not CLI_AVAILABLE, reason="CLI module not fully implemented")
+class TestCachedPath:
+    """Test cases for the CachedPath parameter type."""
+    
+    def test_existence_is_checked_on_every_call(self, tmp_path):
+        """Test that a path removed after a successful check is rejected."""
+        path_type = CachedPath(exists=True, file_okay=False, dir_okay=True, path_type=Path)
+        directory = tmp_path / "templates"
+        directory.mkdir()
+        assert path_type.convert(str(directory), None, None) == directory
+        
+        directory.rmdir()
+        with pytest.raises(click.BadParameter):
+            path_type.convert(str(directory), None, None)
+        
+        # A file at the same path is rejected once it appears
+        directory.write_text("")
+        with pytest.raises(click.BadParameter):
+            path_type.convert(str(directory), None, None)
+
+
 @pytest.mark.unit
 @pytest.mark.skipif(not CLI_AVAILABLE, reason="CLI module not fully implemented")
 class TestTopicCreation:
@@ -116,6 +139,24 @@ class TestTopicCreation:
         with pytest.raises(ValueError):
             create_topic_from_name("A" * 200, "intermediate", 4)
 
+    
+    def test_load_topics_from_config(self, tmp_path):
+        """Test loading topics from a configuration file."""
+        config_source = Path(__file__).parents[2] / "config" / "default_topics.json"
+        config_file = tmp_path / "topics.json"
+        config_file.write_text(config_source.read_text())
+        
+        topics = load_topics_from_config(config_file)
+        assert len(topics) == 3
+        assert all(topic.modules for topic in topics)
+        
+        # Cached topics are copied, so mutating a result does not leak
+        topics[0].modules.clear()
+        assert load_topics_from_config(config_file)[0].modules
+        
+        config_file.write_text('[{"topic": {"name": "Broken"}}]')
+        with pytest.raises(ValueError):
+            load_topics_from_config(config_file)
 
 @pytest.mark.integration
 @pytest.mark.skipif(not CLI_AVAILABLE, reason="CLI module not fully implemented")
@@ -126,7 +167,7 @@ class TestCLIIntegration:
         """Set up test fixtures."""
         self.runner = CliRunner()
     
-    @patch('lesson_generator.cli.LessonGenerator')
+    @patch('lesson_generator.core.LessonGenerator')
     def test_create_command_no_api_key(self, mock_generator_class):
         """Test create command without API key fails appropriately."""
         result = self.runner.invoke(cli, [
@@ -138,7 +179,7 @@ class TestCLIIntegration:
         assert result.exit_code == 1
         assert 'OpenAI API key required' in result.output
     
-    @patch('lesson_generator.cli.LessonGenerator')
+    @patch('lesson_generator.core.LessonGenerator')
     def test_create_command_no_ai_mode(self, mock_generator_class):
         """Test create command with no-ai flag."""
         with self.runner.isolated_filesystem():
@@ -154,15 +195,62 @@ class TestCLIIntegration:
                 success=True,
                 output_path=Path("./test_output")
             )
-            mock_generator.generate_lesson.return_value = mock_result
+            mock_generator.generate_lesson_async = AsyncMock(return_value=mock_result)
             
             result = self.runner.invoke(cli, [
                 'create', 'test_topic',
                 '--no-ai',
+                '--modules', '1',
                 '--output', './test_output'
             ])
             
-            assert result.exit_code == 0
+            assert result.exit_code == 0, result.output
+            mock_generator.generate_lesson_async.assert_called_once()
+            topic = mock_generator.generate_lesson_async.call_args.args[0]
+            assert topic.name == 'test_topic'
+            assert len(topic.modules) == 1
+            assert 'Successfully generated all 1 lesson(s)' in result.output
+            mock_generator.content_generator.close.assert_called_once()
+    
+    @patch('lesson_generator.commands.create._generate_concurrently', side_effect=RuntimeError("boom"))
+    @patch('lesson_generator.core.LessonGenerator')
+    def test_create_command_closes_generator_on_error(self, mock_generator_class, mock_generate):
+        """Test that the content generator is closed when generation raises."""
+        with self.runner.isolated_filesystem():
+            mock_generator = MagicMock()
+            mock_generator_class.return_value = mock_generator
+            
+            result = self.runner.invoke(cli, [
+                'create', 'test_topic',
+                '--no-ai',
+                '--modules', '1',
+                '--output', './test_output'
+            ])
+            
+            assert isinstance(result.exception, RuntimeError)
+            mock_generator.content_generator.close.assert_called_once()
+    
+    def test_create_command_batch_size_requires_cache(self):
+        """Test that --batch-size is rejected when the cache is disabled."""
+        result = self.runner.invoke(cli, [
+            'create', 'test_topic',
+            '--no-ai', '--no-cache',
+            '--batch-size', '4'
+        ])
+        
+        assert result.exit_code == 2
+        assert '--batch-size requires the response cache' in result.output
+    
+    def test_create_command_batch_api_requires_cache(self):
+        """Test that --batch-api is rejected when the cache is disabled."""
+        result = self.runner.invoke(cli, [
+            'create', 'test_topic',
+            '--no-ai', '--no-cache',
+            '--batch-api'
+        ])
+        
+        assert result.exit_code == 2
+        assert '--batch-api requires the response cache' in result.output
     
     def test_create_command_invalid_output_path(self):
         """Test create command with invalid output path."""
@@ -0,0 +1,392 @@
+"""
+Unit tests for the content module.
+
+This module tests the pure helpers of content generation, such as the class
+names derived from topic names, and the packed, bundled and Batch API
+requests against a fake OpenAI client.
+"""
+
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from lesson_generator.cli import create_topic_from_name
+from lesson_generator.content import PACKABLE_CONTENT_TYPES, ContentGenerator, _load_openai, _safe_topic_name
+from lesson_generator.models import DifficultyLevel, GenerationConfig
+from lesson_generator.prompts import PROMPT_TEMPLATES
+
+
+def title_case_per_character(topic_name: str) -> str:
+    """Reference implementation: keep alphanumerics, title-casing each one."""
+    return ''.join(c.title() if c.isalnum() else '' for c in topic_name)
+
+
+@pytest.mark.unit
+class TestSafeClassName:
+    """Test cases for class names derived from topic names."""
+
+    @pytest.mark.parametrize("topic_name", [
+        "Python Basics",
+        "async-programming",
+        "a_b c",
+        "straße",
+        "Ünïcödé Topic",
+        "ﬁle io",
+    ])
+    def test_matches_per_character_title_case(self, topic_name):
+        """Test that ASCII and non-ASCII names keep per-character title-casing."""
+        assert _safe_topic_name(topic_name) == title_case_per_character(topic_name)
+
+    def test_leading_digit_is_prefixed(self):
+        """Test that names starting with a digit become valid identifiers."""
+        assert _safe_topic_name("3d graphics") == "Lesson3DGRAPHICS"
+
+    def test_unusable_name_falls_back(self):
+        """Test that names without alphanumerics fall back to a fixed stem."""
+        assert _safe_topic_name("--") == "Assignment"
+
+    def test_class_name_uses_shared_stem(self):
+        """Test that the content generator and the lesson generator agree on class names."""
+        assert ContentGenerator._create_safe_class_name("straße", "Example") == f"{_safe_topic_name('straße')}Example"
+
+
+@pytest.mark.unit
+class TestPromptTemplates:
+    """Test cases for the AI prompt templates."""
+
+    @pytest.mark.parametrize("content_type", sorted(PROMPT_TEMPLATES))
+    def test_no_placeholder_tokens(self, content_type):
+        """Test that prompts never show the model a literal placeholder to copy."""
+        assert not re.search(r"<[A-Za-z][A-Za-z ]*>", PROMPT_TEMPLATES[content_type].template)
+
+
+class FakeCompletions:
+    """Records chat completion requests and answers them with ``respond``."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        content = self.respond(json.loads(kwargs["messages"][1]["content"]))
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(total_tokens=100)
+        )
+
+
+class FakeBatches:
+    """In-memory stand-in for the Batch API."""
+
+    def __init__(self):
+        self.status = "in_progress"
+        self.output = ""
+
+    def create(self, **kwargs):
+        return SimpleNamespace(id="batch_1")
+
+    def retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, status=self.status, output_file_id="file_out")
+
+
+class FakeFiles:
+    """In-memory stand-in for file uploads and downloads."""
+
+    def __init__(self, batches):
+        self.batches = batches
+        self.uploads = []
+
+    def create(self, file, purpose):
+        self.uploads.append(file[1].decode("utf-8"))
+        return SimpleNamespace(id="file_in")
+
+    def content(self, file_id):
+        return SimpleNamespace(text=self.batches.output)
+
+
+class FakeClient:
+    """OpenAI client double exposing the endpoints used by the content generator."""
+
+    def __init__(self, respond=lambda payload: "{}"):
+        self.chat = SimpleNamespace(completions=FakeCompletions(respond))
+        self.batches = FakeBatches()
+        self.files = FakeFiles(self.batches)
+
+
+class FakeStreamCompletions:
+    """Streams ``content`` back in ``chunk_size`` pieces, optionally waiting for ``gate`` first."""
+
+    def __init__(self, content, chunk_size=3, gate=None):
+        self.content = content
+        self.chunk_size = chunk_size
+        self.gate = gate
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        if self.gate is not None:
+            assert self.gate.wait(timeout=5)
+        pieces = [self.content[i:i + self.chunk_size] for i in range(0, len(self.content), self.chunk_size)]
+        chunks = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))], usage=None)
+            for piece in pieces
+        ]
+        chunks.append(SimpleNamespace(choices=[], usage=SimpleNamespace(total_tokens=len(pieces))))
+        return iter(chunks)
+
+
+def wait_until(predicate, timeout=5.0):
+    """Poll ``predicate`` until it is true, failing after ``timeout`` seconds."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def generator(tmp_path):
+    """Provide a content generator whose AI client is a FakeClient."""
+    _load_openai()
+    config = GenerationConfig(output_dir=tmp_path, use_ai=True, rate_limit_delay=0)
+    generator = ContentGenerator(config)
+    generator.client = FakeClient()
+    generator.ai_enabled = True
+    yield generator
+    generator.close()
+
+
+@pytest.mark.unit
+class TestCombinedRequests:
+    """Test cases for packed, bundled and Batch API requests."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.topics = [
+            create_topic_from_name("Python Basics", "beginner", 2),
+            create_topic_from_name("Data Structures", "beginner", 2),
+        ]
+        self.items = [(topic, module) for topic in self.topics for module in topic.modules]
+
+    def test_packed_answers_are_served_from_cache(self, generator):
+        """Test that one packed call per content type fills every module's content."""
+        generator.client = FakeClient(lambda prompts: json.dumps({
+            "lessons": [{"index": p["index"], "content": f"answer {p['index']}"} for p in prompts]
+        }))
+        completions = generator.client.chat.completions
+
+        filled = generator.prefetch_packed(self.items, batch_size=len(self.items))
+        assert filled == len(self.items) * len(PACKABLE_CONTENT_TYPES)
+        assert len(completions.requests) == len(PACKABLE_CONTENT_TYPES)
+
+        topic, module = self.items[2]
+        assert generator.generate_content("learning_path", topic, module).content == "answer 2"
+        assert len(completions.requests) == len(PACKABLE_CONTENT_TYPES)
+
+    def test_packed_chunks_respect_batch_size(self, generator):
+        """Test that requests are split into chunks of at most batch_size."""
+        generator.client = FakeClient(lambda prompts: json.dumps({"lessons": []}))
+        generator.prefetch_packed(self.items, batch_size=2)
+        sizes = {len(json.loads(r["messages"][1]["content"])) for r in generator.client.chat.completions.requests}
+        assert sizes == {2}
+
+    def test_malformed_packed_entries_are_skipped(self, generator):
+        """Test that only well-formed entries with a valid index are cached."""
+        generator.client = FakeClient(lambda prompts: json.dumps({"lessons": [
+            {"index": 0, "content": "kept"},
+            {"index": 1, "content": 42},
+            {"index": 99, "content": "out of range"},
+            {"content": "no index"},
+            {"index": 2, "content": "   "},
+        ]}))
+        assert generator.prefetch_packed(self.items, batch_size=len(self.items)) == len(PACKABLE_CONTENT_TYPES)
+
+    def test_unparseable_packed_response_fills_nothing(self, generator):
+        """Test that a non-JSON answer leaves every request to the normal path."""
+        generator.client = FakeClient(lambda prompts: "not json")
+        assert generator.prefetch_packed(self.items, batch_size=len(self.items)) == 0
+
+    def test_packing_needs_the_cache(self, generator):
+        """Test that nothing is sent when there is no cache to fill."""
+        generator._content_cache.close()
+        generator._content_cache = None
+        assert generator.prefetch_packed(self.items, batch_size=4) == 0
+        assert generator.client.chat.completions.requests == []
+
+    def test_bundle_fills_returned_files(self, generator):
+        """Test that one bundled call fills the files present in the answer."""
+        returned = PACKABLE_CONTENT_TYPES[:-1]
+        generator.client = FakeClient(lambda files: json.dumps({kind: f"{kind} file" for kind in files if kind in returned}))
+        topic, module = self.items[0]
+
+        assert generator.prefetch_module_bundle(topic, module) == len(returned)
+        assert len(generator.client.chat.completions.requests) == 1
+        assert generator.generate_content("assignment_b", topic, module).content == "assignment_b file"
+
+        # A single missing file is left to the per-request path
+        assert generator.prefetch_module_bundle(topic, module) == 0
+        assert len(generator.client.chat.completions.requests) == 1
+
+    def test_batch_results_are_collected_into_cache(self, generator):
+        """Test that finished batch output is parsed into cache entries."""
+        items = self.items[:1]
+        batch_id = generator.submit_batch(items)
+        assert batch_id == "batch_1"
+        lines = [json.loads(line) for line in generator.client.files.uploads[0].splitlines()]
+        assert len(lines) == len(PACKABLE_CONTENT_TYPES)
+
+        batches = generator.client.batches
+        assert generator.collect_batch(batch_id) is None
+
+        batches.status = "completed"
+        batches.output = "\n".join([
+            json.dumps({
+                "custom_id": line["custom_id"],
+                "response": {"body": {
+                    "choices": [{"message": {"content": f"batch {line['custom_id']}"}}],
+                    "usage": {"total_tokens": 7},
+                }},
+            })
+            for line in lines[:2]
+        ] + ["not json", json.dumps({"custom_id": "unknown"})])
+        assert generator.collect_batch(batch_id) == 2
+
+        topic, module = items[0]
+        assert generator.generate_content(PACKABLE_CONTENT_TYPES[0], topic, module).content == "batch request-0"
+        assert generator.client.chat.completions.requests == []
+
+    def test_failed_batch_fills_nothing(self, generator):
+        """Test that a batch that did not complete is forgotten without results."""
+        batch_id = generator.submit_batch(self.items[:1])
+        generator.client.batches.status = "failed"
+        assert generator.collect_batch(batch_id) == 0
+        assert generator.collect_batch(batch_id) == 0
+
+    def test_cached_requests_are_not_resubmitted(self, generator):
+        """Test that a batch skips content that is already cached."""
+        generator.client = FakeClient(lambda prompts: json.dumps({
+            "lessons": [{"index": p["index"], "content": "packed"} for p in prompts]
+        }))
+        generator.prefetch_packed(self.items, batch_size=len(self.items))
+        assert generator.submit_batch(self.items) is None
+
+
+@pytest.mark.unit
+class TestCacheKey:
+    """Test cases for the response cache key."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.topic = create_topic_from_name("Python Basics", "beginner", 1)
+        self.module = self.topic.modules[0]
+
+    def key(self, generator, topic=None, module=None, content_type="learning_path", extra_context=None):
+        """Get the cache key of a request."""
+        return generator._create_cache_key(generator._build_request(
+            content_type, topic or self.topic, module or self.module, extra_context
+        ))
+
+    def test_key_is_stable(self, generator):
+        """Test that equal requests get equal keys."""
+        assert self.key(generator) == self.key(generator, self.topic.model_copy(deep=True))
+
+    def test_key_covers_every_prompt_input(self, generator):
+        """Test that anything rendered into the prompt changes the key."""
+        base = self.key(generator)
+        variants = [
+            self.key(generator, module=self.module.model_copy(update={"focus_areas": ["decorators"]})),
+            self.key(generator, self.topic.model_copy(update={"learning_objectives": ["Write decorators"]})),
+            self.key(generator, self.topic.model_copy(update={"difficulty": DifficultyLevel.ADVANCED})),
+            self.key(generator, content_type="extra_exercises"),
+            self.key(generator, content_type="test_starter", extra_context={"code_to_test": "x = 1"}),
+        ]
+        assert base not in variants
+        assert len(set(variants)) == len(variants)
+
+    def test_key_covers_model(self, generator):
+        """Test that responses from another model are not reused."""
+        base = self.key(generator)
+        generator.config = generator.config.model_copy(update={"openai_model": "gpt-4o-mini"})
+        generator._model_for_content_type.clear()
+        assert self.key(generator) != base
+
+
+@pytest.mark.unit
+class TestStreaming:
+    """Test cases for streamed chat completions on the synchronous path."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+    def test_code_is_extracted_from_chunked_fences(self, generator, chunk_size):
+        """Test that fences split across stream chunks still yield the largest code block."""
+        reply = "Here is the code:\n```python\nclass A:\n    pass\n```\nand a note\n```\nx = 1\n```\n"
+        completions = FakeStreamCompletions(reply, chunk_size=chunk_size)
+        generator.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        topic = create_topic_from_name("Python Basics", "beginner", 1)
+
+        response = generator.generate_content("starter_example", topic, topic.modules[0])
+        assert response.content == "class A:\n    pass"
+        assert response.tokens_used == -(-len(reply) // chunk_size)
+
+    def test_stream_requests_usage_and_cache_routing(self, generator):
+        """Test that the request streams, asks for usage and carries the prompt cache key."""
+        completions = FakeStreamCompletions("# Learning path")
+        generator.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        topic = create_topic_from_name("Python Basics", "beginner", 1)
+
+        assert generator.generate_content("learning_path", topic, topic.modules[0]).content == "# Learning path"
+        (request,) = completions.requests
+        assert request["stream"] is True
+        assert request["stream_options"] == {"include_usage": True}
+        assert request["extra_body"] == {"prompt_cache_key": generator._prompt_cache_key("learning_path")}
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Test cases for sharing identical in-flight requests between threads."""
+
+    def test_concurrent_identical_requests_make_one_call(self, generator):
+        """Test that a second thread waits for the first thread's call instead of repeating it."""
+        gate = threading.Event()
+        completions = FakeStreamCompletions("# Learning path", gate=gate)
+        generator.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        topic = create_topic_from_name("Python Basics", "beginner", 1)
+        module = topic.modules[0]
+
+        results = []
+
+        def generate():
+            results.append(generator.generate_content("learning_path", topic, module))
+
+        first = threading.Thread(target=generate)
+        first.start()
+        wait_until(lambda: completions.requests)
+
+        second = threading.Thread(target=generate)
+        second.start()
+        # The second thread counts as a cache hit before it starts waiting
+        wait_until(lambda: generator.get_generation_stats()["cache_hits"])
+
+        gate.set()
+        first.join(timeout=5)
+        second.join(timeout=5)
+
+        assert len(completions.requests) == 1
+        assert [result.content for result in results] == ["# Learning path"] * 2
+        assert generator.get_generation_stats()["ai_calls"] == 1
+        assert not generator._inflight
+
+    def test_finished_requests_are_not_shared(self, generator):
+        """Test that a finished request is no longer registered as in flight."""
+        completions = FakeStreamCompletions("# Learning path")
+        generator.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        generator._content_cache.close()
+        generator._content_cache = None
+        topic = create_topic_from_name("Python Basics", "beginner", 1)
+
+        generator.generate_content("learning_path", topic, topic.modules[0])
+        generator.generate_content("learning_path", topic, topic.modules[0])
+        assert len(completions.requests) == 2
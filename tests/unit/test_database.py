@@ -0,0 +1,242 @@
+"""
+Unit tests for the database models and repositories.
+
+This module tests storage details of the lesson database (column codecs,
+RETURNING inserts, single-statement updates, file counters and aggregates)
+against an in-memory SQLite database.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# Skip import errors when the database extras are not installed
+try:
+    from lesson_generator.database.models import Base, Lesson, GenerationProgress, JSON_COMPRESS_MIN_BYTES
+    from lesson_generator.database.repositories import FileRepository, LessonRepository, ProgressRepository
+    DATABASE_AVAILABLE = True
+except ImportError:
+    DATABASE_AVAILABLE = False
+
+
+@pytest.fixture
+def db():
+    """Provide a session bound to a fresh in-memory SQLite database."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not DATABASE_AVAILABLE, reason="Database dependencies not installed")
+class TestCompressedJSON:
+    """Test cases for the CompressedJSON column type."""
+
+    def stored_config(self, db, lesson_id):
+        """Get the raw stored generation_config value."""
+        return db.execute(
+            text("SELECT generation_config FROM lessons WHERE lesson_id = :lesson_id"),
+            {"lesson_id": lesson_id}
+        ).scalar_one()
+
+    def test_round_trip(self, db):
+        """Test that small, large and missing values are read back unchanged."""
+        repo = LessonRepository(db)
+        small = {"use_ai": True, "workers": 2}
+        large = {"topics": ["x" * 40] * 50, "nested": {"values": list(range(100))}}
+        repo.create_lesson("small", ["t"], generation_config=small)
+        repo.create_lesson("large", ["t"], generation_config=large)
+        repo.create_lesson("none", ["t"])
+        db.expunge_all()
+
+        assert repo.get_lesson("small").generation_config == small
+        assert repo.get_lesson("large").generation_config == large
+        assert repo.get_lesson("none").generation_config is None
+
+    def test_only_large_values_are_compressed(self, db):
+        """Test that values below the threshold are stored as plain compact JSON."""
+        repo = LessonRepository(db)
+        large = {"payload": "x" * JSON_COMPRESS_MIN_BYTES}
+        repo.create_lesson("small", ["t"], generation_config={"a": 1})
+        repo.create_lesson("large", ["t"], generation_config=large)
+
+        assert self.stored_config(db, "small") == b'{"a":1}'
+        assert len(self.stored_config(db, "large")) < JSON_COMPRESS_MIN_BYTES
+
+    def test_reads_legacy_json_text(self, db):
+        """Test that rows written by the former plain JSON column are still read."""
+        LessonRepository(db).create_lesson("legacy", ["t"])
+        db.execute(text("UPDATE lessons SET generation_config = '{\"use_ai\": false}' WHERE lesson_id = 'legacy'"))
+        db.commit()
+        db.expunge_all()
+
+        assert db.get(Lesson, "legacy").generation_config == {"use_ai": False}
+
+    def test_step_metadata_is_merged(self, db):
+        """Test that step metadata written in two calls is merged."""
+        LessonRepository(db).create_lesson("lesson", ["t"])
+        repo = ProgressRepository(db)
+        progress = repo.start_step("lesson", "module_1", "generate", step_metadata={"topic": "t"})
+        repo.complete_step(progress.progress_id, step_metadata={"files": 3})
+        db.expunge_all()
+
+        assert repo.get_lesson_progress("lesson")[0].step_metadata == {"topic": "t", "files": 3}
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not DATABASE_AVAILABLE, reason="Database dependencies not installed")
+class TestProgressSummary:
+    """Test cases for ProgressRepository.get_progress_summary."""
+
+    def add_steps(self, db, durations):
+        """Record one completed step per duration (None leaves the step running)."""
+        LessonRepository(db).create_lesson("lesson", ["t"])
+        repo = ProgressRepository(db)
+        started = datetime(2026, 1, 1, 12, 0, 59, 750000)
+        for index, duration in enumerate(durations):
+            progress = repo.start_step("lesson", "module_1", f"step_{index}")
+            progress.started_at = started
+            progress.completed_at = started + duration if duration is not None else None
+            progress.status = "completed" if duration is not None else "started"
+        db.commit()
+
+    def test_duration_is_exact(self, db):
+        """Test that a 2.5 second step sums to exactly 2.5 seconds."""
+        self.add_steps(db, [timedelta(seconds=2.5)])
+        summary = ProgressRepository(db).get_progress_summary("lesson")
+        assert summary["total_duration_seconds"] == 2.5
+        assert summary["average_step_duration"] == 2.5
+
+    def test_matches_python_sum(self, db):
+        """Test that the SQL aggregate equals summing duration_seconds in Python."""
+        durations = [timedelta(seconds=2.5), timedelta(microseconds=250000),
+                     timedelta(minutes=1, seconds=1.125), None]
+        self.add_steps(db, durations)
+        db.expunge_all()
+
+        steps = db.query(GenerationProgress).filter_by(lesson_id="lesson").all()
+        expected = sum(step.duration_seconds or 0 for step in steps)
+        summary = ProgressRepository(db).get_progress_summary("lesson")
+        assert summary["total_duration_seconds"] == expected
+        assert summary["completed_steps"] == 3
+        assert summary["in_progress_steps"] == 1
+
+    def test_no_steps(self, db):
+        """Test that a lesson without steps has a zero duration."""
+        LessonRepository(db).create_lesson("lesson", ["t"])
+        summary = ProgressRepository(db).get_progress_summary("lesson")
+        assert summary["total_duration_seconds"] == 0
+        assert summary["average_step_duration"] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not DATABASE_AVAILABLE, reason="Database dependencies not installed")
+class TestLessonRepository:
+    """Test cases for LessonRepository writes."""
+
+    def test_create_lesson_returns_stored_timestamps(self, db):
+        """Test that the returned lesson carries the timestamps written by the INSERT."""
+        lesson = LessonRepository(db).create_lesson("lesson", ["a", "b"], ai_model="gpt-4")
+        assert lesson.total_topics == 2
+        assert lesson.created_at is not None
+        assert lesson not in db
+
+        stored = db.get(Lesson, "lesson")
+        assert stored.created_at == lesson.created_at
+        assert stored.updated_at == lesson.updated_at
+        assert stored.ai_model == "gpt-4"
+
+    def test_update_lesson_status(self, db):
+        """Test that only the given fields are updated."""
+        repo = LessonRepository(db)
+        repo.create_lesson("lesson", ["a", "b"])
+        assert repo.update_lesson_status("lesson", "running", progress_percentage=50.0, topics_completed=1)
+        assert repo.update_lesson_status("lesson", "running", current_step="module_2")
+        db.expunge_all()
+
+        lesson = repo.get_lesson("lesson")
+        assert (lesson.status, lesson.progress_percentage, lesson.topics_completed, lesson.current_step) == (
+            "running", 50.0, 1, "module_2"
+        )
+
+    def test_update_unknown_lesson_returns_false(self, db):
+        """Test that updating a missing lesson reports that nothing matched."""
+        assert LessonRepository(db).update_lesson_status("missing", "failed") is False
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not DATABASE_AVAILABLE, reason="Database dependencies not installed")
+class TestFileRepository:
+    """Test cases for FileRepository and the lesson file counters."""
+
+    def counters(self, db, lesson_id="lesson"):
+        """Get the stored (total_files, total_size) of a lesson."""
+        db.expire_all()
+        lesson = db.get(Lesson, lesson_id)
+        return lesson.total_files, lesson.total_size
+
+    def recomputed_counters(self, db, lesson_id="lesson"):
+        """Get the counters as update_file_statistics aggregates them from the files."""
+        LessonRepository(db).update_file_statistics(lesson_id)
+        return self.counters(db, lesson_id)
+
+    def test_store_file_returns_generated_id(self, db):
+        """Test that the returned file carries the ID and timestamp from the INSERT."""
+        LessonRepository(db).create_lesson("lesson", ["t"])
+        repo = FileRepository(db)
+        stored = repo.store_file("lesson", "module_1/README.md", b"# Title\n" * 100)
+
+        assert stored.file_id is not None
+        assert stored.created_at is not None
+        assert stored not in db
+        assert repo.get_file_content(stored.file_id) == b"# Title\n" * 100
+
+    def test_bulk_store_files_returns_files_in_order(self, db):
+        """Test that bulk-stored files come back in input order with their generated IDs."""
+        LessonRepository(db).create_lesson("lesson", ["t"])
+        repo = FileRepository(db)
+        files = [(f"module_1/file_{i}.md", f"# {i}\n".encode()) for i in range(5)]
+        stored = repo.bulk_store_files("lesson", files)
+
+        assert [f.file_path for f in stored] == [path for path, _ in files]
+        assert all(f.created_at is not None and f not in db for f in stored)
+        for f, (_, content) in zip(stored, files):
+            assert repo.get_file_content(f.file_id) == content
+
+    def test_counters_follow_every_write(self, db):
+        """Test that incremental counters match a full recount after each write."""
+        LessonRepository(db).create_lesson("lesson", ["t"])
+        LessonRepository(db).create_lesson("other", ["t"])
+        repo = FileRepository(db)
+
+        repo.store_file("lesson", "module_1/starter_example.py", b"print('hi')\n" * 50)
+        stored = self.counters(db)
+        assert stored[0] == 1
+        assert stored == self.recomputed_counters(db)
+
+        repo.bulk_store_files("lesson", [
+            ("module_1/test_starter_example.py", b"def test(): pass\n" * 20),
+            ("module_1/data.bin", bytes(range(256))),
+        ])
+        repo.bulk_store_files("lesson", [])
+        stored = self.counters(db)
+        assert stored[0] == 3
+        assert stored == self.recomputed_counters(db)
+        assert self.counters(db, "other") == (0, 0)
+
+    def test_delete_lesson_files_resets_counters(self, db):
+        """Test that deleting all files of a lesson zeroes its counters."""
+        LessonRepository(db).create_lesson("lesson", ["t"])
+        repo = FileRepository(db)
+        repo.bulk_store_files("lesson", [("a.md", b"a"), ("b.md", b"b")])
+
+        assert repo.delete_lesson_files("lesson") == 2
+        assert self.counters(db) == (0, 0)
+        assert repo.get_lesson_files("lesson") == []
@@ -0,0 +1,181 @@
+"""
+Unit tests for the ratelimit module.
+
+This module tests the request and token budget, request spacing and the
+rate limit backoff helpers with a fake clock, so no test actually sleeps.
+"""
+
+import pytest
+
+from lesson_generator import ratelimit
+from lesson_generator.ratelimit import RateLimiter, RequestSpacer, call_with_backoff, get_token_counter
+
+
+class FakeRateLimitError(Exception):
+    """Stand-in for openai.RateLimitError."""
+
+
+class FakeClock:
+    """Monotonic clock that only advances when something sleeps."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace time in the ratelimit module with a fake clock."""
+    fake = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(ratelimit.time, "sleep", fake.sleep)
+    monkeypatch.setattr(ratelimit.random, "random", lambda: 0.0)
+    monkeypatch.setattr(ratelimit, "_rate_limit_error", lambda: FakeRateLimitError)
+    return fake
+
+
+def failing(times: int, error: Exception, result="ok"):
+    """Create a callable that raises ``error`` for the first ``times`` calls."""
+    calls = []
+
+    def func():
+        calls.append(None)
+        if len(calls) <= times:
+            raise error
+        return result
+
+    func.calls = calls
+    return func
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    """Test cases for RateLimiter."""
+
+    def test_burst_within_budget_does_not_wait(self, clock):
+        """Test that requests up to one minute's budget go out immediately."""
+        limiter = RateLimiter(requests_per_minute=3)
+        for _ in range(3):
+            limiter.acquire()
+        assert clock.sleeps == []
+
+    def test_waits_for_request_capacity_to_refill(self, clock):
+        """Test that a request beyond the budget waits for one request's refill."""
+        limiter = RateLimiter(requests_per_minute=60)
+        for _ in range(61):
+            limiter.acquire()
+        assert clock.sleeps == [pytest.approx(1.0)]
+
+    def test_waits_for_token_capacity(self, clock):
+        """Test that the token budget is enforced independently of requests."""
+        limiter = RateLimiter(tokens_per_minute=600)
+        limiter.acquire(token_cost=600)
+        limiter.acquire(token_cost=100)
+        assert clock.sleeps == [pytest.approx(10.0)]
+
+    def test_oversized_request_is_capped_to_budget(self, clock):
+        """Test that a request larger than the whole token budget still goes out."""
+        limiter = RateLimiter(tokens_per_minute=100)
+        limiter.acquire(token_cost=1000)
+        assert clock.sleeps == []
+
+    def test_unlimited_never_waits(self, clock):
+        """Test that a limiter without limits never sleeps."""
+        limiter = RateLimiter()
+        for _ in range(1000):
+            limiter.acquire(token_cost=10 ** 6)
+        assert clock.sleeps == []
+
+
+@pytest.mark.unit
+class TestRequestSpacer:
+    """Test cases for RequestSpacer."""
+
+    def test_requests_are_spaced(self, monkeypatch, clock):
+        """Test that queued callers get consecutive slots ``delay`` apart."""
+        # Reserve all slots at the same instant, as concurrent workers would
+        monkeypatch.setattr(ratelimit.time, "sleep", clock.sleeps.append)
+        spacer = RequestSpacer(0.5)
+        for _ in range(4):
+            spacer.wait()
+        assert clock.sleeps == [pytest.approx(0.5), pytest.approx(1.0), pytest.approx(1.5)]
+
+    def test_idle_spacer_does_not_wait(self, clock):
+        """Test that a request after a long pause goes out immediately."""
+        spacer = RequestSpacer(0.5)
+        spacer.wait()
+        clock.now += 10
+        spacer.wait()
+        assert clock.sleeps == []
+
+    def test_zero_delay_never_waits(self, clock):
+        """Test that a zero delay disables spacing."""
+        spacer = RequestSpacer(0)
+        for _ in range(3):
+            spacer.wait()
+        assert clock.sleeps == []
+
+
+@pytest.mark.unit
+class TestBackoff:
+    """Test cases for call_with_backoff."""
+
+    def test_retries_rate_limit_errors_with_growing_delays(self, clock):
+        """Test that rate limit errors are retried with exponential delays."""
+        func = failing(3, FakeRateLimitError())
+        assert call_with_backoff(func, base_delay=1.0) == "ok"
+        assert len(func.calls) == 4
+        assert clock.sleeps == [1.0, 2.0, 4.0]
+
+    def test_delay_is_capped(self, clock):
+        """Test that no single delay exceeds max_delay."""
+        func = failing(4, FakeRateLimitError())
+        call_with_backoff(func, base_delay=1.0, max_delay=3.0)
+        assert clock.sleeps == [1.0, 2.0, 3.0, 3.0]
+
+    def test_gives_up_after_max_attempts(self, clock):
+        """Test that the last rate limit error is raised once attempts run out."""
+        func = failing(10, FakeRateLimitError())
+        with pytest.raises(FakeRateLimitError):
+            call_with_backoff(func, max_attempts=3)
+        assert len(func.calls) == 3
+
+    def test_other_errors_are_not_retried(self, clock):
+        """Test that errors other than rate limits propagate immediately."""
+        func = failing(1, ValueError("bad request"))
+        with pytest.raises(ValueError):
+            call_with_backoff(func)
+        assert len(func.calls) == 1
+        assert clock.sleeps == []
+
+
+@pytest.mark.unit
+class TestTokenCounter:
+    """Test cases for get_token_counter."""
+
+    def test_counts_tokens(self):
+        """Test that the counter returns a positive count that grows with the text."""
+        count = get_token_counter("gpt-4o-mini")
+        assert 0 < count("hello") < count("hello " * 50)
+
+    def test_falls_back_without_tiktoken(self, monkeypatch):
+        """Test that a character-based estimate is used when tiktoken is unavailable."""
+        import builtins
+
+        real_import = builtins.__import__
+
+        def fake_import(name, *args, **kwargs):
+            if name == "tiktoken":
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", fake_import)
+        count = get_token_counter("gpt-4o-mini")
+        assert count("x" * 40) == 11